@@ -71,6 +71,31 @@ def _generate_mock_team_games(team_id: int, limit: int) -> List[Dict]:
         })
     return games
 
+def _generate_mock_season_games(days: int = 40) -> List[Dict]:
+    """Generate a mock league season (every MOCK_GAMES team, one game a day)."""
+    import random
+    team_ids = [t["id"] for g in MOCK_GAMES for t in g["teams"].values()]
+    games = []
+    for i in range(days):
+        random.shuffle(team_ids)
+        for n in range(0, len(team_ids) - 1, 2):
+            scores = {}
+            for side in ("home", "away"):
+                quarters = [random.randint(20, 34) for _ in range(4)]
+                scores[side] = {f"quarter_{q + 1}": pts for q, pts in enumerate(quarters)}
+                scores[side]["total"] = sum(quarters)
+            games.append({
+                "id": 20000 + i * 10 + n,
+                "date": (datetime.now() - timedelta(days=i+1)).strftime("%Y-%m-%d"),
+                "status": {"short": "FT"},
+                "teams": {
+                    "home": {"id": team_ids[n], "name": "Team"},
+                    "away": {"id": team_ids[n + 1], "name": "Opponent"}
+                },
+                "scores": scores
+            })
+    return games
+
 def _generate_mock_player_stats(player_id: int, limit: int) -> List[Dict]:
     """Generate mock player statistics."""
     import random
@@ -82,7 +107,8 @@ def _generate_mock_player_stats(player_id: int, limit: int) -> List[Dict]:
             "rebounds": random.randint(3, 12),
             "assists": random.randint(2, 10),
             "steals": random.randint(0, 3),
-            "blocks": random.randint(0, 3)
+            "blocks": random.randint(0, 3),
+            "threes": random.randint(0, 5)
         })
     return stats
 
@@ -126,6 +152,25 @@ class APIBasketballClient:
         age = (datetime.now() - self._cache_timestamps[cache_key]).total_seconds()
         return age < self.cache_ttl
     
+    def invalidate_cache(self, endpoint: str, **params: Any) -> int:
+        """
+        Drop cached responses for an endpoint whose params include `params`.
+        
+        Returns:
+            Number of entries removed
+        """
+        prefix = f"{endpoint}_"
+        needles = [f"{k}={v}" for k, v in params.items()]
+        stale = [
+            key for key in self._cache
+            if key.startswith(prefix)
+            and all(needle in key[len(prefix):].split("_") for needle in needles)
+        ]
+        for key in stale:
+            self._cache.pop(key, None)
+            self._cache_timestamps.pop(key, None)
+        return len(stale)
+    
     async def _request(self, endpoint: str, params: Dict = None) -> Dict:
         """
         Make API request with caching.
@@ -201,6 +246,34 @@ class APIBasketballClient:
         response = await self._request("games", params)
         return response.get("response", [])
     
+    async def get_season_games(self, season: str = None, league_id: int = 12) -> List[Dict]:
+        """
+        Get every completed league game this season (one request).
+        
+        Args:
+            season: Season string (e.g., "2024-2025")
+            league_id: NBA league ID
+        
+        Returns:
+            List of completed game objects (most recent first)
+        """
+        # Return mock data if in mock mode
+        if MOCK_MODE:
+            return _generate_mock_season_games()
+        
+        params = {
+            "league": league_id,
+            "season": season or self._get_current_season()
+        }
+        
+        response = await self._request("games", params)
+        games = response.get("response", [])
+        
+        completed = [g for g in games if g.get("status", {}).get("short") == "FT"]
+        completed.sort(key=lambda x: x.get("date", ""), reverse=True)
+        
+        return completed
+    
     # ========== TEAMS ==========
     
     async def get_team_games(self, team_id: int, limit: int = 15, league_id: int = 12) -> List[Dict]:
@@ -335,6 +408,35 @@ class APIBasketballClient:
         
         return stats[:limit]
     
+    async def get_game_player_stats(self, game_id: int) -> List[Dict]:
+        """
+        Get the player box score for a game.
+        
+        Args:
+            game_id: Game ID
+        
+        Returns:
+            List of player stat objects (same shape as get_player_stats)
+        """
+        # Return mock data if in mock mode
+        if MOCK_MODE:
+            stats = []
+            for team_id in (1, 2):
+                for n in range(1, 4):
+                    stat = _generate_mock_player_stats(team_id * 100 + n, 1)[0]
+                    stat["player"] = {"id": team_id * 100 + n}
+                    stat["team"] = {"id": team_id}
+                    stat["game"] = {"id": game_id, "date": datetime.now().strftime("%Y-%m-%d")}
+                    stats.append(stat)
+            return stats
+        
+        params = {
+            "id": game_id
+        }
+        
+        response = await self._request("games/statistics/players", params)
+        return response.get("response", [])
+    
     async def get_players_by_team(self, team_id: int, league_id: int = 12) -> List[Dict]:
         """
         Get all players on a team.
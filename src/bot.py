@@ -6,22 +6,20 @@ NBA Analytics Discord Bot — Rule-Based Parlay Generator
 """
 
 import asyncio
+import contextlib
 import os
 import logging
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
 
 os.environ["NBABOT_VERSION"] = "11"
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 from dotenv import load_dotenv
 
-from confidence_engine import (
-    calculate_confidence,
-    HitRateData,
-    ContextData,
-    CONFIDENCE_MAX,
-)
+from confidence_engine import CONFIDENCE_MAX
 
 from embeds import (
     build_potd_embed_v11,
@@ -29,8 +27,22 @@ from embeds import (
     build_parlay_embed,
 )
 
-from buttons import ParlayView
-from parlay_engine import parlay_engine, Parlay, generate_parlay_id
+from box_score_ingest import box_score_ingest
+from buttons import ParlayView, PERSISTENT_ITEMS
+from command_scheduler import Priority, SchedulerBusy, scheduler
+from compute import compute_backend
+from config import (
+    BOX_SCORE_POLL_SECONDS, INJURY_POLL_SECONDS, POTD_MAX_PICKS, PROGRESS_EDIT_SECONDS,
+    PROGRESSIVE_RESPONSES, SLATE_DEADLINE_SECONDS, SLATE_SUFFICIENT_LEGS,
+)
+from injury_feed import injury_feed
+from leg_scoring import confidence_detail, score_legs
+from opponent_allowed import opponent_allowed
+from parlay_store import close_store, open_store
+from parlay_engine import (
+    parlay_engine, Parlay, SlateSearch, SEARCH_SUFFICIENT, generate_parlay_id
+)
+from schedule_index import schedule
 from startup_checks import verify_v11
 from startup_checks_player_status import verify_player_status_engine
 
@@ -46,6 +58,130 @@ if not DISCORD_TOKEN:
 POTD_CONFIDENCE_MIN = 70
 DEFAULT_MIN_CONFIDENCE = 60
 
+BUSY_MESSAGE = "⏳ This server has too many requests queued. Please try again shortly."
+
+# ================= SCORING ==================
+
+async def slate_picks(
+    games: List,
+    ladder: int,
+    keep: Callable[[Any], bool],
+    min_confidence: int,
+    target: int = SLATE_SUFFICIENT_LEGS,
+    progress: Optional[Callable[[List[Tuple[Any, int]], SlateSearch], None]] = None,
+) -> Tuple[List[Tuple[Any, int]], SlateSearch]:
+    """
+    (leg, score) for legs passing `keep` and scoring at least `min_confidence`,
+    from an anytime slate search.
+
+    The search stops at SLATE_DEADLINE_SECONDS or once `target` picks have
+    turned up; cautions and scores are cached per leg, so re-checking the
+    picks after every search step only evaluates the new legs. `progress`
+    gets the picks so far after every step.
+    """
+    async def picks(legs: List) -> List[Tuple[Any, int]]:
+        await parlay_engine.attach_cautions(legs, games)
+        legs = [leg for leg in legs if not leg.caution.should_exclude and keep(leg)]
+        scores = await score_legs(legs)
+        return [(leg, score) for leg, score in zip(legs, scores) if score >= min_confidence]
+
+    async def enough(search: SlateSearch) -> bool:
+        found = await picks(search.legs)
+        if progress is not None:
+            progress(found, search)
+        return len(found) >= target
+
+    search = await parlay_engine.search_slate(
+        games, ladder, deadline=SLATE_DEADLINE_SECONDS, enough=enough
+    )
+    return await picks(search.legs), search
+
+
+def note_search(embed: discord.Embed, search: SlateSearch) -> discord.Embed:
+    """Say in the footer when picks come from a partial slate search."""
+    if search.complete:
+        return embed
+    reason = "enough picks found" if search.stopped == SEARCH_SUFFICIENT else "time limit"
+    note = f"⏱️ {search.games_done}/{search.games} games fully analyzed ({reason})"
+    footer = embed.footer.text
+    embed.set_footer(text=f"{footer} | {note}" if footer else note)
+    return embed
+
+
+def top_picks(picks: List[Tuple[Any, int]], count: int = POTD_MAX_PICKS) -> List[dict]:
+    """Highest-confidence picks, in the shape the ranking embeds take."""
+    ranked = sorted(picks, key=lambda pick: pick[1], reverse=True)[:count]
+    return [{"leg": leg, "confidence": score} for leg, score in ranked]
+
+
+def analyzing_embed(title: str) -> discord.Embed:
+    """Placeholder posted right after the defer."""
+    return discord.Embed(title=title, description="⏳ Analyzing today's slate…")
+
+
+def note_progress(embed: discord.Embed, search: SlateSearch) -> discord.Embed:
+    """Footer for a partial ranking while the search is still running."""
+    embed.set_footer(
+        text=f"⏳ Analyzing… {search.steps_done}/{search.steps} steps, "
+             f"{search.games_done}/{search.games} games fully analyzed"
+    )
+    return embed
+
+
+# ================= PROGRESSIVE RESPONSES ==================
+
+class ProgressiveResponse:
+    """
+    One followup message, edited as a command's results come in.
+
+    Edits are throttled to one per PROGRESS_EDIT_SECONDS (Discord allows
+    about five edits per message every five seconds); only the newest
+    pending embed is sent, and the edit runs off the search's path.
+    finish() drops whatever is pending and writes the final state.
+    """
+
+    def __init__(self, interaction: discord.Interaction, interval: float = PROGRESS_EDIT_SECONDS):
+        self.interaction = interaction
+        self.interval = interval
+        self.message: Optional[discord.WebhookMessage] = None
+        self._pending: Optional[discord.Embed] = None
+        self._task: Optional[asyncio.Task] = None
+        self._edited_at = 0.0
+
+    async def start(self, embed: discord.Embed) -> None:
+        self.message = await self.interaction.followup.send(embed=embed, wait=True)
+        self._edited_at = asyncio.get_running_loop().time()
+
+    def update(self, embed: discord.Embed) -> None:
+        """Queue a progress embed (replaces any not yet sent)."""
+        self._pending = embed
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    async def finish(self, content: Optional[str] = None, **kwargs) -> None:
+        """Final edit: `content` and/or embed= / view= (message text cleared if None)."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        kwargs.setdefault("embed", None)
+        await self.message.edit(content=content, **kwargs)
+
+    async def _flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        delay = self._edited_at + self.interval - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        embed, self._pending = self._pending, None
+        if embed is None:
+            return
+        self._edited_at = loop.time()
+        try:
+            await self.message.edit(embed=embed)
+        except discord.HTTPException:
+            logging.warning("Progress edit failed", exc_info=True)
+
+
 # ================= COG ==================
 
 class ParlayCog(commands.Cog):
@@ -61,56 +197,15 @@ class ParlayCog(commands.Cog):
         description="Get today's highest confidence picks ranked",
     )
     async def pickoftheday(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        try:
-            games = await parlay_engine.api.get_games_today()
-            if not games:
-                await interaction.followup.send("❌ No NBA games today.", ephemeral=True)
-                return
-
-            all_picks = []
-
-            for game in games:
-                legs = await parlay_engine._generate_legs_for_game(game, ladder=5)
-                for leg in legs:
-                    if not leg.eligible:
-                        continue
-
-                    hit_rate = HitRateData(
-                        hits_l5=leg.hit_rate.hits_l5,
-                        games_l5=leg.hit_rate.games_l5,
-                        hits_l10=leg.hit_rate.hits_l10,
-                        games_l10=leg.hit_rate.games_l10,
-                        hits_l15=leg.hit_rate.hits_l15,
-                        games_l15=leg.hit_rate.games_l15,
-                    )
-
-                    context = ContextData(
-                        minutes_stable=leg.minutes_projection.stable,
-                        is_home=leg.is_home,
-                    )
-
-                    confidence = calculate_confidence(hit_rate, context)
-
-                    if confidence.score >= POTD_CONFIDENCE_MIN:
-                        all_picks.append(
-                            {"leg": leg, "confidence": confidence.score}
-                        )
-
-            if not all_picks:
-                await interaction.followup.send("❌ No eligible picks today.", ephemeral=True)
-                return
-
-            all_picks.sort(key=lambda x: x["confidence"], reverse=True)
-            embed = build_potd_embed_v11(all_picks[:5])
-            await interaction.followup.send(embed=embed)
-
-        except Exception:
-            logging.exception("Pick of the Day failed")
-            await interaction.followup.send(
-                "❌ Unexpected error. Please try again later.",
-                ephemeral=True,
-            )
+        await self.send_ranked(
+            interaction,
+            title="🏆 Pick of the Day",
+            build=build_potd_embed_v11,
+            keep=lambda leg: leg.eligible,
+            min_confidence=POTD_CONFIDENCE_MIN,
+            empty="❌ No eligible picks today.",
+            error="Pick of the Day failed",
+        )
 
     # ---------- PARLAY CONFIDENCE ----------
 
@@ -133,33 +228,18 @@ class ParlayCog(commands.Cog):
                 await interaction.followup.send("❌ No NBA games today.", ephemeral=True)
                 return
 
-            eligible_legs = []
-
-            for game in games:
-                game_legs = await parlay_engine._generate_legs_for_game(game, ladder)
-                for leg in game_legs:
-                    if not leg.eligible:
-                        continue
-
-                    hit_rate = HitRateData(
-                        hits_l5=leg.hit_rate.hits_l5,
-                        games_l5=leg.hit_rate.games_l5,
-                        hits_l10=leg.hit_rate.hits_l10,
-                        games_l10=leg.hit_rate.games_l10,
-                        hits_l15=leg.hit_rate.hits_l15,
-                        games_l15=leg.hit_rate.games_l15,
-                    )
-
-                    context = ContextData(
-                        minutes_stable=leg.minutes_projection.stable,
-                        is_home=leg.is_home,
-                    )
-
-                    confidence = calculate_confidence(hit_rate, context)
-
-                    if confidence.score >= min_confidence:
-                        leg.confidence = confidence
-                        eligible_legs.append(leg)
+            target = max(legs, SLATE_SUFFICIENT_LEGS)
+            picks, search = await scheduler.submit(
+                ("picks", ladder, min_confidence, target),
+                lambda report: slate_picks(
+                    games, ladder, keep=lambda leg: leg.eligible, min_confidence=min_confidence,
+                    target=target, progress=report,
+                ),
+                guild_id=interaction.guild_id,
+                user_id=interaction.user.id,
+            )
+            eligible_legs = [leg for leg, _ in picks]
+            scores = {id(leg): score for leg, score in picks}
 
             if len(eligible_legs) < legs:
                 await interaction.followup.send(
@@ -169,12 +249,16 @@ class ParlayCog(commands.Cog):
                 return
 
             eligible_legs.sort(
-                key=lambda l: l.confidence.score, reverse=True
+                key=lambda l: scores[id(l)], reverse=True
             )
-            selected = parlay_engine._select_varied_legs(
+            selected = await parlay_engine.select_varied_legs(
                 eligible_legs, legs
             )
 
+            # Full confidence detail only for the legs that are shown
+            for leg in selected:
+                leg.confidence = confidence_detail(leg)
+
             total_decimal = 1.0
             for leg in selected:
                 total_decimal *= leg.odds.decimal
@@ -188,27 +272,29 @@ class ParlayCog(commands.Cog):
                 total_odds=parlay_engine._decimal_to_american(total_decimal),
                 total_odds_decimal=round(total_decimal, 2),
                 potential_win=round(wager * total_decimal, 2),
-                created_at=None,
+                created_at=datetime.now().isoformat(),
                 user_id=str(interaction.user.id),
                 guild_id=str(interaction.guild_id),
                 channel_id=str(interaction.channel_id),
             )
 
-            parlay_engine._parlay_cache[parlay.id] = parlay
-            for leg in selected:
-                parlay_engine._leg_cache[leg.id] = leg
+            parlay_engine.cache_parlay(parlay)
 
             embed = build_parlay_embed(parlay)
             avg_conf = sum(l.confidence.score for l in selected) / len(selected)
             embed.set_footer(
                 text=f"Avg Confidence: {avg_conf:.0f}/{CONFIDENCE_MAX} | ⚠️ Educational Only"
             )
+            note_search(embed, search)
 
             await interaction.followup.send(
                 embed=embed,
                 view=ParlayView(parlay),
             )
 
+        except SchedulerBusy:
+            await interaction.followup.send(BUSY_MESSAGE, ephemeral=True)
+
         except Exception:
             logging.exception("Parlay confidence failed")
             await interaction.followup.send(
@@ -223,52 +309,83 @@ class ParlayCog(commands.Cog):
         description="Find best +odds value plays",
     )
     async def edge_finder(self, interaction: discord.Interaction):
+        await self.send_ranked(
+            interaction,
+            title="💎 Edge Finder",
+            build=build_edge_finder_embed_v11,
+            keep=lambda leg: leg.odds.american > 0,
+            min_confidence=DEFAULT_MIN_CONFIDENCE,
+            empty="❌ No +odds edges today.",
+            error="Edge finder failed",
+        )
+
+    # ---------- RANKED PICKS (shared) ----------
+
+    async def send_ranked(
+        self,
+        interaction: discord.Interaction,
+        title: str,
+        build: Callable[[List[dict]], discord.Embed],
+        keep: Callable[[Any], bool],
+        min_confidence: int,
+        empty: str,
+        error: str,
+    ) -> None:
+        """
+        Rank today's picks and send the top POTD_MAX_PICKS.
+
+        The slate search runs on the command scheduler. With
+        PROGRESSIVE_RESPONSES a placeholder is posted right after the defer
+        and edited with the best picks so far after every search step.
+        """
         await interaction.response.defer()
+        response = ProgressiveResponse(interaction) if PROGRESSIVE_RESPONSES else None
+
+        async def reply(text: str) -> None:
+            if response is not None and response.message is not None:
+                await response.finish(text)
+            else:
+                await interaction.followup.send(text, ephemeral=True)
+
+        def progress(picks: List[Tuple[Any, int]], search: SlateSearch) -> None:
+            if picks:
+                response.update(note_progress(build(top_picks(picks)), search))
+
         try:
+            if response is not None:
+                await response.start(analyzing_embed(title))
+
             games = await parlay_engine.api.get_games_today()
-            picks = []
-
-            for game in games:
-                legs = await parlay_engine._generate_legs_for_game(game, ladder=5)
-                for leg in legs:
-                    if leg.odds.american <= 0:
-                        continue
-
-                    hit_rate = HitRateData(
-                        hits_l5=leg.hit_rate.hits_l5,
-                        games_l5=leg.hit_rate.games_l5,
-                        hits_l10=leg.hit_rate.hits_l10,
-                        games_l10=leg.hit_rate.games_l10,
-                        hits_l15=leg.hit_rate.hits_l15,
-                        games_l15=leg.hit_rate.games_l15,
-                    )
-
-                    context = ContextData(
-                        minutes_stable=leg.minutes_projection.stable,
-                        is_home=leg.is_home,
-                    )
-
-                    confidence = calculate_confidence(hit_rate, context)
-
-                    if confidence.score >= DEFAULT_MIN_CONFIDENCE:
-                        picks.append(
-                            {"leg": leg, "confidence": confidence.score}
-                        )
+            if not games:
+                await reply("❌ No NBA games today.")
+                return
 
+            # Identical rankings requested while one is queued / running share it
+            picks, search = await scheduler.submit(
+                ("ranked", title, min_confidence),
+                lambda report: slate_picks(
+                    games, ladder=5, keep=keep, min_confidence=min_confidence, progress=report
+                ),
+                guild_id=interaction.guild_id,
+                user_id=interaction.user.id,
+                progress=progress if response is not None else None,
+            )
             if not picks:
-                await interaction.followup.send("❌ No +odds edges today.", ephemeral=True)
+                await reply(empty)
                 return
 
-            picks.sort(key=lambda x: x["confidence"], reverse=True)
-            embed = build_edge_finder_embed_v11(picks[:5])
-            await interaction.followup.send(embed=embed)
+            embed = note_search(build(top_picks(picks)), search)
+            if response is not None:
+                await response.finish(embed=embed)
+            else:
+                await interaction.followup.send(embed=embed)
+
+        except SchedulerBusy:
+            await reply(BUSY_MESSAGE)
 
         except Exception:
-            logging.exception("Edge finder failed")
-            await interaction.followup.send(
-                "❌ Unexpected error. Please try again later.",
-                ephemeral=True,
-            )
+            logging.exception(error)
+            await reply("❌ Unexpected error. Please try again later.")
 
 
 # ================= BOT ==================
@@ -281,8 +398,68 @@ class NBABot(commands.Bot):
         )
 
     async def setup_hook(self):
+        # Nothing heavy happens at import: open the store and fork the
+        # compute workers before the gateway connects
+        open_store()
+        compute_backend.start()
+
+        # Persistent parlay buttons: resolved from custom_id on click
+        self.add_dynamic_items(*PERSISTENT_ITEMS)
         await self.add_cog(ParlayCog(self))
         await self.tree.sync()
+        self.poll_box_scores.start()
+        if injury_feed.enabled:
+            self.poll_injuries.start()
+        self.prune_store.start()
+
+    @tasks.loop(seconds=BOX_SCORE_POLL_SECONDS)
+    async def poll_box_scores(self):
+        """Append newly final games to the rolling stats."""
+        try:
+            await scheduler.submit(
+                "poll_box_scores", lambda report: box_score_ingest.poll(), priority=Priority.SCHEDULED
+            )
+        except Exception:
+            logging.exception("Box score ingest failed")
+
+        # First poll of the day rebuilds what each defense allows and the
+        # schedule index (same season request)
+        try:
+            await opponent_allowed.ensure_current()
+        except Exception:
+            logging.exception("Opponent-allowed build failed")
+        try:
+            await schedule.ensure_current()
+        except Exception:
+            logging.exception("Schedule index build failed")
+
+    @tasks.loop(seconds=INJURY_POLL_SECONDS)
+    async def poll_injuries(self):
+        """Diff the injury report; changes invalidate the affected legs."""
+        try:
+            await scheduler.submit(
+                "poll_injuries", lambda report: injury_feed.poll(), priority=Priority.SCHEDULED
+            )
+        except Exception:
+            logging.exception("Injury feed poll failed")
+
+    @tasks.loop(hours=24)
+    async def prune_store(self):
+        """Drop stored parlays older than PARLAY_STORE_MAX_AGE_DAYS."""
+        try:
+            removed = parlay_engine.store.prune()
+            logging.info("Pruned %d stored parlays", removed)
+        except Exception:
+            logging.exception("Parlay store prune failed")
+
+    async def close(self):
+        self.poll_box_scores.cancel()
+        self.poll_injuries.cancel()
+        self.prune_store.cancel()
+        await scheduler.close()
+        compute_backend.shutdown()
+        close_store()
+        await super().close()
 
 
 # ================= ENTRY ==================
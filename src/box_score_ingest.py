@@ -0,0 +1,164 @@
+"""
+NBABot v11 — Box Score Ingest
+
+ADDED FOR: Feeding final box scores into rolling stats
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Only games with status FT are ingested, each at most once
+- A poll reads today's games plus yesterday's when a game listed
+  yesterday was not final at the last poll, so a game finishing after
+  midnight is still ingested; older pending games are dropped
+- Team rows come from parse_game_result, player rows from
+  extract_stat_row — the same columns the parlay engine reads
+- Only entities already seeded in the store are appended; everyone else
+  is seeded from the API the next time they are needed
+- Each box score is also summed per team for the opponent-allowed matrix,
+  joined to team totals for usage / assist rates and added to the
+  teammate with / without splits
+- Each box score also feeds the player pool's relevance ranking
+- Past games' box scores are backfilled for the slate's teams (usage
+  rates, teammate splits and player pool only), once per game id
+- Each final game is prepended to the loaded season logs (split index)
+  in place, so they are not re-fetched per game
+- Every append invalidates the matching API cache entries, so a fresh
+  history fetch never returns a pre-final response
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import date, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Set
+
+from api_client import APIBasketballClient, api_client
+from config import ROLE_BACKFILL_GAMES
+from game_log_index import game_log_index
+from opponent_allowed import opponent_allowed
+from player_pool import player_pool
+from prop_markets import extract_stat_row
+from rolling_stats import (
+    PLAYER, TEAM, RollingStatsStore, StatsChange, player_row, rolling_stats, team_row
+)
+from teammate_splits import teammate_splits
+from usage_rates import usage_rates
+
+logger = logging.getLogger(__name__)
+
+# Final games remembered for de-duplication
+INGESTED_GAMES_MAX = 512
+
+
+class BoxScoreIngest:
+    """Appends newly final games to a RollingStatsStore."""
+
+    def __init__(self, api: APIBasketballClient, store: RollingStatsStore):
+        self.api = api
+        self.store = store
+        self._ingested: Set[Any] = set()
+        self._order: Deque[Any] = deque()
+        self._pending: Dict[Any, str] = {}    # Game id → date listed, seen before final
+        store.subscribe(self._invalidate_caches)
+
+    async def poll(self, today: Optional[date] = None) -> int:
+        """
+        Ingest today's final games and those still pending from yesterday.
+
+        Returns the number of entity updates.
+        """
+        today = today or date.today()
+        yesterday = (today - timedelta(days=1)).isoformat()
+        dates = [today.isoformat(), *sorted(
+            {d for d in self._pending.values() if yesterday <= d < today.isoformat()}
+        )]
+        self._pending.clear()
+
+        batches = await asyncio.gather(
+            self.api.get_games_today(), *(self.api.get_games_by_date(d) for d in dates[1:])
+        )
+        updates = 0
+        for listed, games in zip(dates, batches):
+            for game in games:
+                if game.get("status", {}).get("short") != "FT":
+                    self._pending[game.get("id")] = listed
+                    continue
+                updates += await self.ingest_game(game)
+        return updates
+
+    async def ingest_game(self, game: Dict) -> int:
+        """Ingest one game if it is final and new. Returns entity updates."""
+        game_id = game.get("id")
+        if game.get("status", {}).get("short") != "FT" or game_id in self._ingested:
+            return 0
+
+        updates = 0
+        for side in ("home", "away"):
+            team_id = game.get("teams", {}).get(side, {}).get("id")
+            result = self.api.parse_game_result(game, team_id)
+            updates += self.store.append(TEAM, team_id, game_id, team_row(result))
+            game_log_index.append_team(team_id, game, result)
+
+        box_score: List[Dict] = await self.api.get_game_player_stats(game_id)
+        opponent_allowed.record_box_score(game_id, box_score)
+        usage_rates.record_box_score(game_id, box_score)
+        teammate_splits.record_box_score(game_id, box_score)
+        player_pool.record_box_score(game_id, box_score)
+        for stat in box_score:
+            player_id = stat.get("player", {}).get("id")
+            if player_id is None:
+                continue
+            stat_row = extract_stat_row(stat)
+            updates += self.store.append(PLAYER, player_id, game_id, player_row(stat_row))
+            game_log_index.append_player(
+                player_id, stat.get("team", {}).get("id"), _with_game(stat, game), stat_row
+            )
+
+        self._remember(game_id)
+        logger.info("Ingested final game %s (%d updates)", game_id, updates)
+        return updates
+
+    async def backfill(self, game_ids: Iterable[Any]) -> int:
+        """Fetch box scores of past games not recorded yet. Returns games fetched."""
+        missing = list(dict.fromkeys(
+            g for g in game_ids
+            if g is not None
+            and (g not in usage_rates or g not in teammate_splits or g not in player_pool)
+        ))
+        if not missing:
+            return 0
+        box_scores = dict(zip(
+            missing, await asyncio.gather(*(self.api.get_game_player_stats(g) for g in missing))
+        ))
+        usage_rates.record_box_scores(box_scores)
+        teammate_splits.record_box_scores(box_scores)
+        player_pool.record_box_scores(box_scores)
+        logger.info("Backfilled %d box scores", len(missing))
+        return len(missing)
+
+    def _remember(self, game_id: Any) -> None:
+        self._ingested.add(game_id)
+        self._order.append(game_id)
+        while len(self._order) > INGESTED_GAMES_MAX:
+            self._ingested.discard(self._order.popleft())
+
+    def _invalidate_caches(self, change: StatsChange) -> None:
+        if change.kind == PLAYER:
+            self.api.invalidate_cache("players/statistics", player=change.entity_id)
+        elif change.kind == TEAM:
+            self.api.invalidate_cache("games", team=change.entity_id)
+
+
+def _with_game(stat: Dict, game: Dict) -> Dict:
+    """A box-score line with its game's id / date filled in if missing."""
+    if stat.get("game", {}).get("id") is not None:
+        return stat
+    return {**stat, "game": {"id": game.get("id"), "date": game.get("date")}}
+
+
+def recent_game_ids(team_game_ids: Dict[Any, Sequence[Any]], limit: int = ROLE_BACKFILL_GAMES) -> List[Any]:
+    """Each team's last `limit` game ids, de-duplicated (for backfill)."""
+    return list(dict.fromkeys(g for ids in team_game_ids.values() for g in list(ids)[:limit]))
+
+
+# Global ingest instance
+box_score_ingest = BoxScoreIngest(api_client, rolling_stats)
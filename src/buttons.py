@@ -2,15 +2,20 @@
 NBABot v10.0 Button Handlers (FIXED)
 
 Handles all Discord button interactions with proper defer/reply pattern.
+
+Parlay buttons are persistent: the parlay id is encoded in each button's
+custom_id and the parlay is loaded from the store on click, so buttons
+never expire and live messages hold no memory.
 """
 
 import discord
-from discord.ui import View, Button, Select
+from discord.ui import View, Button, Select, DynamicItem
 from typing import Optional, List
 from datetime import datetime
 
 from embeds import build_insights_embed, build_explain_embed, build_parlay_embed
 from parlay_engine import parlay_engine, Parlay, Leg
+from simulation import SimulationResult
 
 
 class LegSelectMenu(discord.ui.Select):
@@ -49,7 +54,12 @@ class LegSelectMenu(discord.ui.Select):
         await interaction.response.defer(ephemeral=True)
         
         leg_id = self.values[0]
-        leg = parlay_engine.get_leg(leg_id)
+        
+        # The parlay's own copy carries the odds it was priced at; the
+        # store's latest copy of the leg may have been re-priced since
+        leg = next((l for l in self.parlay.legs if l.id == leg_id), None)
+        if not leg:
+            leg = parlay_engine.get_leg(leg_id)
         
         if not leg:
             await interaction.followup.send(
@@ -74,96 +84,158 @@ class LegSelectView(View):
         self.add_item(LegSelectMenu(parlay, action))
 
 
-class ParlayView(View):
+# custom_id layout: "nbabot:<action>:<parlay_id>"
+PARLAY_ID_PATTERN = r"(?P<parlay_id>parlay_[a-z0-9]+)"
+REFRESH_COOLDOWN_SECONDS = 5
+
+
+async def _load_parlay(interaction: discord.Interaction, parlay_id: str) -> Optional[Parlay]:
+    """Resolve a parlay from the store, telling the user if it is gone."""
+    parlay = parlay_engine.get_parlay(parlay_id)
+    if not parlay:
+        await interaction.followup.send(
+            "❌ Parlay data not found. Please generate a new parlay.",
+            ephemeral=True
+        )
+    return parlay
+
+
+class InsightsButton(DynamicItem[Button], template=rf"nbabot:insights:{PARLAY_ID_PATTERN}"):
     """
-    Main view with parlay interaction buttons.
-    Fixed with proper interaction handling.
+    Show statistical insights for the parlay.
+    INSIGHTS = Numerical data summary, risk analysis.
     """
     
-    def __init__(self, parlay: Parlay, timeout: float = 300.0):
-        super().__init__(timeout=timeout)
-        self.parlay = parlay
-        self.last_refresh = datetime.now()
+    def __init__(self, parlay_id: str):
+        self.parlay_id = parlay_id
+        super().__init__(
+            Button(
+                label="📊 Insights",
+                style=discord.ButtonStyle.primary,
+                custom_id=f"nbabot:insights:{parlay_id}"
+            )
+        )
     
-    @discord.ui.button(label="📊 Insights", style=discord.ButtonStyle.primary)
-    async def insights_button(self, interaction: discord.Interaction, button: Button):
-        """
-        Show statistical insights for the parlay.
-        INSIGHTS = Numerical data summary, risk analysis.
-        """
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match["parlay_id"])
+    
+    async def callback(self, interaction: discord.Interaction):
         # Defer immediately to prevent timeout
         await interaction.response.defer(ephemeral=True)
         
-        # Build insights summary for entire parlay
-        insights_text = self._build_parlay_insights()
+        parlay = await _load_parlay(interaction, self.parlay_id)
+        if not parlay:
+            return
+        
+        simulation = await parlay_engine.estimate_joint_probability(parlay)
         
+        # Build insights summary for entire parlay
         embed = discord.Embed(
             title="📊 PARLAY INSIGHTS",
-            description=insights_text,
+            description=build_parlay_insights(parlay, simulation),
             color=0x1D428A
         )
         embed.set_footer(text="NBABot v10.0 | Data Analysis")
         
         # Also show leg selector for individual leg insights
-        view = LegSelectView(self.parlay, "insights")
+        view = LegSelectView(parlay, "insights")
         
         await interaction.followup.send(
             embed=embed,
             view=view,
             ephemeral=True
         )
+
+
+class ExplainButton(DynamicItem[Button], template=rf"nbabot:explain:{PARLAY_ID_PATTERN}"):
+    """
+    Explain why picks were included.
+    EXPLAIN = Human-readable reasoning, educational.
+    """
     
-    @discord.ui.button(label="📖 Explain", style=discord.ButtonStyle.secondary)
-    async def explain_button(self, interaction: discord.Interaction, button: Button):
-        """
-        Explain why picks were included.
-        EXPLAIN = Human-readable reasoning, educational.
-        """
+    def __init__(self, parlay_id: str):
+        self.parlay_id = parlay_id
+        super().__init__(
+            Button(
+                label="📖 Explain",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"nbabot:explain:{parlay_id}"
+            )
+        )
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match["parlay_id"])
+    
+    async def callback(self, interaction: discord.Interaction):
         # Defer immediately to prevent timeout
         await interaction.response.defer(ephemeral=True)
         
-        # Build explanation for entire parlay
-        explain_text = self._build_parlay_explanation()
+        parlay = await _load_parlay(interaction, self.parlay_id)
+        if not parlay:
+            return
         
+        # Build explanation for entire parlay
         embed = discord.Embed(
             title="📖 WHY THIS PARLAY WAS GENERATED",
-            description=explain_text,
+            description=build_parlay_explanation(parlay),
             color=0x1D428A
         )
         embed.set_footer(text="NBABot v10.0 | Educational Only")
         
         # Also show leg selector for individual explanations
-        view = LegSelectView(self.parlay, "explain")
+        view = LegSelectView(parlay, "explain")
         
         await interaction.followup.send(
             embed=embed,
             view=view,
             ephemeral=True
         )
+
+
+class RefreshButton(DynamicItem[Button], template=rf"nbabot:refresh:{PARLAY_ID_PATTERN}"):
+    """
+    Generate a new parlay with same settings.
+    Uses deferUpdate() and edits existing message.
+    """
+    
+    def __init__(self, parlay_id: str):
+        self.parlay_id = parlay_id
+        super().__init__(
+            Button(
+                label="🔄 Refresh",
+                style=discord.ButtonStyle.success,
+                custom_id=f"nbabot:refresh:{parlay_id}"
+            )
+        )
     
-    @discord.ui.button(label="🔄 Refresh", style=discord.ButtonStyle.success)
-    async def refresh_button(self, interaction: discord.Interaction, button: Button):
-        """
-        Generate a new parlay with same settings.
-        Uses deferUpdate() and edits existing message.
-        """
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match["parlay_id"])
+    
+    async def callback(self, interaction: discord.Interaction):
         # Use deferUpdate for refresh (edits existing message)
         await interaction.response.defer()
         
-        # Check cooldown (5 seconds)
-        time_since_refresh = (datetime.now() - self.last_refresh).total_seconds()
-        if time_since_refresh < 5:
+        parlay = await _load_parlay(interaction, self.parlay_id)
+        if not parlay:
+            return
+        
+        # Check cooldown (5 seconds since the current parlay was created)
+        time_since_refresh = _seconds_since(parlay.created_at)
+        if time_since_refresh < REFRESH_COOLDOWN_SECONDS:
             await interaction.followup.send(
-                f"⏳ Please wait {5 - int(time_since_refresh)} seconds before refreshing.",
+                f"⏳ Please wait {REFRESH_COOLDOWN_SECONDS - int(time_since_refresh)} seconds before refreshing.",
                 ephemeral=True
             )
             return
         
         # Generate new parlay with same settings
         new_parlay = await parlay_engine.generate_parlay(
-            legs_count=self.parlay.leg_count,
-            wager=self.parlay.wager,
-            ladder=self.parlay.ladder,
+            legs_count=parlay.leg_count,
+            wager=parlay.wager,
+            ladder=parlay.ladder,
             user_id=str(interaction.user.id),
             guild_id=str(interaction.guild_id) if interaction.guild_id else None,
             channel_id=str(interaction.channel_id) if interaction.channel_id else None
@@ -176,46 +248,72 @@ class ParlayView(View):
             )
             return
         
-        # Update references
-        self.parlay = new_parlay
-        self.last_refresh = datetime.now()
-        
         # Build new embed with refresh timestamp
         embed = build_parlay_embed(new_parlay)
         
         # Add refresh timestamp to footer
-        refresh_time = self.last_refresh.strftime("%I:%M %p")
+        refresh_time = datetime.now().strftime("%I:%M %p")
         embed.set_footer(text=f"🔄 Refreshed: {refresh_time} | NBABot v10.0 | Educational Only")
         
-        # Edit the original message
-        await interaction.message.edit(embed=embed, view=self)
+        # Edit the original message — new buttons point at the new parlay
+        await interaction.message.edit(embed=embed, view=ParlayView(new_parlay))
+
+
+class ParlayView(View):
+    """
+    Main view with parlay interaction buttons.
     
-    def _build_parlay_insights(self) -> str:
-        """Build statistical insights for the parlay."""
-        # Calculate average hit rate
-        total_percentage = sum(leg.hit_rate.percentage for leg in self.parlay.legs)
-        avg_hit_rate = total_percentage / len(self.parlay.legs)
-        
-        # Find highest risk leg (lowest hit rate)
-        highest_risk = min(self.parlay.legs, key=lambda l: l.hit_rate.percentage)
-        
-        # Find lowest risk leg (highest hit rate)
-        lowest_risk = max(self.parlay.legs, key=lambda l: l.hit_rate.percentage)
-        
-        # Count correlated legs (same game)
-        game_ids = [leg.matchup.game_id for leg in self.parlay.legs]
-        correlated = len(game_ids) - len(set(game_ids))
-        
-        # Count leg types
-        type_counts = {}
-        for leg in self.parlay.legs:
-            type_counts[leg.type] = type_counts.get(leg.type, 0) + 1
-        
-        insights = f"""
+    Persistent (no timeout): button state lives in the custom_ids, and the
+    button classes are registered once via PERSISTENT_ITEMS at startup.
+    """
+    
+    def __init__(self, parlay: Parlay):
+        super().__init__(timeout=None)
+        self.add_item(InsightsButton(parlay.id))
+        self.add_item(ExplainButton(parlay.id))
+        self.add_item(RefreshButton(parlay.id))
+
+
+# Register with bot.add_dynamic_items(*PERSISTENT_ITEMS) in setup_hook
+PERSISTENT_ITEMS = (InsightsButton, ExplainButton, RefreshButton)
+
+
+def _seconds_since(timestamp: Optional[str]) -> float:
+    """Seconds elapsed since an ISO timestamp (inf if missing/invalid)."""
+    if not timestamp:
+        return float("inf")
+    try:
+        return (datetime.now() - datetime.fromisoformat(timestamp)).total_seconds()
+    except ValueError:
+        return float("inf")
+
+
+def build_parlay_insights(parlay: Parlay, simulation: Optional[SimulationResult] = None) -> str:
+    """Build statistical insights for the parlay (plus simulation, if run)."""
+    # Calculate average hit rate
+    total_percentage = sum(leg.hit_rate.percentage for leg in parlay.legs)
+    avg_hit_rate = total_percentage / len(parlay.legs)
+    
+    # Find highest risk leg (lowest hit rate)
+    highest_risk = min(parlay.legs, key=lambda l: l.hit_rate.percentage)
+    
+    # Find lowest risk leg (highest hit rate)
+    lowest_risk = max(parlay.legs, key=lambda l: l.hit_rate.percentage)
+    
+    # Count correlated legs (same game)
+    game_ids = [leg.matchup.game_id for leg in parlay.legs]
+    correlated = len(game_ids) - len(set(game_ids))
+    
+    # Count leg types
+    type_counts = {}
+    for leg in parlay.legs:
+        type_counts[leg.type] = type_counts.get(leg.type, 0) + 1
+    
+    insights = f"""
 **📈 Overall Statistics**
 • Average Hit Rate: **{avg_hit_rate:.1f}%**
-• Total Legs: **{len(self.parlay.legs)}**
-• Sample Window: **Last {self.parlay.ladder} games**
+• Total Legs: **{len(parlay.legs)}**
+• Sample Window: **Last {parlay.ladder} games**
 
 **⚠️ Risk Analysis**
 • Highest Risk: **{highest_risk.selection.label[:40]}** ({highest_risk.hit_rate.percentage:.0f}%)
@@ -224,19 +322,32 @@ class ParlayView(View):
 
 **🎯 Leg Breakdown**
 """
-        for leg_type, count in type_counts.items():
-            type_name = leg_type.replace("_", " ").title()
-            insights += f"• {type_name}: **{count}**\n"
-        
-        return insights
+    for leg_type, count in type_counts.items():
+        type_name = leg_type.replace("_", " ").title()
+        insights += f"• {type_name}: **{count}**\n"
     
-    def _build_parlay_explanation(self) -> str:
-        """Build human-readable explanation for the parlay."""
-        threshold = {5: 3, 10: 7, 15: 10}[self.parlay.ladder]
-        
-        explanation = f"""
+    if simulation:
+        insights += f"""
+**🎲 Simulated Outcome** ({simulation.trials:,} trials)
+• Joint Hit Probability: **{simulation.joint_probability * 100:.1f}%**
+• If Legs Were Independent: **{simulation.independent_probability * 100:.1f}%** (same-game lift ×{simulation.correlation_lift:.2f})
+"""
+        for i, leg in enumerate(parlay.legs):
+            insights += (
+                f"• Leg {i + 1}: {simulation.marginals[i] * 100:.0f}% alone, "
+                f"costs **{simulation.contribution(i) * 100:.1f}** pts\n"
+            )
+    
+    return insights
+
+
+def build_parlay_explanation(parlay: Parlay) -> str:
+    """Build human-readable explanation for the parlay."""
+    threshold = {5: 3, 10: 7, 15: 10}[parlay.ladder]
+    
+    explanation = f"""
 **🎯 Selection Criteria**
-Each leg was selected because it has hit in at least **{threshold} of the last {self.parlay.ladder} games** ({(threshold/self.parlay.ladder)*100:.0f}%+ hit rate).
+Each leg was selected because it has hit in at least **{threshold} of the last {parlay.ladder} games** ({(threshold/parlay.ladder)*100:.0f}%+ hit rate).
 
 **📊 Methodology**
 • Recent form was prioritized over season averages
@@ -245,28 +356,23 @@ Each leg was selected because it has hit in at least **{threshold} of the last {
 
 **⚠️ Important Notes**
 """
-        # Check for correlated legs
-        game_ids = [leg.matchup.game_id for leg in self.parlay.legs]
-        if len(game_ids) != len(set(game_ids)):
-            explanation += "• ⚡ Some legs come from the same matchup, which increases variance\n"
-        
-        # Check for any player props
-        player_props = [l for l in self.parlay.legs if l.type == "player_prop"]
-        if player_props:
-            explanation += f"• 👤 Contains {len(player_props)} player prop(s) — more volatile than team bets\n"
-        
-        # Check for totals
-        totals = [l for l in self.parlay.legs if "total" in l.type]
-        if totals:
-            explanation += f"• 📊 Contains {len(totals)} total(s) — affected by pace and game script\n"
-        
-        explanation += """
+    # Check for correlated legs
+    game_ids = [leg.matchup.game_id for leg in parlay.legs]
+    if len(game_ids) != len(set(game_ids)):
+        explanation += "• ⚡ Some legs come from the same matchup, which increases variance\n"
+    
+    # Check for any player props
+    player_props = [l for l in parlay.legs if l.type == "player_prop"]
+    if player_props:
+        explanation += f"• 👤 Contains {len(player_props)} player prop(s) — more volatile than team bets\n"
+    
+    # Check for totals
+    totals = [l for l in parlay.legs if "total" in l.type]
+    if totals:
+        explanation += f"• 📊 Contains {len(totals)} total(s) — affected by pace and game script\n"
+    
+    explanation += """
 **📚 Educational Purpose**
 This parlay is generated for educational and entertainment purposes only. Past performance does not guarantee future results.
 """
-        return explanation
-    
-    async def on_timeout(self):
-        """Disable buttons after timeout."""
-        for item in self.children:
-            item.disabled = True
+    return explanation
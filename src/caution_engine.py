@@ -12,9 +12,11 @@ Core Rules (LOCKED):
 - Cautions appear BEFORE buttons in Discord output
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntFlag
+
+import numpy as np
 
 
 # ============================================
@@ -78,11 +80,24 @@ CAUTION_ICONS = {
 }
 
 
+# One bit per trigger, in CAUTION_TRIGGERS order (names match the keys, upper-cased)
+CautionFlag = IntFlag("CautionFlag", [key.upper() for key in CAUTION_TRIGGERS])
+
+# Triggers of each severity level, as one mask per level
+LEVEL_MASKS: Dict[int, int] = {
+    level: sum(CautionFlag[key.upper()] for key, t in CAUTION_TRIGGERS.items() if t["level"] == level)
+    for level in {t["level"] for t in CAUTION_TRIGGERS.values()}
+}
+
+HIGH_MASK = sum(mask for level, mask in LEVEL_MASKS.items() if level >= 2)
+EXCLUDED_MASK = sum(mask for level, mask in LEVEL_MASKS.items() if level >= 3)
+
+
 # ============================================
 # DATA STRUCTURES
 # ============================================
 
-@dataclass
+@dataclass(frozen=True)
 class Caution:
     """Single caution trigger."""
     key: str
@@ -90,15 +105,21 @@ class Caution:
     message: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class CautionResult:
-    """Result of caution detection."""
+    """
+    Result of caution detection.
+    
+    Interned per trigger mask (see caution_result), so results are shared
+    between legs and must not be modified.
+    """
     level: CautionLevel
     icon: str
-    triggers: List[Caution]
-    messages: List[str]
+    triggers: Tuple[Caution, ...]
+    messages: Tuple[str, ...]
     should_exclude: bool
     total_severity: int
+    flags: CautionFlag = CautionFlag(0)
 
 
 @dataclass
@@ -157,98 +178,118 @@ class TeamCautionData:
 # CORE FUNCTIONS
 # ============================================
 
-def detect_player_cautions(data: PlayerCautionData) -> CautionResult:
-    """
-    Detect cautions for a player prop.
-    
-    RULE: Cautions must always appear when triggered.
-    """
-    triggers = []
+def player_caution_mask(data: PlayerCautionData) -> int:
+    """CautionFlag mask of the triggers a player prop hits."""
+    flags = CautionFlag(0)
     
     # Check injury status
     if data.injury_status == "doubtful":
-        triggers.append(_get_caution("doubtful"))
+        flags |= CautionFlag.DOUBTFUL
     elif data.injury_status == "questionable":
-        triggers.append(_get_caution("questionable"))
+        flags |= CautionFlag.QUESTIONABLE
     
     if data.is_game_time_decision:
-        triggers.append(_get_caution("game_time_decision"))
+        flags |= CautionFlag.GAME_TIME_DECISION
     
     # Check minutes volatility
     if data.low_minute_game_count >= 2:
-        triggers.append(_get_caution("minutes_drop_multiple"))
+        flags |= CautionFlag.MINUTES_DROP_MULTIPLE
     elif data.low_minute_game_count == 1:
-        triggers.append(_get_caution("minutes_drop_single"))
+        flags |= CautionFlag.MINUTES_DROP_SINGLE
     
     if data.minutes_last_game and data.minutes_avg:
         if data.minutes_last_game < data.minutes_avg * 0.75:
-            triggers.append(_get_caution("low_minutes_recent"))
+            flags |= CautionFlag.LOW_MINUTES_RECENT
     
     # Check role changes
     if data.role_shift_severity == "major":
-        triggers.append(_get_caution("role_shift_major"))
+        flags |= CautionFlag.ROLE_SHIFT_MAJOR
     elif data.role_shift_severity == "minor" or data.role_shift_detected:
-        triggers.append(_get_caution("role_shift_minor"))
+        flags |= CautionFlag.ROLE_SHIFT_MINOR
     
     if data.assist_rate_trending_up:
-        triggers.append(_get_caution("facilitator_increase"))
+        flags |= CautionFlag.FACILITATOR_INCREASE
     
     # Check team context
     if data.star_player_out:
-        triggers.append(_get_caution("star_player_out"))
+        flags |= CautionFlag.STAR_PLAYER_OUT
     elif data.key_teammate_out:
-        triggers.append(_get_caution("teammate_out"))
+        flags |= CautionFlag.TEAMMATE_OUT
     
     if data.is_back_to_back:
-        triggers.append(_get_caution("back_to_back"))
+        flags |= CautionFlag.BACK_TO_BACK
     
     # Check matchup
     if data.blowout_risk:
-        triggers.append(_get_caution("blowout_risk"))
+        flags |= CautionFlag.BLOWOUT_RISK
     
     if data.pace_down_matchup:
-        triggers.append(_get_caution("pace_down"))
+        flags |= CautionFlag.PACE_DOWN
     
     if data.elite_defender_matchup:
-        triggers.append(_get_caution("strong_defender"))
+        flags |= CautionFlag.STRONG_DEFENDER
     
     # Check location
     if data.is_road:
-        triggers.append(_get_caution("road_game"))
+        flags |= CautionFlag.ROAD_GAME
     
-    return _build_caution_result(triggers)
+    return int(flags)
 
 
-def detect_team_cautions(data: TeamCautionData) -> CautionResult:
-    """
-    Detect cautions for team bets (ML, spread, total).
-    
-    RULE: Cautions must always appear when triggered.
-    """
-    triggers = []
+def team_caution_mask(data: TeamCautionData) -> int:
+    """CautionFlag mask of the triggers a team bet hits."""
+    flags = CautionFlag(0)
     
     # Check roster
     if data.star_player_out:
-        triggers.append(_get_caution("star_player_out"))
+        flags |= CautionFlag.STAR_PLAYER_OUT
     elif data.key_player_out:
-        triggers.append(_get_caution("teammate_out"))
+        flags |= CautionFlag.TEAMMATE_OUT
     
     # Check schedule
     if data.is_back_to_back:
-        triggers.append(_get_caution("back_to_back"))
+        flags |= CautionFlag.BACK_TO_BACK
     
     if data.is_road:
-        triggers.append(_get_caution("road_game"))
+        flags |= CautionFlag.ROAD_GAME
     
     # Check line
     if data.is_large_spread or data.spread_size >= 10:
-        triggers.append(_get_caution("large_spread"))
+        flags |= CautionFlag.LARGE_SPREAD
     
     # Check matchup
     if data.blowout_risk:
-        triggers.append(_get_caution("blowout_risk"))
+        flags |= CautionFlag.BLOWOUT_RISK
+    
+    return int(flags)
+
+
+def detect_player_cautions(data: PlayerCautionData) -> CautionResult:
+    """
+    Detect cautions for a player prop.
+    
+    RULE: Cautions must always appear when triggered.
+    """
+    return caution_result(player_caution_mask(data))
+
+
+def detect_team_cautions(data: TeamCautionData) -> CautionResult:
+    """
+    Detect cautions for team bets (ML, spread, total).
     
-    return _build_caution_result(triggers)
+    RULE: Cautions must always appear when triggered.
+    """
+    return caution_result(team_caution_mask(data))
+
+
+def detect_player_cautions_many(items: Sequence[PlayerCautionData]) -> List[CautionResult]:
+    """Detect player cautions for a whole slate (one compute-backend task)."""
+    return caution_results([player_caution_mask(data) for data in items])
+
+
+def detect_team_cautions_many(items: Sequence[TeamCautionData]) -> List[CautionResult]:
+    """Detect team cautions for a whole slate (one compute-backend task)."""
+    return caution_results([team_caution_mask(data) for data in items])
 
 
 def detect_spread_cautions(
@@ -260,21 +301,21 @@ def detect_spread_cautions(
     """
     Detect cautions specific to spread bets.
     """
-    triggers = []
+    flags = CautionFlag(0)
     
     if abs(spread_size) >= 10:
-        triggers.append(_get_caution("large_spread"))
+        flags |= CautionFlag.LARGE_SPREAD
     
     if abs(cover_margin) < 2:
-        triggers.append(_get_caution("thin_margin"))
+        flags |= CautionFlag.THIN_MARGIN
     
     if is_road:
-        triggers.append(_get_caution("road_game"))
+        flags |= CautionFlag.ROAD_GAME
     
     if back_to_back:
-        triggers.append(_get_caution("back_to_back"))
+        flags |= CautionFlag.BACK_TO_BACK
     
-    return _build_caution_result(triggers)
+    return caution_result(int(flags))
 
 
 def detect_alt_line_cautions(
@@ -284,34 +325,29 @@ def detect_alt_line_cautions(
     """
     Detect cautions for alt line picks.
     """
-    triggers = []
+    flags = CautionFlag(0)
     
     if is_alt_line and hit_rate_variance > 0.15:
-        triggers.append(_get_caution("alt_line_volatility"))
+        flags |= CautionFlag.ALT_LINE_VOLATILITY
     
-    return _build_caution_result(triggers)
+    return caution_result(int(flags))
 
 
 # ============================================
-# HELPER FUNCTIONS
+# MASK ARITHMETIC (SCALAR OR ARRAY)
 # ============================================
 
-def _get_caution(key: str) -> Caution:
-    """Get caution object from key."""
-    if key not in CAUTION_TRIGGERS:
-        return Caution(key=key, level=1, message=f"Unknown caution: {key}")
-    
-    trigger = CAUTION_TRIGGERS[key]
-    return Caution(
-        key=key,
-        level=trigger["level"],
-        message=trigger["message"]
-    )
+def caution_severity(masks: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+    """Total severity of a mask (or array of masks): the sum of trigger levels."""
+    severity = 0
+    for flag in CautionFlag:
+        severity = severity + ((masks & flag) != 0) * CAUTION_TRIGGERS[flag.name.lower()]["level"]
+    return severity
 
 
-def _build_caution_result(triggers: List[Caution]) -> CautionResult:
+def caution_levels(masks: Union[int, np.ndarray]) -> np.ndarray:
     """
-    Build caution result from triggers.
+    CautionLevel value of a mask (or array of masks).
     
     RULE: 
     - 0 triggers = NONE
@@ -319,45 +355,73 @@ def _build_caution_result(triggers: List[Caution]) -> CautionResult:
     - 2+ triggers OR any level 2 = HIGH
     - Level 3 = EXCLUDED
     """
-    if not triggers:
-        return CautionResult(
-            level=CautionLevel.NONE,
-            icon="",
-            triggers=[],
-            messages=[],
-            should_exclude=False,
-            total_severity=0
-        )
+    severity = caution_severity(masks)
+    return np.select(
+        [(masks & EXCLUDED_MASK) != 0, (severity >= 3) | ((masks & HIGH_MASK) != 0), severity >= 1],
+        [CautionLevel.EXCLUDED.value, CautionLevel.HIGH.value, CautionLevel.MILD.value],
+        CautionLevel.NONE.value,
+    )
+
+
+# ============================================
+# INTERNED RESULTS
+# ============================================
+
+# Every distinct trigger mask maps to one shared CautionResult
+_CAUTIONS = {
+    CautionFlag[key.upper()]: Caution(key=key, level=trigger["level"], message=trigger["message"])
+    for key, trigger in CAUTION_TRIGGERS.items()
+}
+_RESULTS: Dict[int, CautionResult] = {}
+
+
+def caution_result(mask: int) -> CautionResult:
+    """
+    Shared CautionResult for a trigger mask.
     
-    # Calculate total severity
-    total_severity = sum(t.level for t in triggers)
-    
-    # Check for exclusion
-    if any(t.level >= 3 for t in triggers):
-        return CautionResult(
-            level=CautionLevel.EXCLUDED,
-            icon=CAUTION_ICONS[CautionLevel.EXCLUDED],
-            triggers=triggers,
-            messages=[t.message for t in triggers],
-            should_exclude=True,
-            total_severity=total_severity
+    Triggers and messages are listed in CAUTION_TRIGGERS order.
+    """
+    result = _RESULTS.get(mask)
+    if result is None:
+        result = _RESULTS[mask] = _build_caution_result(
+            mask, int(caution_severity(mask)), CautionLevel(int(caution_levels(mask)))
         )
+    return result
+
+
+def caution_results(masks: Sequence[int]) -> List[CautionResult]:
+    """
+    CautionResults for a slate of masks.
     
-    # Determine level
-    if total_severity >= 3 or any(t.level >= 2 for t in triggers):
-        level = CautionLevel.HIGH
-    elif total_severity >= 1:
-        level = CautionLevel.MILD
-    else:
-        level = CautionLevel.NONE
-    
+    Severity and level are computed once per distinct mask with array
+    operations; legs with the same mask share one result.
+    """
+    masks = np.asarray(masks, dtype=np.int64).reshape(-1)
+    unique, inverse = np.unique(masks, return_inverse=True)
+    severity = caution_severity(unique)
+    levels = caution_levels(unique)
+    
+    results = []
+    for mask, total, level in zip(unique.tolist(), severity.tolist(), levels.tolist()):
+        result = _RESULTS.get(mask)
+        if result is None:
+            result = _RESULTS[mask] = _build_caution_result(mask, total, CautionLevel(level))
+        results.append(result)
+    return [results[i] for i in inverse.reshape(-1).tolist()]
+
+
+def _build_caution_result(mask: int, total_severity: int, level: CautionLevel) -> CautionResult:
+    """Build the (interned) result for a mask."""
+    flags = CautionFlag(mask)
+    triggers = tuple(_CAUTIONS[flag] for flag in CautionFlag if flag in flags)
     return CautionResult(
         level=level,
         icon=CAUTION_ICONS[level],
         triggers=triggers,
-        messages=[t.message for t in triggers],
-        should_exclude=False,
-        total_severity=total_severity
+        messages=tuple(t.message for t in triggers),
+        should_exclude=level == CautionLevel.EXCLUDED,
+        total_severity=total_severity,
+        flags=flags
     )
 
 
@@ -0,0 +1,302 @@
+"""
+NBABot v11 — Command Scheduler
+
+ADDED FOR: Queueing heavy command work between ParlayCog and the engine
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Heavy work (slate searches, background polls) is submitted as a job and
+  run by SCHEDULER_WORKERS workers on the event loop
+- Two priority classes: INTERACTIVE (slash commands) always runs before
+  SCHEDULED (background polls)
+- Within a class, queues are fair: guilds take turns, and within a guild
+  users take turns; one user's jobs run in submission order
+- Identical jobs (same key) share one run while queued or in flight: late
+  submitters await the same result and hear its progress reports from then on
+- A guild may have at most SCHEDULER_GUILD_QUEUE_MAX jobs queued; more
+  raise SchedulerBusy
+- queue_depth() / stats() report what is waiting, per class and per guild
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional
+
+from config import SCHEDULER_GUILD_QUEUE_MAX, SCHEDULER_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Guild key for work not tied to a guild (DMs, background polls)
+NO_GUILD = "-"
+
+Report = Callable[..., None]
+
+
+class Priority(IntEnum):
+    """Lower runs first."""
+    INTERACTIVE = 0
+    SCHEDULED = 1
+
+
+class SchedulerBusy(Exception):
+    """The guild already has SCHEDULER_GUILD_QUEUE_MAX jobs queued."""
+
+
+@dataclass(slots=True)
+class Job:
+    """One unit of queued work and everyone waiting on it."""
+    key: Hashable
+    factory: Callable[[Report], Awaitable[Any]]
+    guild_id: str
+    user_id: str
+    priority: Priority
+    future: asyncio.Future
+    listeners: List[Report] = field(default_factory=list)
+    waiters: int = 1
+
+    def report(self, *args: Any) -> None:
+        """Fan a progress report out to every waiter's listener."""
+        for listener in self.listeners:
+            try:
+                listener(*args)
+            except Exception:
+                logger.exception("Scheduler progress listener failed")
+
+
+class FairQueue:
+    """
+    Round-robin over guilds, then over a guild's users; FIFO per user.
+
+    discard() leaves a tombstone in place instead of rebuilding the queue;
+    pop() skips tombstones without using up a guild's or user's turn.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Deque[Job]]] = {}
+        self._guilds: Deque[str] = deque()
+        self._users: Dict[str, Deque[str]] = {}
+        self._queued: Dict[int, Job] = {}       # id(job) → job, live entries only
+        self._depths: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def depth(self, guild_id: str) -> int:
+        return self._depths.get(guild_id, 0)
+
+    def guild_depths(self) -> Dict[str, int]:
+        return dict(self._depths)
+
+    def push(self, job: Job) -> None:
+        users = self._jobs.setdefault(job.guild_id, {})
+        if not users:
+            self._guilds.append(job.guild_id)
+            self._users[job.guild_id] = deque()
+        if job.user_id not in users:
+            users[job.user_id] = deque()
+            self._users[job.guild_id].append(job.user_id)
+        users[job.user_id].append(job)
+        self._queued[id(job)] = job
+        self._depths[job.guild_id] = self._depths.get(job.guild_id, 0) + 1
+
+    def discard(self, job: Job) -> bool:
+        """Take a queued job out (False if it is not queued here). O(1)."""
+        if self._queued.pop(id(job), None) is None:
+            return False
+        self._count_out(job.guild_id)
+        return True
+
+    def pop(self) -> Optional[Job]:
+        while self._guilds:
+            guild_id = self._guilds[0]
+            users, turns = self._jobs[guild_id], self._users[guild_id]
+            user_id = turns[0]
+            job = users[user_id].popleft()
+            live = self._queued.pop(id(job), None) is not None
+            # A live job ends the user's turn; a tombstone does not
+            if live or not users[user_id]:
+                turns.popleft()
+                if users[user_id]:
+                    turns.append(user_id)
+                else:
+                    del users[user_id]
+            self._guilds.popleft()
+            if turns:
+                if live:
+                    self._guilds.append(guild_id)
+                else:
+                    self._guilds.appendleft(guild_id)
+            else:
+                del self._jobs[guild_id], self._users[guild_id]
+            if live:
+                self._count_out(guild_id)
+                return job
+        return None
+
+    def _count_out(self, guild_id: str) -> None:
+        self._depths[guild_id] -= 1
+        if not self._depths[guild_id]:
+            del self._depths[guild_id]
+
+
+class CommandScheduler:
+    """Priority classes of fair queues, drained by a fixed set of workers."""
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS, guild_queue_max: int = SCHEDULER_GUILD_QUEUE_MAX):
+        self.workers = workers
+        self.guild_queue_max = guild_queue_max
+        self._queues: Dict[Priority, FairQueue] = {p: FairQueue() for p in Priority}
+        self._inflight: Dict[Hashable, Job] = {}
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = 0
+        self._completed = 0
+        self._deduped = 0
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self) -> None:
+        """Start the workers (called lazily by submit)."""
+        if self._tasks:
+            return
+        self._ready = asyncio.Semaphore(len(self))
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info("Command scheduler started (%d workers)", self.workers)
+
+    async def close(self) -> None:
+        """Stop the workers; queued jobs are cancelled."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for queue in self._queues.values():
+            while (job := queue.pop()) is not None:
+                job.future.cancel()
+        self._inflight.clear()
+
+    # ==================== CORE API ====================
+
+    async def submit(
+        self,
+        key: Hashable,
+        factory: Callable[[Report], Awaitable[Any]],
+        guild_id: Optional[Any] = None,
+        user_id: Optional[Any] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        progress: Optional[Report] = None
+    ) -> Any:
+        """
+        Queue `factory(report)` and await its result.
+
+        Args:
+            key: Identity of the work; an identical queued or running job
+                 is shared instead of queued again
+            factory: Coroutine function doing the work; `report(...)` sends
+                     progress to every waiter
+            progress: This waiter's progress listener
+
+        Raises:
+            SchedulerBusy: The guild's queue is full
+        """
+        self.start()
+        job = self._inflight.get(key)
+        if job is not None:
+            # A queued job shared with an interactive caller moves up
+            if priority < job.priority and self._queues[job.priority].discard(job):
+                job.priority = priority
+                self._queues[priority].push(job)
+            job.waiters += 1
+            self._deduped += 1
+        else:
+            guild_id = NO_GUILD if guild_id is None else str(guild_id)
+            depth = self._queues[priority].depth(guild_id)
+            if depth >= self.guild_queue_max:
+                raise SchedulerBusy(f"{depth} jobs queued for guild {guild_id}")
+            job = Job(
+                key=key, factory=factory, guild_id=guild_id,
+                user_id="-" if user_id is None else str(user_id),
+                priority=priority, future=asyncio.get_running_loop().create_future(),
+            )
+            # Every waiter may have been cancelled by the time it fails
+            job.future.add_done_callback(_retrieve)
+            self._inflight[key] = job
+            self._queues[priority].push(job)
+            self._ready.release()
+        if progress is not None:
+            job.listeners.append(progress)
+        try:
+            return await asyncio.shield(job.future)
+        finally:
+            if progress is not None and progress in job.listeners:
+                job.listeners.remove(progress)
+
+    # ==================== METRICS ====================
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def queue_depth(self, priority: Optional[Priority] = None) -> int:
+        """Jobs waiting for a worker (all classes, or one)."""
+        if priority is None:
+            return len(self)
+        return len(self._queues[priority])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": {p.name.lower(): len(q) for p, q in self._queues.items()},
+            "queued_by_guild": {
+                p.name.lower(): q.guild_depths() for p, q in self._queues.items() if len(q)
+            },
+            "running": self._running,
+            "completed": self._completed,
+            "deduped": self._deduped,
+            "workers": self.workers,
+        }
+
+    # ==================== HELPERS ====================
+
+    def _next(self) -> Optional[Job]:
+        for priority in Priority:
+            job = self._queues[priority].pop()
+            if job is not None:
+                return job
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            await self._ready.acquire()
+            job = self._next()
+            if job is None:
+                continue    # Permits track queued jobs; defensive only
+            self._running += 1
+            try:
+                result = await job.factory(job.report)
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as exc:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+            else:
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self._running -= 1
+                self._completed += 1
+                if self._inflight.get(job.key) is job:
+                    del self._inflight[job.key]
+                if len(self):
+                    logger.debug("Command queue depth: %d", len(self))
+
+
+def _retrieve(future: asyncio.Future) -> None:
+    """Mark a job's exception retrieved (waiters re-raise it themselves)."""
+    if not future.cancelled():
+        future.exception()
+
+
+# Global scheduler instance
+scheduler = CommandScheduler()
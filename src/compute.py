@@ -0,0 +1,98 @@
+"""
+NBABot v11 — Compute Backend
+
+ADDED FOR: Keeping CPU-bound analysis off the Discord event loop
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- CPU-bound stages (candidate evaluation, confidence scoring, projection
+  sweeps, parlay search) are plain module-level functions over compact,
+  picklable inputs
+- The event loop only fetches data and awaits results
+- The backend is pluggable: "process" (default) runs stages in a process
+  pool, "inline" runs them on the loop (tests / single-core hosts)
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+from config import COMPUTE_BACKEND, COMPUTE_WORKERS
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class InlineBackend:
+    """Runs stages directly on the calling thread."""
+
+    name = "inline"
+
+    def start(self) -> None:
+        pass
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) and return its result."""
+        return fn(*args)
+
+    async def map(self, fn: Callable[[Any], T], items: Iterable[Any]) -> List[T]:
+        """Run fn over items, preserving order."""
+        return [fn(item) for item in items]
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ProcessPoolBackend(InlineBackend):
+    """
+    Runs stages in a process pool.
+
+    The pool is created by start() (the bot's setup_hook), or on first
+    use, so importing this module never forks worker processes.
+    """
+
+    name = "process"
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """Fork the worker processes now rather than on the first stage."""
+        self._executor()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info("Compute pool started (%d workers)", self.max_workers)
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) in a worker process and await the result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), fn, *args)
+
+    async def map(self, fn: Callable[[Any], T], items: Iterable[Any]) -> List[T]:
+        """Run fn over items in parallel, preserving order."""
+        return list(await asyncio.gather(*(self.run(fn, item) for item in items)))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (pending stages are cancelled)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def create_backend(kind: str = COMPUTE_BACKEND, workers: int = COMPUTE_WORKERS) -> InlineBackend:
+    """Build a compute backend by name ("process" or "inline")."""
+    if kind == "inline":
+        return InlineBackend()
+    if kind == "process":
+        return ProcessPoolBackend(max_workers=workers)
+    raise ValueError(f"Unknown compute backend: {kind}")
+
+
+# Global backend instance
+compute_backend = create_backend()
@@ -12,8 +12,11 @@ Core Rules (LOCKED):
 - Final score: clamp(score, min=0, max=95)
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
+from enum import IntFlag
+
+import numpy as np
 
 
 # ============================================
@@ -104,6 +107,10 @@ class ContextData:
     h2h_favorable: bool = False
     is_home: bool = False
     
+    # Venue split (game_log_index.venue_rates); None = flat home / road rule
+    venue_hit_rate: Optional[float] = None      # Home or away games
+    overall_hit_rate: Optional[float] = None    # All games
+    
     # Negative context
     is_questionable: bool = False
     is_doubtful: bool = False
@@ -113,6 +120,29 @@ class ContextData:
     is_road: bool = False
 
 
+class ContextFlag(IntFlag):
+    """
+    One bit per modifier (names match the modifier keys, lower-cased).
+    
+    A context mask records which modifiers APPLY, so venue-resolved home /
+    road rules are already folded in. DOUBTFUL is display-only: it picks
+    the "why not higher" wording for QUESTIONABLE_DOUBTFUL.
+    """
+    ALT_LINE_CONSISTENCY = 1 << 0
+    MINUTES_STABLE = 1 << 1
+    ROLE_CLARITY = 1 << 2
+    FAVORABLE_MATCHUP = 1 << 3
+    H2H_ALIGNMENT = 1 << 4
+    HOME_ADVANTAGE = 1 << 5
+    QUESTIONABLE_DOUBTFUL = 1 << 6
+    ONE_LOW_MINUTE_GAME = 1 << 7
+    TWO_LOW_MINUTE_GAMES = 1 << 8
+    ROLE_SHIFT_CONFLICT = 1 << 9
+    KEY_TEAMMATE_MISSING = 1 << 10
+    ROAD_DISADVANTAGE = 1 << 11
+    DOUBTFUL = 1 << 12
+
+
 # ============================================
 # CORE FUNCTIONS
 # ============================================
@@ -207,7 +237,7 @@ def apply_positive_modifiers(base: int, context: ContextData) -> Tuple[int, Dict
         score += mod
         applied["h2h_alignment"] = mod
     
-    if context.is_home:
+    if context.is_home and _venue_holds(context):
         mod = POSITIVE_MODIFIERS["home_advantage"]
         score += mod
         applied["home_advantage"] = mod
@@ -258,7 +288,7 @@ def apply_negative_modifiers(score: int, context: ContextData) -> Tuple[int, Dic
         applied["key_teammate_missing"] = mod
         reasons.append("Key teammate missing")
     
-    if context.is_road:
+    if context.is_road and not _venue_holds(context):
         mod = NEGATIVE_MODIFIERS["road_disadvantage"]
         score += mod
         applied["road_disadvantage"] = mod
@@ -267,6 +297,19 @@ def apply_negative_modifiers(score: int, context: ContextData) -> Tuple[int, Dic
     return (score, applied, reasons)
 
 
+def _venue_holds(context: ContextData) -> bool:
+    """
+    Does the pick hold up at this venue?
+    
+    RULE: With a venue split, home advantage only applies if the home hit
+    rate is at least the overall rate, and road disadvantage only if the
+    road rate is below it. Without one, home always holds, road never does.
+    """
+    if context.venue_hit_rate is None or context.overall_hit_rate is None:
+        return context.is_home
+    return context.venue_hit_rate >= context.overall_hit_rate
+
+
 def get_confidence_tier(score: int) -> Tuple[str, str, str]:
     """
     Get confidence tier from score.
@@ -368,6 +411,151 @@ def calculate_confidence(
     )
 
 
+# ============================================
+# BATCH SCORING (TABLE-DRIVEN)
+# ============================================
+
+WINDOW_GAMES = (5, 10, 15)
+
+
+def context_mask(context: ContextData) -> int:
+    """ContextFlag mask of the modifiers a context triggers."""
+    flags = ContextFlag(0)
+    if context.alt_line_consistent:
+        flags |= ContextFlag.ALT_LINE_CONSISTENCY
+    if context.minutes_stable:
+        flags |= ContextFlag.MINUTES_STABLE
+    if context.role_clear:
+        flags |= ContextFlag.ROLE_CLARITY
+    if context.favorable_matchup:
+        flags |= ContextFlag.FAVORABLE_MATCHUP
+    if context.h2h_favorable:
+        flags |= ContextFlag.H2H_ALIGNMENT
+    if context.is_home and _venue_holds(context):
+        flags |= ContextFlag.HOME_ADVANTAGE
+    if context.is_questionable or context.is_doubtful:
+        flags |= ContextFlag.QUESTIONABLE_DOUBTFUL
+    if context.is_doubtful:
+        flags |= ContextFlag.DOUBTFUL
+    if context.low_minute_games >= 2:
+        flags |= ContextFlag.TWO_LOW_MINUTE_GAMES
+    elif context.low_minute_games == 1:
+        flags |= ContextFlag.ONE_LOW_MINUTE_GAME
+    if context.role_shift_detected:
+        flags |= ContextFlag.ROLE_SHIFT_CONFLICT
+    if context.teammate_missing:
+        flags |= ContextFlag.KEY_TEAMMATE_MISSING
+    if context.is_road and not _venue_holds(context):
+        flags |= ContextFlag.ROAD_DISADVANTAGE
+    return int(flags)
+
+
+def context_from_mask(mask: int) -> ContextData:
+    """A ContextData that triggers exactly the modifiers in `mask`."""
+    flags = ContextFlag(mask)
+    return ContextData(
+        alt_line_consistent=ContextFlag.ALT_LINE_CONSISTENCY in flags,
+        minutes_stable=ContextFlag.MINUTES_STABLE in flags,
+        role_clear=ContextFlag.ROLE_CLARITY in flags,
+        favorable_matchup=ContextFlag.FAVORABLE_MATCHUP in flags,
+        h2h_favorable=ContextFlag.H2H_ALIGNMENT in flags,
+        is_home=ContextFlag.HOME_ADVANTAGE in flags,
+        is_questionable=ContextFlag.QUESTIONABLE_DOUBTFUL in flags and ContextFlag.DOUBTFUL not in flags,
+        is_doubtful=ContextFlag.QUESTIONABLE_DOUBTFUL in flags and ContextFlag.DOUBTFUL in flags,
+        low_minute_games=(
+            2 if ContextFlag.TWO_LOW_MINUTE_GAMES in flags
+            else 1 if ContextFlag.ONE_LOW_MINUTE_GAME in flags
+            else 0
+        ),
+        role_shift_detected=ContextFlag.ROLE_SHIFT_CONFLICT in flags,
+        teammate_missing=ContextFlag.KEY_TEAMMATE_MISSING in flags,
+        is_road=ContextFlag.ROAD_DISADVANTAGE in flags,
+    )
+
+
+def _build_base_table() -> np.ndarray:
+    """Base score for every (hits_l5, hits_l10, hits_l15) over full windows."""
+    table = np.zeros(tuple(g + 1 for g in WINDOW_GAMES), dtype=np.int16)
+    for index in np.ndindex(table.shape):
+        hits = HitRateData(*(v for pair in zip(index, WINDOW_GAMES) for v in pair))
+        table[index] = get_base_score(hits)[0]
+    return table
+
+
+def _build_modifier_table() -> np.ndarray:
+    """Summed modifier points for every context mask."""
+    masks = np.arange(1 << len(ContextFlag), dtype=np.int32)
+    table = np.zeros(masks.shape, dtype=np.int16)
+    modifiers = {**POSITIVE_MODIFIERS, **NEGATIVE_MODIFIERS}
+    for flag in ContextFlag:
+        points = modifiers.get(flag.name.lower(), 0)
+        table += np.where(masks & flag, points, 0).astype(np.int16)
+    return table
+
+
+# Modifiers add up and the clamp comes last, so
+# score = clamp(BASE_TABLE[hits] + MODIFIER_TABLE[mask]) — the
+# (hits × mask) table factored into two small ones
+BASE_TABLE = _build_base_table()
+MODIFIER_TABLE = _build_modifier_table()
+
+
+@dataclass(slots=True)
+class ConfidenceBatch:
+    """Scores for a batch of picks; full results are built on demand."""
+    scores: np.ndarray      # (n,) final scores (0-95)
+    hits: np.ndarray        # (n, 3) L5 / L10 / L15 hits
+    games: np.ndarray       # (n, 3) L5 / L10 / L15 games
+    masks: np.ndarray       # (n,) ContextFlag masks
+    
+    def __len__(self) -> int:
+        return len(self.scores)
+    
+    def result(self, index: int) -> ConfidenceResult:
+        """Full ConfidenceResult for one pick (same as calculate_confidence)."""
+        hits, games = self.hits[index], self.games[index]
+        hit_rate = HitRateData(
+            hits_l5=int(hits[0]), games_l5=int(games[0]),
+            hits_l10=int(hits[1]), games_l10=int(games[1]),
+            hits_l15=int(hits[2]), games_l15=int(games[2]),
+        )
+        return calculate_confidence(hit_rate, context_from_mask(int(self.masks[index])))
+
+
+def calculate_confidence_batch(
+    hits: Sequence[Sequence[int]],
+    games: Sequence[Sequence[int]],
+    masks: Sequence[int]
+) -> ConfidenceBatch:
+    """
+    Score a batch of picks from table lookups.
+    
+    Args:
+        hits: (n, 3) L5 / L10 / L15 hits
+        games: (n, 3) L5 / L10 / L15 games
+        masks: (n,) context masks (see context_mask)
+    
+    Picks with full windows (5 / 10 / 15 games) read BASE_TABLE; any
+    other pick falls back to get_base_score for its base only.
+    """
+    hits = np.asarray(hits, dtype=np.int16).reshape(-1, 3)
+    games = np.asarray(games, dtype=np.int16).reshape(-1, 3)
+    masks = np.asarray(masks, dtype=np.int32).reshape(-1)
+    
+    full = (games == WINDOW_GAMES).all(axis=1) & (hits >= 0).all(axis=1) & (hits <= games).all(axis=1)
+    base = np.empty(len(masks), dtype=np.int16)
+    base[full] = BASE_TABLE[hits[full, 0], hits[full, 1], hits[full, 2]]
+    for i in np.flatnonzero(~full):
+        base[i] = get_base_score(HitRateData(
+            int(hits[i, 0]), int(games[i, 0]),
+            int(hits[i, 1]), int(games[i, 1]),
+            int(hits[i, 2]), int(games[i, 2]),
+        ))[0]
+    
+    scores = np.clip(base + MODIFIER_TABLE[masks], CONFIDENCE_MIN, CONFIDENCE_MAX)
+    return ConfidenceBatch(scores=scores, hits=hits, games=games, masks=masks)
+
+
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
@@ -107,6 +107,29 @@ ALT_LINE_THRESHOLDS = {
 ODDS_CONSTRAINT_MIN = -250
 ODDS_CONSTRAINT_MAX = 180
 
+# ============================================
+# PARLAY RULES (v10 ladder system)
+# ============================================
+
+MIN_LEGS = 2
+MAX_LEGS = 10
+
+VALID_LADDERS = [5, 10, 15]
+DEFAULT_LADDER = 5
+
+# Minimum hits needed within each ladder window
+ELIGIBILITY_THRESHOLDS = {
+    5: 3,
+    10: 7,
+    15: 10,
+}
+
+LEG_TYPES = ["moneyline", "spread", "game_total", "team_total", "player_prop"]
+PROP_TYPES = PLAYER_PROP_MARKETS
+
+# Max head-to-head lookback (supporting data only)
+H2H_WINDOW_YEARS = 1
+
 # ============================================
 # MINUTES & STATUS SYSTEM (v11 — LOCKED)
 # ============================================
@@ -175,12 +198,107 @@ POTD_MIN_CONFIDENCE = 70
 EDGE_FINDER_MIN_ODDS = 100
 EDGE_FINDER_MIN_CONFIDENCE = 60
 
+# Ranked commands post a placeholder and edit in the best picks so far
+PROGRESSIVE_RESPONSES = os.getenv("PROGRESSIVE_RESPONSES", "true").lower() == "true"
+# Minimum seconds between progress edits of one message (Discord: ~5 edits / 5 s)
+PROGRESS_EDIT_SECONDS = float(os.getenv("PROGRESS_EDIT_SECONDS", "1.5"))
+
+# ============================================
+# PARLAY CACHE (v11)
+# ============================================
+
+PARLAY_CACHE_TTL = 300  # seconds — hot cache only; buttons are persistent
+PARLAY_CACHE_MAX = int(os.getenv("PARLAY_CACHE_MAX", "256"))  # hot cache only
+LEG_CACHE_MAX = int(os.getenv("LEG_CACHE_MAX", "2048"))  # hot cache only
+
+# Durable store — parlays/legs outlive the process so old buttons keep working
+PARLAY_STORE_PATH = os.getenv("PARLAY_STORE_PATH", "data/parlays.sqlite3")
+# Parlays older than this are pruned daily (their buttons stop resolving)
+PARLAY_STORE_MAX_AGE_DAYS = int(os.getenv("PARLAY_STORE_MAX_AGE_DAYS", "30"))
+
+# ============================================
+# COMPUTE BACKEND (v11)
+# ============================================
+
+# "process" runs scoring / search in a worker pool, "inline" on the event loop
+COMPUTE_BACKEND = os.getenv("COMPUTE_BACKEND", "process").lower()
+COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+
+# ============================================
+# PARLAY SIMULATION (v11)
+# ============================================
+
+SIMULATION_TRIALS = int(os.getenv("SIMULATION_TRIALS", "100000"))
+
+# ============================================
+# ROLLING STATS (v11)
+# ============================================
+
+# Seconds between polls for newly final games (box-score ingest)
+BOX_SCORE_POLL_SECONDS = int(os.getenv("BOX_SCORE_POLL_SECONDS", "300"))
+# Rolling state not updated for this long is re-seeded from the API
+ROLLING_STATS_MAX_AGE = int(os.getenv("ROLLING_STATS_MAX_AGE", "21600"))
+
+# ============================================
+# ROLE DETECTION (v11)
+# ============================================
+
+# Usage / assist rate games kept per player (analyze_role needs 5+)
+ROLE_HISTORY_GAMES = int(os.getenv("ROLE_HISTORY_GAMES", "10"))
+# Recent games per slate team whose box scores are fetched once if unseen
+ROLE_BACKFILL_GAMES = int(os.getenv("ROLE_BACKFILL_GAMES", "5"))
+
+# ============================================
+# PLAYER POOL (v11)
+# ============================================
+
+# Players per team evaluated for props, most relevant first
+PLAYER_POOL_SIZE = int(os.getenv("PLAYER_POOL_SIZE", "3"))
+# Players averaging fewer minutes than this are never fetched
+PLAYER_POOL_MIN_MINUTES = float(os.getenv("PLAYER_POOL_MIN_MINUTES", "12"))
+
+# ============================================
+# COMMAND SCHEDULER (v11)
+# ============================================
+
+# Heavy command jobs run concurrently (interactive before scheduled)
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+# Jobs one guild may have queued per priority class before commands are refused
+SCHEDULER_GUILD_QUEUE_MAX = int(os.getenv("SCHEDULER_GUILD_QUEUE_MAX", "8"))
+
+# ============================================
+# SLATE SEARCH (v11)
+# ============================================
+
+# Seconds a slate search may take before answering with what it has (0 = no limit)
+SLATE_DEADLINE_SECONDS = float(os.getenv("SLATE_DEADLINE_SECONDS", "8"))
+# A search stops early once this many qualifying legs have turned up
+SLATE_SUFFICIENT_LEGS = int(os.getenv("SLATE_SUFFICIENT_LEGS", "10"))
+
+# ============================================
+# INJURY FEED (v11)
+# ============================================
+
+# Injury report: http(s) URL or local JSON file path (unset = no status feed)
+INJURY_FEED_SOURCE = os.getenv("INJURY_FEED_SOURCE", "")
+# Seconds between injury report polls
+INJURY_POLL_SECONDS = int(os.getenv("INJURY_POLL_SECONDS", "120"))
+# Cached leg cautions / confidence scores expire after this (s)
+LEG_CONTEXT_TTL = int(os.getenv("LEG_CONTEXT_TTL", "300"))
+LEG_CONTEXT_MAX = int(os.getenv("LEG_CONTEXT_MAX", "8192"))
+
 # ============================================
 # DATA SOURCES
 # ============================================
 
 API_BASKETBALL_KEY = os.getenv("API_BASKETBALL_KEY")
+API_BASKETBALL_BASE_URL = os.getenv("API_BASKETBALL_BASE_URL", "https://v1.basketball.api-sports.io")
+
 ODDS_API_KEY = os.getenv("ODDS_API_KEY")
+ODDS_API_BASE_URL = os.getenv("ODDS_API_BASE_URL", "https://api.the-odds-api.com/v4")
+ODDS_API_SPORT = "basketball_nba"
+ODDS_API_REGIONS = os.getenv("ODDS_API_REGIONS", "us")
+ODDS_API_MARKETS = "h2h,spreads,totals"
 
 STATMUSE_ENABLED = os.getenv("STATMUSE_ENABLED", "false").lower() == "true"
 NBA_API_ENABLED = os.getenv("NBA_API_ENABLED", "true").lower() == "true"
@@ -1,4 +1,9 @@
-from typing import Tuple, Optional, Dict, List
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Tuple, Optional, Dict, List, Sequence
+
+from hit_rates import HitRateKernel
+
 # ============================================
 # PLAYER PROP THRESHOLDS (v11 — LOCKED)
 # ============================================
@@ -170,43 +175,32 @@ def check_odds_constraint(american_odds: int) -> Tuple[bool, Optional[str]]:
 def calculate_hit_rate(
     values: List[float],
     line: float,
-    direction: str = "over"
+    direction: str = "over",
+    windows: Sequence[int] = (5, 10, 15)
 ) -> Dict[str, any]:
     """
     Calculate hit rate for a line across all windows.
     
     Args:
-        values: List of stat values (most recent first), up to 15
+        values: List of stat values (most recent first)
         line: The betting line
         direction: 'over' or 'under'
+        windows: Window sizes (default L5 / L10 / L15; any N works)
     
     Returns:
-        Dict with hits and percentages for each window
+        Dict with hits_lN / games_lN / pct_lN for each window
     """
-    l5 = values[:5]
-    l10 = values[:10]
-    l15 = values[:15]
-    
-    if direction == "over":
-        hits_l5 = sum(1 for v in l5 if v > line)
-        hits_l10 = sum(1 for v in l10 if v > line)
-        hits_l15 = sum(1 for v in l15 if v > line)
-    else:  # under
-        hits_l5 = sum(1 for v in l5 if v < line)
-        hits_l10 = sum(1 for v in l10 if v < line)
-        hits_l15 = sum(1 for v in l15 if v < line)
-    
-    return {
-        "hits_l5": hits_l5,
-        "hits_l10": hits_l10,
-        "hits_l15": hits_l15,
-        "games_l5": len(l5),
-        "games_l10": len(l10),
-        "games_l15": len(l15),
-        "pct_l5": hits_l5 / len(l5) if l5 else 0,
-        "pct_l10": hits_l10 / len(l10) if l10 else 0,
-        "pct_l15": hits_l15 / len(l15) if l15 else 0,
-    }
+    kernel = HitRateKernel(values)
+    
+    result = {}
+    for window in windows:
+        result[f"hits_l{window}"] = kernel.hits(line, window, direction)
+    for window in windows:
+        result[f"games_l{window}"] = kernel.games(window)
+    for window in windows:
+        result[f"pct_l{window}"] = kernel.rate(line, window, direction)
+    
+    return result
 
 
 def find_optimal_line(
@@ -232,43 +226,113 @@ def find_optimal_line(
     if len(values) < 5:
         return None
     
-    # Generate candidate lines from actual values
-    unique_values = sorted(set(values))
+    # Candidate lines come from every actual value (ascending)
+    return SortedWindows(values).optimal_line(direction, sorted(set(values)))
+
+
+# ============================================
+# SORTED-WINDOW KERNEL
+# ============================================
+# ADDED FOR: Alt line sweeps without rescanning windows per candidate
+# DOES NOT MODIFY EXISTING LOGIC (same thresholds, same selections)
+#
+# This is the per-series path. Prop generation counts L5 / L10 / L15 hits
+# for every player × market × direction of a team in one NumPy pass
+# (prop_markets.evaluate_team_props, called from
+# build_player_prop_legs); both count the same hits for a line.
+
+HIT_RATE_WINDOWS = (5, 10, 15)
+
+
+class SortedWindows:
+    """
+    L5 / L10 / L15 windows of one stat series, each sorted once.
     
-    # For overs: start with lowest (most likely to hit)
-    # For unders: start with highest (most likely to stay under)
-    if direction == "over":
-        candidates = unique_values  # Ascending
-    else:
-        candidates = unique_values[::-1]  # Descending
+    Hits for any line are two binary searches per window:
+    - over:  values > line  →  len - bisect_right(line)
+    - under: values < line  →  bisect_left(line)
+    """
     
-    # Find first eligible line
-    for line in candidates:
-        hit_data = calculate_hit_rate(values, line, direction)
+    __slots__ = ("games", "_sorted")
+    
+    def __init__(self, values: Sequence[float]):
+        windows = [list(values[:w]) for w in HIT_RATE_WINDOWS]
+        self.games: Tuple[int, int, int] = tuple(len(w) for w in windows)
+        self._sorted = tuple(sorted(w) for w in windows)
+    
+    def hits(self, line: float, direction: str = "over") -> Tuple[int, int, int]:
+        """Hits in L5 / L10 / L15 for a line."""
+        if direction == "over":
+            return tuple(len(w) - bisect_right(w, line) for w in self._sorted)
+        return tuple(bisect_left(w, line) for w in self._sorted)
+    
+    def optimal_line(
+        self,
+        direction: str = "over",
+        candidates: Optional[Sequence[float]] = None
+    ) -> Optional[Dict[str, any]]:
+        """
+        Lowest (over) / highest (under) line that passes all alt line
+        windows.
         
-        is_eligible, rejection = check_alt_line_eligibility(
-            hit_data["hits_l5"],
-            hit_data["hits_l10"],
-            hit_data["hits_l15"],
-            hit_data["games_l5"],
-            hit_data["games_l10"],
-            hit_data["games_l15"]
-        )
+        Args:
+            direction: 'over' or 'under'
+            candidates: Ascending candidate lines (default: the L15 values)
+        """
+        if candidates is None:
+            candidates = sorted(set(self._sorted[2]))
+        
+        # For overs: start with lowest (most likely to hit)
+        # For unders: start with highest (most likely to stay under)
+        if direction != "over":
+            candidates = candidates[::-1]
         
-        if is_eligible:
-            return {
-                "line": line,
-                "direction": direction,
-                "hits_l5": hit_data["hits_l5"],
-                "hits_l10": hit_data["hits_l10"],
-                "hits_l15": hit_data["hits_l15"],
-                "pct_l5": hit_data["pct_l5"],
-                "pct_l10": hit_data["pct_l10"],
-                "pct_l15": hit_data["pct_l15"],
-            }
-    
-    # No eligible line found
-    return None
+        min_l5, min_l10, min_l15 = _alt_line_min_hits(*self.games)
+        games_l5, games_l10, games_l15 = self.games
+        
+        # Hits only fall as the line moves away from the first candidate,
+        # so if the first candidate fails every later one fails too
+        if not candidates:
+            return None
+        line = candidates[0]
+        hits_l5, hits_l10, hits_l15 = self.hits(line, direction)
+        
+        if hits_l5 < min_l5 or hits_l10 < min_l10 or hits_l15 < min_l15:
+            # No eligible line found
+            return None
+        
+        return {
+            "line": line,
+            "direction": direction,
+            "hits_l5": hits_l5,
+            "hits_l10": hits_l10,
+            "hits_l15": hits_l15,
+            "pct_l5": hits_l5 / games_l5 if games_l5 else 0,
+            "pct_l10": hits_l10 / games_l10 if games_l10 else 0,
+            "pct_l15": hits_l15 / games_l15 if games_l15 else 0,
+        }
+
+
+@lru_cache(maxsize=None)
+def _alt_line_min_hits(games_l5: int, games_l10: int, games_l15: int) -> Tuple[int, int, int]:
+    """
+    Minimum hits per window that check_alt_line_eligibility() accepts.
+    
+    Uses the same float comparison (hits / games >= pct) so the kernel
+    agrees with the checker at every boundary.
+    """
+    thresholds = (
+        ALT_LINE_ELIGIBILITY["l5_min_pct"],
+        ALT_LINE_ELIGIBILITY["l10_min_pct"],
+        ALT_LINE_ELIGIBILITY["l15_min_pct"],
+    )
+    result = []
+    for games, pct in zip((games_l5, games_l10, games_l15), thresholds):
+        result.append(next(
+            (h for h in range(games + 1) if games > 0 and h / games >= pct),
+            games + 1  # unreachable: window can never pass
+        ))
+    return tuple(result)
 
 
 # ============================================
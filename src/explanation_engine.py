@@ -13,6 +13,8 @@ Key Principles:
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from hit_rates import HitRateKernel
+
 
 @dataclass
 class ExplanationData:
@@ -67,24 +69,21 @@ class ExplanationEngine:
         Returns:
             Detailed explanation string with numbers
         """
+        kernel = HitRateKernel(game_values)
         l5 = game_values[:5]
-        l10 = game_values[:10] if len(game_values) >= 10 else game_values
-        l15 = game_values[:15] if len(game_values) >= 15 else game_values
         
         # Calculate stats
-        avg_l5 = sum(l5) / len(l5)
-        avg_l10 = sum(l10) / len(l10)
-        avg_l15 = sum(l15) / len(l15)
+        avg_l5 = kernel.average(5)
+        avg_l10 = kernel.average(10)
+        avg_l15 = kernel.average(15)
+        
+        hits_l5 = kernel.hits(line, 5, direction)
+        hits_l10 = kernel.hits(line, 10, direction)
+        hits_l15 = kernel.hits(line, 15, direction)
         
         if direction == "over":
-            hits_l5 = sum(1 for v in l5 if v > line)
-            hits_l10 = sum(1 for v in l10 if v > line)
-            hits_l15 = sum(1 for v in l15 if v > line)
             margin = avg_l5 - line
         else:
-            hits_l5 = sum(1 for v in l5 if v < line)
-            hits_l10 = sum(1 for v in l10 if v < line)
-            hits_l15 = sum(1 for v in l15 if v < line)
             margin = line - avg_l5
         
         stat_label = stat_type.replace("_", " ").title()
@@ -94,8 +93,8 @@ class ExplanationEngine:
 
 **Hit Rate Analysis:**
 • {dir_word} {line} in **{hits_l5} of last 5** games ({hits_l5/5*100:.0f}%)
-• {dir_word} {line} in **{hits_l10} of last 10** games ({hits_l10/len(l10)*100:.0f}%)
-• {dir_word} {line} in **{hits_l15} of last 15** games ({hits_l15/len(l15)*100:.0f}%)
+• {dir_word} {line} in **{hits_l10} of last 10** games ({hits_l10/kernel.games(10)*100:.0f}%)
+• {dir_word} {line} in **{hits_l15} of last 15** games ({hits_l15/kernel.games(15)*100:.0f}%)
 
 **Averages:**
 • Last 5 games: **{avg_l5:.1f}** {stat_type}
@@ -0,0 +1,323 @@
+"""
+NBABot v11 — Game Log Index
+
+ADDED FOR: Split hit rates / averages (home / away, rest, opponent)
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- One season log per team (parse_game_result columns) and per player
+  (every PLAYER_PROP_MARKETS series), most recent game first
+- Secondary indices map each split to the positions of its games; they
+  are built once per load, never rescanned per query
+- A player game is placed in splits through its team's game (same game
+  id, else same date); games with no team match only count overall
+- Each (split, stat) gets a HitRateKernel on first use, so any window,
+  line or average inside a split is O(1) after that
+- Splits with fewer than MIN_SPLIT_GAMES games are not used for context
+- Newly final games are prepended to loaded logs in place (box-score
+  ingest), so a log is fetched from the API once per season, not per game
+- Rest days come from the schedule index (built at ingest from the
+  season's games); logs loaded before it exists have no rest splits
+- Entity IDs are keyed as strings (Selection IDs are strings)
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import PLAYER_PROP_MARKETS
+from hit_rates import HitRateKernel
+from prop_markets import derive_market_series
+from rolling_stats import PLAYER, TEAM, TEAM_STATS
+from schedule_index import Schedule, schedule
+
+# Splits
+ALL = "all"
+HOME = "home"
+AWAY = "away"
+BACK_TO_BACK = "b2b"
+REST_1 = "rest_1"
+REST_2_PLUS = "rest_2+"
+
+# Games to load per entity (one season; the API returns it in one request)
+SEASON_GAMES = 82
+
+MIN_SPLIT_GAMES = 3
+
+
+def opponent_split(opponent_id: Any) -> str:
+    """Split key for games against one opponent."""
+    return f"opp:{opponent_id}"
+
+
+@dataclass(slots=True, frozen=True)
+class GameMeta:
+    """Where / when a game was played, from the team's point of view."""
+    game_id: Any
+    date: str                       # YYYY-MM-DD
+    is_home: bool
+    opponent_id: Any
+    rest_days: Optional[int]        # Full days off before it (None: first game)
+
+    @property
+    def splits(self) -> Tuple[str, ...]:
+        keys = [HOME if self.is_home else AWAY, opponent_split(self.opponent_id)]
+        if self.rest_days is not None:
+            if self.rest_days <= 0:
+                keys.append(BACK_TO_BACK)
+            elif self.rest_days == 1:
+                keys.append(REST_1)
+            else:
+                keys.append(REST_2_PLUS)
+        return tuple(keys)
+
+
+class EntityLog:
+    """A season of games for one team or player, with split indices."""
+
+    __slots__ = ("meta", "series", "splits", "_kernels")
+
+    def __init__(self, meta: Sequence[Optional[GameMeta]], series: Dict[str, Sequence[float]]):
+        self.meta = tuple(meta)
+        self.series = {stat: tuple(values) for stat, values in series.items()}
+        self._kernels: Dict[Tuple[str, str], HitRateKernel] = {}
+
+        positions: Dict[str, List[int]] = {ALL: list(range(len(self.meta)))}
+        for i, game in enumerate(self.meta):
+            if game is None:
+                continue
+            for key in game.splits:
+                positions.setdefault(key, []).append(i)
+        self.splits: Dict[str, Tuple[int, ...]] = {k: tuple(v) for k, v in positions.items()}
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    def __contains__(self, game_id: Any) -> bool:
+        return any(game is not None and game.game_id == game_id for game in self.meta)
+
+    def prepend(self, meta: Optional[GameMeta], values: Dict[str, float]) -> None:
+        """Add the newest game (kernels are rebuilt on next use)."""
+        self.meta = (meta, *self.meta[:SEASON_GAMES - 1])
+        self.series = {
+            stat: (values.get(stat, math.nan), *series[:SEASON_GAMES - 1])
+            for stat, series in self.series.items()
+        }
+        keys = (ALL, *meta.splits) if meta is not None else (ALL,)
+        splits = {}
+        for key, positions in self.splits.items():
+            shifted = tuple(i + 1 for i in positions if i + 1 < SEASON_GAMES)
+            splits[key] = (0, *shifted) if key in keys else shifted
+        for key in keys:
+            splits.setdefault(key, (0,))
+        self.splits = splits
+        self._kernels.clear()
+
+    def kernel(self, stat: str, split: str = ALL) -> Optional[HitRateKernel]:
+        """Kernel over a stat's values in a split (None if unknown)."""
+        key = (split, stat)
+        kernel = self._kernels.get(key)
+        if kernel is None:
+            values = self.series.get(stat)
+            positions = self.splits.get(split)
+            if values is None or positions is None:
+                return None
+            kernel = self._kernels[key] = HitRateKernel(
+                [values[i] for i in positions if not math.isnan(values[i])]
+            )
+        return kernel
+
+
+class GameLogIndex:
+    """Season game logs with home / away, rest and opponent splits."""
+
+    def __init__(self, schedule: Schedule = schedule):
+        self.schedule = schedule
+        self._logs: Dict[Tuple[str, str], EntityLog] = {}
+
+    # ==================== LOADING ====================
+
+    def load_team(self, team_id: Any, games: Sequence[Dict], results: Sequence[Dict]) -> EntityLog:
+        """
+        Index a team's games (most recent first).
+
+        Args:
+            team_id: Team ID
+            games: Game objects from the API
+            results: parse_game_result(game, team_id) for each game
+        """
+        meta = [self._team_game_meta(team_id, game, result) for game, result in zip(games, results)]
+        series = {
+            column: [_team_value(r, column) for r in results]
+            for column in TEAM_STATS
+        }
+        log = self._logs[(TEAM, str(team_id))] = EntityLog(meta, series)
+        return log
+
+    def append_team(self, team_id: Any, game: Dict, result: Dict) -> bool:
+        """
+        Prepend a newly final game to a loaded team log.
+
+        Returns False for teams without a loaded log (loaded in full on
+        their next fetch) and games already in the log.
+        """
+        log = self._logs.get((TEAM, str(team_id)))
+        if log is None or game.get("id") in log:
+            return False
+        log.prepend(
+            self._team_game_meta(team_id, game, result),
+            {column: _team_value(result, column) for column in TEAM_STATS},
+        )
+        return True
+
+    def load_player(
+        self,
+        player_id: Any,
+        team_id: Any,
+        stats: Sequence[Dict],
+        rows: Sequence[Sequence[float]]
+    ) -> EntityLog:
+        """
+        Index a player's games (most recent first).
+
+        Args:
+            player_id: Player ID
+            team_id: The player's team (load_team it first for splits)
+            stats: Player stat objects from the API
+            rows: extract_stat_row(stat) for each stat object
+        """
+        by_id, by_date = self._team_games(team_id)
+        meta = [_match_game(stat.get("game", {}), by_id, by_date) for stat in stats]
+        log = self._logs[(PLAYER, str(player_id))] = EntityLog(meta, _player_series(rows))
+        return log
+
+    def append_player(self, player_id: Any, team_id: Any, stat: Dict, row: Sequence[float]) -> bool:
+        """
+        Prepend a newly final game to a loaded player log (append_team the
+        player's team first, for splits).
+
+        Returns False for players without a loaded log and games already
+        in the log.
+        """
+        log = self._logs.get((PLAYER, str(player_id)))
+        game = stat.get("game", {})
+        if log is None or game.get("id") in log:
+            return False
+        series = _player_series([row])
+        log.prepend(
+            _match_game(game, *self._team_games(team_id)),
+            {m: values[0] for m, values in series.items()},
+        )
+        return True
+
+    def clear(self) -> None:
+        self._logs.clear()
+
+    # ==================== QUERIES ====================
+
+    def get(self, kind: str, entity_id: Any) -> Optional[EntityLog]:
+        return self._logs.get((kind, str(entity_id)))
+
+    def split(self, kind: str, entity_id: Any, stat: str, split: str = ALL) -> Optional[HitRateKernel]:
+        """Kernel over a split's values (None if the entity / stat is unknown)."""
+        log = self._logs.get((kind, str(entity_id)))
+        return log.kernel(stat, split) if log is not None else None
+
+    def split_record(
+        self,
+        kind: str,
+        entity_id: Any,
+        stat: str,
+        split: str,
+        line: float,
+        direction: str = "over",
+        window: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """(hits, games) for a line in a split (most recent `window` games)."""
+        kernel = self.split(kind, entity_id, stat, split)
+        if kernel is None:
+            return (0, 0)
+        return (kernel.hits(line, window, direction), kernel.games(window))
+
+    def venue_rates(
+        self,
+        kind: str,
+        entity_id: Any,
+        stat: str,
+        line: float,
+        direction: str,
+        is_home: bool
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """
+        (home or away hit rate, overall hit rate) for a line.
+
+        Either is None when its sample is below MIN_SPLIT_GAMES.
+        """
+        return (
+            self._rate(kind, entity_id, stat, HOME if is_home else AWAY, line, direction),
+            self._rate(kind, entity_id, stat, ALL, line, direction),
+        )
+
+    def _team_game_meta(self, team_id: Any, game: Dict, result: Dict) -> GameMeta:
+        """GameMeta for a team's game (rest days from the schedule index)."""
+        game_date = game.get("date", "")[:10]
+        opponent = game.get("teams", {}).get("away" if result["is_home"] else "home", {})
+        return GameMeta(
+            game_id=game.get("id"),
+            date=game_date,
+            is_home=bool(result["is_home"]),
+            opponent_id=opponent.get("id"),
+            rest_days=self._rest_days(team_id, game_date),
+        )
+
+    def _rest_days(self, team_id: Any, game_date: str) -> Optional[int]:
+        index = self.schedule.index
+        if index is None:
+            return None
+        try:
+            return index.rest_days(team_id, date.fromisoformat(game_date))
+        except ValueError:
+            return None
+
+    def _team_games(self, team_id: Any) -> Tuple[Dict[Any, GameMeta], Dict[str, GameMeta]]:
+        """A team's games by id and by date (empty without a loaded log)."""
+        by_id: Dict[Any, GameMeta] = {}
+        by_date: Dict[str, GameMeta] = {}
+        team = self._logs.get((TEAM, str(team_id)))
+        if team is not None:
+            for game in team.meta:
+                if game is not None:
+                    by_id[game.game_id] = game
+                    by_date[game.date] = game
+        return by_id, by_date
+
+    def _rate(self, kind, entity_id, stat, split, line, direction) -> Optional[float]:
+        kernel = self.split(kind, entity_id, stat, split)
+        if kernel is None or len(kernel) < MIN_SPLIT_GAMES:
+            return None
+        return kernel.rate(line, None, direction)
+
+
+def _match_game(game: Dict, by_id: Dict[Any, GameMeta], by_date: Dict[str, GameMeta]) -> Optional[GameMeta]:
+    """The team game a player's game was played in (same id, else same date)."""
+    return by_id.get(game.get("id")) or by_date.get((game.get("date") or "")[:10])
+
+
+def _team_value(result: Dict, column: str) -> float:
+    return float(result[column] or 0)
+
+
+def _player_series(rows: Sequence[Sequence[float]]) -> Dict[str, List[float]]:
+    """Every PLAYER_PROP_MARKETS series from extract_stat_row rows."""
+    if not rows:
+        return {m: [] for m in PLAYER_PROP_MARKETS}
+    base = np.asarray(rows, dtype=float).T[None, ...]
+    markets = derive_market_series(base, PLAYER_PROP_MARKETS)[0]
+    return {m: markets[i].tolist() for i, m in enumerate(PLAYER_PROP_MARKETS)}
+
+
+# Global index instance
+game_log_index = GameLogIndex()
@@ -0,0 +1,73 @@
+"""
+NBABot v11 — Hit Rate Kernel
+
+ADDED FOR: Any-window hit rates and averages (L5 / L10 / L15 / L20 / season)
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Values are most recent first; a window is always the latest N games
+- A window longer than the sample uses every game (same as values[:N])
+- window=None means the whole sample (season)
+- One O(n) prefix pass per series: window totals / averages are O(1)
+- Each window is sorted once on first use; hits for any line are then
+  a bisect, O(log n) per line
+- average() matches sum(values[:N]) / N; mean() is the same float mean
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence
+
+SEASON = None
+
+
+class HitRateKernel:
+    """Prefix sums over one stat series."""
+
+    __slots__ = ("values", "_sums", "_sorted")
+
+    def __init__(self, values: Sequence[float]):
+        self.values = list(values)
+        # Sequential sums, so sums[n] == sum(values[:n]) exactly
+        self._sums: List[float] = [0, *accumulate(self.values)]
+        self._sorted: Dict[int, List[float]] = {}   # Window games → sorted values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def games(self, window: Optional[int] = SEASON) -> int:
+        """Games in the window."""
+        if window is None:
+            return len(self.values)
+        return min(window, len(self.values))
+
+    def total(self, window: Optional[int] = SEASON) -> float:
+        """Sum of the window's values."""
+        return self._sums[self.games(window)]
+
+    def average(self, window: Optional[int] = SEASON) -> float:
+        """Average of the window's values (0 for an empty window)."""
+        games = self.games(window)
+        return self._sums[games] / games if games else 0
+
+    def mean(self, window: Optional[int] = SEASON) -> float:
+        """Average of the window's values (same as average())."""
+        return self.average(window)
+
+    def hits(self, line: float, window: Optional[int] = SEASON, direction: str = "over") -> int:
+        """Games in the window that cleared the line (over: >, under: <)."""
+        ordered = self._window_sorted(self.games(window))
+        if direction == "over":
+            return len(ordered) - bisect_right(ordered, line)
+        return bisect_left(ordered, line)
+
+    def rate(self, line: float, window: Optional[int] = SEASON, direction: str = "over") -> float:
+        """Hit rate (0-1) in the window (0 for an empty window)."""
+        games = self.games(window)
+        return self.hits(line, window, direction) / games if games else 0
+
+    def _window_sorted(self, games: int) -> List[float]:
+        ordered = self._sorted.get(games)
+        if ordered is None:
+            ordered = self._sorted[games] = sorted(self.values[:games])
+        return ordered
@@ -0,0 +1,211 @@
+"""
+NBABot v11 — Injury / Status Feed
+
+ADDED FOR: Player status data for player_status, cautions and confidence
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- A source returns the full current injury report; INJURY_FEED_SOURCE is
+  an http(s) URL or a local JSON file (the file doubles as a test stand-in)
+- Each poll is diffed against the previous snapshot; only players whose
+  status, note or game-time-decision flag changed produce a StatusChange
+- A player missing from the new report is back to ACTIVE
+- Subscribers hear about every change (the parlay engine drops only the
+  cached cautions / scores of the changed player's team)
+- Status strings go through player_status.parse_injury_status
+- Entity IDs are keyed as strings (Selection IDs are strings)
+
+Report format (JSON): a list of entries, or {"response": [...]} /
+{"players": [...]}, each entry:
+    {"player_id": ..., "player_name": ..., "team_id": ...,
+     "status": "Questionable", "note": "...", "game_time_decision": false}
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Set
+
+import aiohttp
+
+from config import INJURY_FEED_SOURCE
+from player_status import STATUS_ELIGIBILITY, PlayerStatus, parse_injury_status
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class StatusEntry:
+    """One player's line in the injury report."""
+    player_id: str
+    player_name: str
+    team_id: Optional[str]
+    status: PlayerStatus
+    note: Optional[str] = None
+    game_time_decision: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class StatusChange:
+    """Emitted when a player's report entry changes between polls."""
+    player_id: str
+    team_id: Optional[str]
+    old: PlayerStatus
+    new: PlayerStatus
+    entry: Optional[StatusEntry]        # None: dropped from the report
+
+
+# ============================================
+# SOURCES
+# ============================================
+
+class InjuryReportSource(Protocol):
+    async def fetch(self) -> Any:
+        """The raw report (parsed JSON)."""
+
+
+class FileInjurySource:
+    """Injury report read from a local JSON file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    async def fetch(self) -> Any:
+        if not self.path.exists():
+            return []
+        return json.loads(self.path.read_text(encoding="utf-8") or "[]")
+
+
+class HttpInjurySource:
+    """Injury report fetched from an HTTP endpoint returning JSON."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def fetch(self) -> Any:
+        async with aiohttp.ClientSession(timeout=self.timeout) as session:
+            async with session.get(self.url) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+
+def source_from_config(location: Optional[str] = INJURY_FEED_SOURCE) -> Optional[InjuryReportSource]:
+    """Source for INJURY_FEED_SOURCE (None when unset: feed disabled)."""
+    if not location:
+        return None
+    if location.startswith(("http://", "https://")):
+        return HttpInjurySource(location)
+    return FileInjurySource(location)
+
+
+def parse_report(raw: Any) -> Dict[str, StatusEntry]:
+    """player_id → StatusEntry for a raw report (entries without an ID are skipped)."""
+    if isinstance(raw, dict):
+        raw = raw.get("response", raw.get("players", []))
+    snapshot = {}
+    for item in raw or []:
+        player_id = item.get("player_id")
+        if player_id is None:
+            continue
+        team_id = item.get("team_id")
+        snapshot[str(player_id)] = StatusEntry(
+            player_id=str(player_id),
+            player_name=item.get("player_name", ""),
+            team_id=None if team_id is None else str(team_id),
+            status=parse_injury_status(item.get("status")),
+            note=item.get("note"),
+            game_time_decision=bool(item.get("game_time_decision", False)),
+        )
+    return snapshot
+
+
+def diff_snapshots(old: Dict[str, StatusEntry], new: Dict[str, StatusEntry]) -> List[StatusChange]:
+    """Changes between two snapshots (missing = ACTIVE)."""
+    changes = []
+    for player_id in old.keys() | new.keys():
+        before, after = old.get(player_id), new.get(player_id)
+        if before == after:
+            continue
+        entry = after or before
+        changes.append(StatusChange(
+            player_id=player_id,
+            team_id=entry.team_id,
+            old=before.status if before else PlayerStatus.ACTIVE,
+            new=after.status if after else PlayerStatus.ACTIVE,
+            entry=after,
+        ))
+    return changes
+
+
+# ============================================
+# FEED
+# ============================================
+
+class InjuryFeed:
+    """Latest injury report snapshot, diffed on every poll."""
+
+    def __init__(self, source: Optional[InjuryReportSource]):
+        self.source = source
+        self._snapshot: Dict[str, StatusEntry] = {}
+        self._teams: Set[str] = set()
+        self._out_by_team: Dict[str, Set[str]] = {}
+        self._listeners: List[Callable[[StatusChange], None]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.source is not None
+
+    async def poll(self) -> List[StatusChange]:
+        """Fetch the report, swap in the new snapshot and publish changes."""
+        if self.source is None:
+            return []
+        snapshot = parse_report(await self.source.fetch())
+        changes = diff_snapshots(self._snapshot, snapshot)
+        self._snapshot = snapshot
+        self._teams = {e.team_id for e in snapshot.values() if e.team_id is not None}
+        self._out_by_team = {}
+        for entry in snapshot.values():
+            if entry.team_id is not None and not STATUS_ELIGIBILITY.get(entry.status, False):
+                self._out_by_team.setdefault(entry.team_id, set()).add(entry.player_id)
+        for change in changes:
+            self._emit(change)
+        if changes:
+            logger.info("Injury report: %d status changes", len(changes))
+        return changes
+
+    # ==================== QUERIES ====================
+
+    def entry(self, player_id: Any) -> Optional[StatusEntry]:
+        return self._snapshot.get(str(player_id))
+
+    def status(self, player_id: Any) -> PlayerStatus:
+        """Reported status (ACTIVE when not on the report)."""
+        entry = self._snapshot.get(str(player_id))
+        return entry.status if entry else PlayerStatus.ACTIVE
+
+    def reports_team(self, team_id: Any) -> bool:
+        """Has the current report listed anyone on this team?"""
+        return str(team_id) in self._teams
+
+    def out_players(self, team_id: Any) -> Set[str]:
+        """Players expected to sit (statuses STATUS_ELIGIBILITY excludes)."""
+        return self._out_by_team.get(str(team_id), set())
+
+    # ==================== SUBSCRIPTIONS ====================
+
+    def subscribe(self, listener: Callable[[StatusChange], None]) -> None:
+        """Call `listener` for every status change."""
+        self._listeners.append(listener)
+
+    def _emit(self, change: StatusChange) -> None:
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception:
+                logger.exception("Injury feed listener failed")
+
+
+# Global feed instance
+injury_feed = InjuryFeed(source_from_config())
@@ -0,0 +1,191 @@
+"""
+NBABot v11 — Leg Scoring
+
+ADDED FOR: Turning generated legs into confidence engine inputs
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Player props carry L5 / L10 / L15 windows; team legs carry one window
+  (the ladder's hits / games), which stands in for all three
+- Home / road comes from the matchup and the selection's team; game-level
+  legs (game totals) are neither
+- Player props read their home / away hit rate against their overall rate
+  from the season log (game_log_index.venue_rates), so home advantage and
+  road disadvantage follow the player's own split; without enough split
+  games the flat home / road rule applies
+- Favorable matchup: the opponent allowed at least FAVORABLE_FACTOR × the
+  league average of the leg's stat over its last MATCHUP_WINDOW games
+  (overs), or at most 1 / FAVORABLE_FACTOR of it (unders); player props
+  and team totals only, from the daily opponent-allowed matrix
+- Alt line consistency: a player prop's line is recommended by the
+  projection engine (clears its L5 / L10 / L15 thresholds) over the
+  player's season log; every prop in a batch goes through one
+  projection_engine.analyze_many call
+- Minutes stability comes from the player's recorded box-score minutes
+  (player_status minutes analysis); no minutes on record = not stable
+- Scores are cached per leg by the engine until its player / team changes;
+  uncached legs are scored on the compute backend in one batch
+"""
+
+from statistics import mean
+from typing import List, Optional, Sequence, Tuple
+
+from caution_engine import CautionFlag
+from compute import compute_backend
+from confidence_engine import (
+    calculate_confidence,
+    calculate_confidence_batch,
+    context_mask,
+    ConfidenceResult,
+    ContextData,
+    HitRateData,
+)
+from game_log_index import game_log_index
+from opponent_allowed import ALLOWED_STATS, opponent_allowed
+from parlay_engine import parlay_engine, HitRate, Leg
+from player_pool import player_pool
+from player_status import analyze_roster_minutes, minutes_matrix
+from projection_engine import projection_engine
+from rolling_stats import PLAYER
+
+MATCHUP_WINDOW = 10
+FAVORABLE_FACTOR = 1.05
+PROJECTION_GAMES = 15
+MIN_PROJECTION_GAMES = 5
+
+
+def hit_rate_windows(hit_rate: HitRate) -> HitRateData:
+    """L5 / L10 / L15 windows (team legs: the ladder window for all three)."""
+    if hit_rate.games_l5 is None:
+        return HitRateData(
+            hit_rate.hits, hit_rate.games,
+            hit_rate.hits, hit_rate.games,
+            hit_rate.hits, hit_rate.games,
+        )
+    return HitRateData(
+        hits_l5=hit_rate.hits_l5,
+        games_l5=hit_rate.games_l5,
+        hits_l10=hit_rate.hits_l10,
+        games_l10=hit_rate.games_l10,
+        hits_l15=hit_rate.hits_l15,
+        games_l15=hit_rate.games_l15,
+    )
+
+
+def venue(leg: Leg) -> Optional[bool]:
+    """True: the selection's team is at home; False: on the road; None: no team."""
+    team_name = leg.selection.team_name
+    if team_name == leg.matchup.home_team:
+        return True
+    if team_name == leg.matchup.away_team:
+        return False
+    return None
+
+
+def favorable_matchup(leg: Leg, is_home: Optional[bool]) -> bool:
+    """The opponent's defense gives up more (overs) / less (unders) of the stat than most."""
+    stat = "points" if leg.type == "team_total" else leg.selection.prop_type
+    if is_home is None or stat not in ALLOWED_STATS:
+        return False
+    opponent = leg.matchup.away_team if is_home else leg.matchup.home_team
+    factor = opponent_allowed.defense_factor(opponent, stat, MATCHUP_WINDOW)
+    if factor is None:
+        return False
+    if leg.selection.direction == "under":
+        return factor <= 1 / FAVORABLE_FACTOR
+    return factor >= FAVORABLE_FACTOR
+
+
+def alt_line_consistency(legs: Sequence[Leg]) -> List[bool]:
+    """Per leg: a player prop whose line the projection engine recommends."""
+    consistent = [False] * len(legs)
+    rows, logs, lines, directions = [], [], [], []
+    for i, leg in enumerate(legs):
+        if leg.selection.player_id is None:
+            continue
+        kernel = game_log_index.split(PLAYER, leg.selection.player_id, leg.selection.prop_type)
+        if kernel is None or len(kernel) < MIN_PROJECTION_GAMES:
+            continue
+        rows.append(i)
+        logs.append(kernel.values[:PROJECTION_GAMES])
+        lines.append([leg.selection.value])
+        directions.append(leg.selection.direction)
+    if rows:
+        batch = projection_engine.analyze_many(logs, lines, directions)
+        for i, best in zip(rows, batch.best):
+            consistent[i] = best is not None and best.is_recommended
+    return consistent
+
+
+def minutes_stable(leg: Leg) -> bool:
+    """Player prop whose player's recorded minutes are stable."""
+    if leg.selection.player_id is None:
+        return False
+    minutes = player_pool.recent_minutes(leg.selection.team_id, leg.selection.player_id)
+    if not minutes:
+        return False
+    [analysis] = analyze_roster_minutes(
+        [leg.selection.player_id], minutes_matrix([minutes]), [mean(minutes)], [tuple(minutes)]
+    )
+    return analysis.is_minutes_stable
+
+
+def confidence_inputs(
+    leg: Leg,
+    alt_line_consistent: Optional[bool] = None
+) -> Tuple[HitRateData, ContextData]:
+    """Build confidence engine inputs for a leg (alt_line_consistent: precomputed)."""
+    if alt_line_consistent is None:
+        [alt_line_consistent] = alt_line_consistency([leg])
+    is_home = venue(leg)
+    venue_hit_rate = overall_hit_rate = None
+    if leg.selection.player_id is not None and is_home is not None:
+        venue_hit_rate, overall_hit_rate = game_log_index.venue_rates(
+            PLAYER, leg.selection.player_id, leg.selection.prop_type,
+            leg.selection.value, leg.selection.direction, is_home
+        )
+    flags = leg.caution.flags if leg.caution is not None else CautionFlag(0)
+    context = ContextData(
+        alt_line_consistent=alt_line_consistent,
+        minutes_stable=minutes_stable(leg),
+        favorable_matchup=favorable_matchup(leg, is_home),
+        is_home=is_home is True,
+        is_road=is_home is False,
+        venue_hit_rate=venue_hit_rate,
+        overall_hit_rate=overall_hit_rate,
+        is_questionable=bool(flags & (CautionFlag.QUESTIONABLE | CautionFlag.GAME_TIME_DECISION)),
+        is_doubtful=bool(flags & CautionFlag.DOUBTFUL),
+        teammate_missing=bool(flags & (CautionFlag.TEAMMATE_OUT | CautionFlag.STAR_PLAYER_OUT)),
+    )
+    return hit_rate_windows(leg.hit_rate), context
+
+
+async def score_legs(legs: List[Leg]) -> List[int]:
+    """
+    Confidence scores for legs (cached per leg until its player / team changes).
+
+    Uncached legs are scored on the compute backend in one batch; build the
+    full ConfidenceResult (confidence_detail) only for legs that are shown.
+    """
+    scores = [parlay_engine.leg_score(leg.id) for leg in legs]
+    stale = [i for i, score in enumerate(scores) if score is None]
+    if not stale:
+        return scores
+
+    consistent = alt_line_consistency([legs[i] for i in stale])
+    hits, games, masks = [], [], []
+    for i, alt_line_consistent in zip(stale, consistent):
+        hit_rate, context = confidence_inputs(legs[i], alt_line_consistent)
+        hits.append((hit_rate.hits_l5, hit_rate.hits_l10, hit_rate.hits_l15))
+        games.append((hit_rate.games_l5, hit_rate.games_l10, hit_rate.games_l15))
+        masks.append(context_mask(context))
+    batch = await compute_backend.run(calculate_confidence_batch, hits, games, masks)
+    for i, score in zip(stale, batch.scores.tolist()):
+        scores[i] = score
+        parlay_engine.cache_leg_score(legs[i], score)
+    return scores
+
+
+def confidence_detail(leg: Leg) -> ConfidenceResult:
+    """Full ConfidenceResult for a displayed leg."""
+    return calculate_confidence(*confidence_inputs(leg))
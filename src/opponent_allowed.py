@@ -0,0 +1,217 @@
+"""
+NBABot v11 — Opponent-Allowed Matrix
+
+ADDED FOR: What each defense allows (team totals, prop projections, cautions)
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Built once a day from ONE season request (every completed league game)
+  plus the box scores seen by box-score ingest
+- Score stats (points, 1Q, 1H) come from the game's scores; box stats
+  (rebounds, assists, threes, ...) from the opponent's summed box score
+  and are NaN for games whose box score was never ingested (a missing
+  player stat makes that team's game NaN for the stat)
+- Windows are the team's last N games (NaN games count toward neither
+  sums nor games, same as prop_markets); window None = season
+- Lookups are O(1): team → row, stat → column, window → slice; legs
+  name their teams, so the matrix also maps team names to ids
+- Confidence scoring reads defense_factor for favorable matchups
+- The matrix build is a pure function, so it runs on the compute backend
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api_client import APIBasketballClient, api_client
+from compute import compute_backend
+from prop_markets import BASE_STATS, extract_stat_row
+
+logger = logging.getLogger(__name__)
+
+# Allowed stats from the game's scores: stat → quarters summed
+SCORE_STATS: Dict[str, Tuple[str, ...]] = {
+    "points": ("total",),
+    "first_quarter_points": ("quarter_1",),
+    "first_half_points": ("quarter_1", "quarter_2"),
+}
+
+# Allowed stats summed from the opponent's box score
+BOX_STATS = ("rebounds", "assists", "steals", "blocks", "threes")
+
+ALLOWED_STATS = tuple(SCORE_STATS) + BOX_STATS
+ALLOWED_WINDOWS: Tuple[Optional[int], ...] = (5, 10, 15, None)
+
+# (game_id, team_id) → that team's summed box score
+BoxTotals = Dict[Tuple[Any, Any], Tuple[float, ...]]
+
+
+@dataclass(slots=True)
+class AllowedMatrix:
+    """Team × stat × window averages of what each defense allowed."""
+    built_on: str                       # YYYY-MM-DD
+    team_ids: Tuple[Any, ...]
+    averages: np.ndarray                # (teams, ALLOWED_STATS, ALLOWED_WINDOWS), NaN = no games
+    series: Dict[Any, np.ndarray]       # team → (ALLOWED_STATS, games), most recent first
+    rows: Dict[Any, int]                # team → averages row
+    names: Dict[str, Any]               # team name → team id (legs carry names)
+
+    def allowed(self, team_id: Any, stat: str, window: Optional[int] = None) -> Optional[float]:
+        """Average `stat` the team allowed over its last `window` games."""
+        row = self.rows.get(team_id)
+        if row is None:
+            return None
+        value = self.averages[row, _STAT_INDEX[stat], _WINDOW_INDEX[window]]
+        return None if np.isnan(value) else float(value)
+
+    def allowed_series(self, team_id: Any, stat: str, limit: Optional[int] = None) -> List[float]:
+        """Per-game `stat` allowed, most recent first (games with no value skipped)."""
+        values = self.series.get(team_id)
+        if values is None:
+            return []
+        column = values[_STAT_INDEX[stat]]
+        return column[~np.isnan(column)][:limit].tolist()
+
+    def league_average(self, stat: str, window: Optional[int] = None) -> Optional[float]:
+        """League-wide average of the team averages."""
+        column = self.averages[:, _STAT_INDEX[stat], _WINDOW_INDEX[window]]
+        if column.size == 0 or np.isnan(column).all():
+            return None
+        return float(np.nanmean(column))
+
+    def defense_factor(self, team_id: Any, stat: str, window: Optional[int] = None) -> Optional[float]:
+        """Allowed / league average (> 1: the defense gives up more than most)."""
+        allowed = self.allowed(team_id, stat, window)
+        league = self.league_average(stat, window)
+        if allowed is None or not league:
+            return None
+        return allowed / league
+
+
+_STAT_INDEX = {stat: i for i, stat in enumerate(ALLOWED_STATS)}
+_WINDOW_INDEX = {window: i for i, window in enumerate(ALLOWED_WINDOWS)}
+_BOX_COLUMNS = tuple(BASE_STATS.index(stat) for stat in BOX_STATS)
+
+
+def build_allowed_matrix(games: Sequence[Dict], box_totals: BoxTotals, built_on: str) -> AllowedMatrix:
+    """
+    Build the matrix from completed games (most recent first).
+
+    Args:
+        games: Completed game objects from the API
+        box_totals: Summed box score per (game_id, team_id)
+        built_on: Date the matrix is for
+    """
+    allowed: Dict[Any, List[List[float]]] = {}
+    names: Dict[str, Any] = {}
+    for game in games:
+        teams = game.get("teams", {})
+        scores = game.get("scores", {})
+        for side, other in (("home", "away"), ("away", "home")):
+            team_id = teams.get(side, {}).get("id")
+            opponent_id = teams.get(other, {}).get("id")
+            if team_id is None:
+                continue
+            names.setdefault(teams[side].get("name"), team_id)
+            opponent_scores = scores.get(other, {}) or {}
+            row = [_score_sum(opponent_scores, keys) for keys in SCORE_STATS.values()]
+            row.extend(box_totals.get((game.get("id"), opponent_id), (np.nan,) * len(BOX_STATS)))
+            allowed.setdefault(team_id, []).append(row)
+
+    team_ids = tuple(allowed)
+    depth = max((len(rows) for rows in allowed.values()), default=0)
+    stacked = np.full((len(team_ids), len(ALLOWED_STATS), depth), np.nan)
+    for t, team_id in enumerate(team_ids):
+        rows = allowed[team_id]
+        stacked[t, :, :len(rows)] = np.asarray(rows, dtype=float).T
+
+    valid = ~np.isnan(stacked)
+    values = np.where(valid, stacked, 0.0)
+    averages = np.full((len(team_ids), len(ALLOWED_STATS), len(ALLOWED_WINDOWS)), np.nan)
+    for w, window in enumerate(ALLOWED_WINDOWS):
+        end = depth if window is None else min(window, depth)
+        games_in = valid[..., :end].sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages[..., w] = values[..., :end].sum(axis=-1) / games_in
+
+    return AllowedMatrix(
+        built_on=built_on,
+        team_ids=team_ids,
+        averages=averages,
+        series={team_id: stacked[t, :, :len(allowed[team_id])] for t, team_id in enumerate(team_ids)},
+        rows={team_id: t for t, team_id in enumerate(team_ids)},
+        names={name: team_id for name, team_id in names.items() if name},
+    )
+
+
+def _score_sum(scores: Dict, keys: Sequence[str]) -> float:
+    values = [scores.get(key) for key in keys]
+    if any(v is None for v in values):
+        return np.nan
+    return float(sum(values))
+
+
+class OpponentAllowed:
+    """Holds today's matrix and the box scores it is built from."""
+
+    def __init__(self, api: APIBasketballClient):
+        self.api = api
+        self.compute = compute_backend
+        self.matrix: Optional[AllowedMatrix] = None
+        self._box_totals: BoxTotals = {}
+
+    def record_box_score(self, game_id: Any, box_score: Sequence[Dict]) -> None:
+        """Sum a final game's player box score per team (see box_score_ingest)."""
+        totals: Dict[Any, List[float]] = {}
+        for stat in box_score:
+            team_id = stat.get("team", {}).get("id")
+            if team_id is None:
+                continue
+            values = extract_stat_row(stat)
+            row = totals.setdefault(team_id, [0.0] * len(BOX_STATS))
+            for i, column in enumerate(_BOX_COLUMNS):
+                row[i] += values[column]
+        for team_id, row in totals.items():
+            self._box_totals[(game_id, team_id)] = tuple(row)
+
+    async def ensure_current(self) -> AllowedMatrix:
+        """Today's matrix, building it on the first call of the day."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        if self.matrix is None or self.matrix.built_on != today:
+            await self.refresh(today)
+        return self.matrix
+
+    async def refresh(self, built_on: Optional[str] = None) -> AllowedMatrix:
+        """Rebuild the matrix from this season's completed games."""
+        built_on = built_on or datetime.now().strftime("%Y-%m-%d")
+        games = await self.api.get_season_games()
+        self.matrix = await self.compute.run(
+            build_allowed_matrix, games, dict(self._box_totals), built_on
+        )
+        logger.info("Opponent-allowed matrix built (%d teams)", len(self.matrix.team_ids))
+        return self.matrix
+
+    def allowed(self, team_id: Any, stat: str, window: Optional[int] = None) -> Optional[float]:
+        """O(1) lookup in the current matrix (None until it is built)."""
+        if self.matrix is None:
+            return None
+        return self.matrix.allowed(team_id, stat, window)
+
+    def allowed_series(self, team_id: Any, stat: str, limit: Optional[int] = None) -> List[float]:
+        """Per-game allowed series, e.g. for ProjectionEngine.analyze_team_total."""
+        if self.matrix is None:
+            return []
+        return self.matrix.allowed_series(team_id, stat, limit)
+
+    def defense_factor(self, team_name: str, stat: str, window: Optional[int] = None) -> Optional[float]:
+        """Allowed / league average for a team by name (None until built or unknown)."""
+        if self.matrix is None or team_name not in self.matrix.names:
+            return None
+        return self.matrix.defense_factor(self.matrix.names[team_name], stat, window)
+
+
+# Global instance
+opponent_allowed = OpponentAllowed(api_client)
@@ -8,21 +8,50 @@ NBABot v10.0 Parlay Engine (FIXED)
 Core logic for generating rule-based parlays with realistic odds.
 """
 
+import asyncio
+import hashlib
 import random
 import uuid
-from datetime import datetime
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, field, asdict
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Awaitable, Callable, Sequence, Tuple
+from dataclasses import dataclass, field, replace
 
-from eligibility import check_eligibility, calculate_hit_rate_percentage
+from eligibility import (
+    check_eligibility, check_player_prop_eligibility, calculate_hit_rate_percentage
+)
 from api_client import api_client
+from caution_engine import (
+    PlayerCautionData, TeamCautionData, detect_player_cautions_many, detect_team_cautions_many
+)
+from compute import compute_backend
+from parlay_store import ParlayStore, open_store
+from prop_markets import (
+    PROP_HISTORY_GAMES, PlayerLog, evaluate_team_props, extract_stat_row, format_prop_label
+)
+from game_log_index import SEASON_GAMES, game_log_index
+from injury_feed import StatusChange, injury_feed
+from player_pool import player_pool
+from player_status import STATUS_ELIGIBILITY
+from rolling_stats import (
+    PLAYER, ROLLING_DEPTH, TEAM, TEAM_STATS, StatsChange, player_row, rolling_stats, team_row
+)
+from box_score_ingest import box_score_ingest, recent_game_ids
+from schedule_index import schedule
+from teammate_splits import teammate_splits
+from usage_rates import usage_rates
+from serializer import SchemaCodec, load_schema
+from ttl_registry import TTLRegistry
+from simulation import SimulationResult, simulate_parlay
 from config import (
     DEFAULT_LADDER, MIN_LEGS, MAX_LEGS, 
-    PROP_TYPES, LEG_TYPES, VALID_LADDERS
+    PROP_TYPES, LEG_TYPES, VALID_LADDERS,
+    SIMULATION_TRIALS, LEG_CONTEXT_TTL, LEG_CONTEXT_MAX,
+    SLATE_DEADLINE_SECONDS, SLATE_SUFFICIENT_LEGS
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class HitRate:
     """Hit rate data structure."""
     hits: int
@@ -30,11 +59,19 @@ class HitRate:
     ladder: int
     percentage: float = 0.0
     
+    # v11 windows (player props)
+    hits_l5: Optional[int] = None
+    games_l5: Optional[int] = None
+    hits_l10: Optional[int] = None
+    games_l10: Optional[int] = None
+    hits_l15: Optional[int] = None
+    games_l15: Optional[int] = None
+    
     def __post_init__(self):
         self.percentage = calculate_hit_rate_percentage(self.hits, self.games)
 
 
-@dataclass
+@dataclass(slots=True)
 class Selection:
     """Leg selection data structure."""
     label: str
@@ -47,7 +84,7 @@ class Selection:
     prop_type: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Odds:
     """Odds data structure with proper conversion."""
     american: int
@@ -73,9 +110,14 @@ class Odds:
             return round(abs(self.american) / (abs(self.american) + 100) * 100, 1)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Matchup:
-    """Game matchup data structure."""
+    """
+    Game matchup data structure.
+    
+    Immutable and interned: build through intern_matchup() so every leg
+    from the same game shares one instance.
+    """
     home_team: str
     away_team: str
     game_id: str
@@ -83,7 +125,23 @@ class Matchup:
     game_time: Optional[str] = None
 
 
-@dataclass
+def intern_matchup(
+    home_team: str,
+    away_team: str,
+    game_id: str,
+    game_date: Optional[str] = None,
+    game_time: Optional[str] = None
+) -> Matchup:
+    """Get the shared Matchup instance for a game."""
+    return _intern_matchup(home_team, away_team, game_id, game_date, game_time)
+
+
+@lru_cache(maxsize=1024)
+def _intern_matchup(home_team, away_team, game_id, game_date, game_time) -> Matchup:
+    return Matchup(home_team, away_team, game_id, game_date, game_time)
+
+
+@dataclass(slots=True)
 class H2HData:
     """Head-to-head data structure."""
     wins: int
@@ -91,7 +149,7 @@ class H2HData:
     window: str = "1_year"
 
 
-@dataclass
+@dataclass(slots=True)
 class SpreadData:
     """Spread-specific data structure."""
     spread_value: float
@@ -99,7 +157,7 @@ class SpreadData:
     cover_rate: Dict[str, int] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Leg:
     """Parlay leg data structure."""
     id: str
@@ -112,14 +170,19 @@ class Leg:
     h2h: Optional[H2HData] = None
     spread_data: Optional[SpreadData] = None
     rejection_reason: Optional[str] = None
+    # Hit (1) / miss (0) per sample game, most recent first (see simulation.py)
+    outcomes: List[int] = field(default_factory=list)
+    
+    # Runtime only (not part of schemas/leg.json, never serialized)
+    confidence: Optional[Any] = None
+    caution: Optional[Any] = None
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        data = asdict(self)
-        return data
+        """Convert to dictionary (fields from schemas/leg.json)."""
+        return LEG_CODEC.to_dict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Parlay:
     """Parlay data structure."""
     id: str
@@ -136,26 +199,63 @@ class Parlay:
     channel_id: Optional[str] = None
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        return {
-            "id": self.id,
-            "legs": [leg.to_dict() for leg in self.legs],
-            "leg_count": self.leg_count,
-            "wager": self.wager,
-            "ladder": self.ladder,
-            "total_odds": self.total_odds,
-            "total_odds_decimal": self.total_odds_decimal,
-            "potential_win": self.potential_win,
-            "created_at": self.created_at,
-            "user_id": self.user_id,
-            "guild_id": self.guild_id,
-            "channel_id": self.channel_id
-        }
-
-
-def generate_leg_id() -> str:
-    """Generate unique leg ID."""
-    return f"leg_{uuid.uuid4().hex[:8]}"
+        """Convert to dictionary (fields from schemas/parlay.json)."""
+        return PARLAY_CODEC.to_dict(self)
+
+
+# ============================================
+# SERIALIZERS (compiled from schemas/*.json)
+# ============================================
+
+_LEG_SCHEMA = load_schema("leg.json")
+_LEG_PROPS = _LEG_SCHEMA["properties"]
+
+LEG_CODEC = SchemaCodec(
+    _LEG_SCHEMA,
+    Leg,
+    nested={
+        "matchup": SchemaCodec(_LEG_PROPS["matchup"], Matchup, factory=intern_matchup),
+        "selection": SchemaCodec(_LEG_PROPS["selection"], Selection),
+        "odds": SchemaCodec(_LEG_PROPS["odds"], Odds),
+        "hit_rate": SchemaCodec(_LEG_PROPS["hit_rate"], HitRate),
+        "h2h": SchemaCodec(_LEG_PROPS["h2h"], H2HData),
+        "spread_data": SchemaCodec(_LEG_PROPS["spread_data"], SpreadData),
+    },
+)
+
+PARLAY_CODEC = SchemaCodec(
+    load_schema("parlay.json"),
+    Parlay,
+    nested={"legs": LEG_CODEC},
+    arrays=("legs",),
+)
+
+
+def generate_leg_id(
+    leg_type: str,
+    game_id: str,
+    selection: Selection,
+    ladder: int
+) -> str:
+    """
+    Generate a deterministic, content-addressed leg ID.
+    
+    The ID is a hash of the fields that define the bet (type, game,
+    subject, line, direction, ladder), so the same leg gets the same ID
+    in every parlay and caches keyed on it are shared. Odds are not part
+    of the ID: they are priced per generation, and the store keeps each
+    parlay's own copy of its legs.
+    """
+    if selection.player_id:
+        subject = f"player:{selection.player_id}:{selection.prop_type}"
+    elif selection.team_id:
+        subject = f"team:{selection.team_id}"
+    else:
+        subject = "game"
+    
+    line = repr(float(selection.value)) if selection.value is not None else ""
+    key = "|".join([leg_type, str(game_id), subject, line, selection.direction or "", str(ladder)])
+    return f"leg_{hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()}"
 
 
 def generate_parlay_id() -> str:
@@ -163,15 +263,440 @@ def generate_parlay_id() -> str:
     return f"parlay_{uuid.uuid4().hex[:12]}"
 
 
+# ============================================
+# CANDIDATE EVALUATION (pure — runs on the compute backend)
+# ============================================
+# The engine fetches everything a game needs into a GameInputs (plain
+# tuples, cheap to pickle); the builders below turn it into legs without
+# touching the API, so they can run in a worker process.
+
+@dataclass(slots=True)
+class TeamInputs:
+    """Compact per-team inputs for leg building (most recent game first)."""
+    team_id: Any
+    team_name: str
+    won: Tuple[bool, ...]
+    margins: Tuple[float, ...]
+    totals: Tuple[float, ...]
+    scores: Tuple[float, ...]
+    h2h_wins: int = 0
+    h2h_games: int = 0
+    # (player_id, player_name, BASE_STATS row per game) — see prop_markets.py
+    players: Tuple[PlayerLog, ...] = ()
+
+
+@dataclass(slots=True)
+class GameInputs:
+    """Compact per-game inputs for leg building."""
+    matchup: Matchup
+    home: TeamInputs
+    away: TeamInputs
+
+
+def build_team_level_legs(inputs: GameInputs, ladder: int) -> List[Leg]:
+    """Moneyline, spread, game total and team total legs for a game."""
+    matchup, home, away = inputs.matchup, inputs.home, inputs.away
+    legs = []
+    
+    # Moneyline legs
+    for team in (home, away):
+        legs.append(build_moneyline_leg(matchup, team, ladder))
+    
+    # Spread legs
+    for team in (home, away):
+        legs.append(build_spread_leg(matchup, team, ladder))
+    
+    # Game total legs
+    for direction in ("over", "under"):
+        legs.append(build_game_total_leg(matchup, home, direction, ladder))
+    
+    # Team total legs
+    for team in (home, away):
+        for direction in ("over", "under"):
+            legs.append(build_team_total_leg(matchup, team, direction, ladder))
+    
+    return legs
+
+
+def build_game_prop_legs(inputs: GameInputs, ladder: int) -> List[Leg]:
+    """Player prop legs for both teams of a game."""
+    legs = []
+    for team in (inputs.home, inputs.away):
+        legs.extend(build_player_prop_legs(inputs.matchup, team, ladder))
+    return legs
+
+
+def build_moneyline_leg(matchup: Matchup, team: TeamInputs, ladder: int) -> Leg:
+    """Generate a moneyline leg."""
+    outcomes = [1 if won else 0 for won in team.won]
+    wins = sum(outcomes)
+    
+    # Check eligibility
+    is_eligible, rejection = check_eligibility(wins, ladder, ladder)
+    
+    # Generate REALISTIC odds
+    odds_value = generate_realistic_odds("moneyline", wins, ladder)
+    
+    selection = Selection(
+        label=f"{team.team_name} ML",
+        direction="win",
+        team_name=team.team_name,
+        team_id=str(team.team_id)
+    )
+    
+    return Leg(
+        id=generate_leg_id("moneyline", matchup.game_id, selection, ladder),
+        type="moneyline",
+        matchup=matchup,
+        selection=selection,
+        odds=Odds(american=odds_value),
+        hit_rate=HitRate(hits=wins, games=ladder, ladder=ladder),
+        h2h=H2HData(wins=team.h2h_wins, games=team.h2h_games) if team.h2h_games else None,
+        eligible=is_eligible,
+        rejection_reason=rejection,
+        outcomes=outcomes
+    )
+
+
+def build_spread_leg(matchup: Matchup, team: TeamInputs, ladder: int) -> Leg:
+    """Generate a spread leg."""
+    margins = team.margins
+    avg_margin = sum(margins) / len(margins) if margins else 0
+    
+    # Generate spread
+    spread_value = round(avg_margin * 0.7, 1)
+    if spread_value > 0:
+        spread_value = -spread_value
+    
+    # Count covers
+    outcomes = []
+    for margin in margins:
+        if spread_value < 0:
+            outcomes.append(1 if margin > abs(spread_value) else 0)
+        else:
+            outcomes.append(1 if margin > -spread_value else 0)
+    covers = sum(outcomes)
+    
+    is_eligible, rejection = check_eligibility(covers, ladder, ladder)
+    odds_value = generate_realistic_odds("spread", covers, ladder)
+    
+    selection = Selection(
+        label=f"{team.team_name} {spread_value:+.1f}",
+        value=spread_value,
+        direction="cover",
+        team_name=team.team_name,
+        team_id=str(team.team_id)
+    )
+    
+    return Leg(
+        id=generate_leg_id("spread", matchup.game_id, selection, ladder),
+        type="spread",
+        matchup=matchup,
+        selection=selection,
+        odds=Odds(american=odds_value),
+        hit_rate=HitRate(hits=covers, games=ladder, ladder=ladder),
+        spread_data=SpreadData(
+            spread_value=spread_value,
+            avg_margin=round(avg_margin, 1),
+            cover_rate={"covers": covers, "games": ladder}
+        ),
+        eligible=is_eligible,
+        rejection_reason=rejection,
+        outcomes=outcomes
+    )
+
+
+def build_game_total_leg(matchup: Matchup, home: TeamInputs, direction: str, ladder: int) -> Leg:
+    """Generate a game total leg (from the home team's recent games)."""
+    totals = home.totals
+    avg_total = sum(totals) / len(totals) if totals else 220
+    
+    if direction == "over":
+        total_line = round(avg_total - 2, 1)
+    else:
+        total_line = round(avg_total + 2, 1)
+    
+    if direction == "over":
+        outcomes = [1 if total > total_line else 0 for total in totals]
+    else:
+        outcomes = [1 if total < total_line else 0 for total in totals]
+    hits = sum(outcomes)
+    
+    is_eligible, rejection = check_eligibility(hits, ladder, ladder)
+    odds_value = generate_realistic_odds("total", hits, ladder)
+    
+    selection = Selection(
+        label=f"Game Total {direction.title()} {total_line}",
+        value=total_line,
+        direction=direction
+    )
+    
+    return Leg(
+        id=generate_leg_id("game_total", matchup.game_id, selection, ladder),
+        type="game_total",
+        matchup=matchup,
+        selection=selection,
+        odds=Odds(american=odds_value),
+        hit_rate=HitRate(hits=hits, games=ladder, ladder=ladder),
+        eligible=is_eligible,
+        rejection_reason=rejection,
+        outcomes=outcomes
+    )
+
+
+def build_team_total_leg(matchup: Matchup, team: TeamInputs, direction: str, ladder: int) -> Leg:
+    """Generate a team total leg."""
+    scores = team.scores
+    avg_score = sum(scores) / len(scores) if scores else 110
+    
+    if direction == "over":
+        total_line = round(avg_score - 1.5, 1)
+    else:
+        total_line = round(avg_score + 1.5, 1)
+    
+    if direction == "over":
+        outcomes = [1 if score > total_line else 0 for score in scores]
+    else:
+        outcomes = [1 if score < total_line else 0 for score in scores]
+    hits = sum(outcomes)
+    
+    is_eligible, rejection = check_eligibility(hits, ladder, ladder)
+    odds_value = generate_realistic_odds("total", hits, ladder)
+    
+    selection = Selection(
+        label=f"{team.team_name} Team Total {direction.title()} {total_line}",
+        value=total_line,
+        direction=direction,
+        team_name=team.team_name,
+        team_id=str(team.team_id)
+    )
+    
+    return Leg(
+        id=generate_leg_id("team_total", matchup.game_id, selection, ladder),
+        type="team_total",
+        matchup=matchup,
+        selection=selection,
+        odds=Odds(american=odds_value),
+        hit_rate=HitRate(hits=hits, games=ladder, ladder=ladder),
+        eligible=is_eligible,
+        rejection_reason=rejection,
+        outcomes=outcomes
+    )
+
+
+def build_player_prop_legs(matchup: Matchup, team: TeamInputs, ladder: int) -> List[Leg]:
+    """Generate player prop legs (every market, overs and unders)."""
+    legs = []
+    
+    for prop in evaluate_team_props(team.players, ladder):
+        player_id, player_name, _ = team.players[prop.player_index]
+        
+        is_eligible, rejection = check_eligibility(prop.hits, ladder, ladder)
+        if is_eligible:
+            is_eligible, rejection, _ = check_player_prop_eligibility(
+                *prop.window_hits, *prop.window_games
+            )
+        odds_value = generate_realistic_odds("prop", prop.hits, ladder)
+        
+        selection = Selection(
+            label=format_prop_label(player_name, prop.market, prop.direction, prop.line),
+            value=prop.line,
+            direction=prop.direction,
+            player_name=player_name,
+            player_id=str(player_id),
+            team_name=team.team_name,
+            team_id=str(team.team_id),
+            prop_type=prop.market
+        )
+        
+        hits_l5, hits_l10, hits_l15 = prop.window_hits
+        games_l5, games_l10, games_l15 = prop.window_games
+        
+        legs.append(Leg(
+            id=generate_leg_id("player_prop", matchup.game_id, selection, ladder),
+            type="player_prop",
+            matchup=matchup,
+            selection=selection,
+            odds=Odds(american=odds_value),
+            hit_rate=HitRate(
+                hits=prop.hits, games=prop.games, ladder=ladder,
+                hits_l5=hits_l5, games_l5=games_l5,
+                hits_l10=hits_l10, games_l10=games_l10,
+                hits_l15=hits_l15, games_l15=games_l15
+            ),
+            eligible=is_eligible,
+            rejection_reason=rejection,
+            outcomes=prop.outcomes
+        ))
+    
+    return legs
+
+
+def select_varied_indices(keys: Sequence[Tuple[str, str]], count: int) -> List[int]:
+    """
+    Select legs with variety.
+    
+    Args:
+        keys: (leg type, game id) per eligible leg
+        count: Number of legs to select
+    
+    Returns:
+        Indices into keys of the selected legs
+    """
+    if len(keys) <= count:
+        return list(range(len(keys)))[:count]
+    
+    selected = []
+    types_used = set()
+    games_used = set()
+    
+    shuffled = list(range(len(keys)))
+    random.shuffle(shuffled)
+    
+    for i in shuffled:
+        if len(selected) >= count:
+            break
+        leg_type, game_id = keys[i]
+        if leg_type not in types_used or game_id not in games_used:
+            selected.append(i)
+            types_used.add(leg_type)
+            games_used.add(game_id)
+    
+    chosen = set(selected)
+    for i in shuffled:
+        if len(selected) >= count:
+            break
+        if i not in chosen:
+            selected.append(i)
+            chosen.add(i)
+    
+    return selected[:count]
+
+
+def generate_realistic_odds(bet_type: str, hits: int, games: int) -> int:
+    """
+    Generate REALISTIC American odds based on bet type and hit rate.
+    
+    Typical NBA odds ranges:
+    - Moneyline favorites: -300 to -110
+    - Moneyline underdogs: +110 to +300
+    - Spreads/Totals: -115 to -105 (standard juice)
+    - Player props: -130 to +130
+    """
+    hit_rate = hits / games if games > 0 else 0.5
+    
+    if bet_type == "moneyline":
+        # Moneyline odds vary more based on matchup
+        if hit_rate >= 0.8:
+            return random.randint(-200, -140)
+        elif hit_rate >= 0.6:
+            return _american_between(-140, +110)
+        else:
+            return random.randint(+110, +180)
+    
+    elif bet_type == "spread":
+        # Spreads typically have standard juice around -110
+        base = -110
+        variance = random.randint(-5, 5)
+        return base + variance
+    
+    elif bet_type == "total":
+        # Totals also have standard juice
+        base = -110
+        variance = random.randint(-5, 5)
+        return base + variance
+    
+    elif bet_type == "prop":
+        # Player props have wider variance
+        if hit_rate >= 0.8:
+            return random.randint(-135, -115)
+        elif hit_rate >= 0.6:
+            return _american_between(-120, +105)
+        else:
+            return random.randint(+100, +130)
+    
+    else:
+        # Default
+        return -110
+
+
+def _american_between(low: int, high: int) -> int:
+    """
+    Random American odds from low to high, skipping the (-100, +100) band
+    that no price sits in (each half is drawn in proportion to its width).
+    """
+    favorite = max(0, min(high, -100) - low + 1)
+    underdog = max(0, high - max(low, 100) + 1)
+    if random.randrange(favorite + underdog) < favorite:
+        return random.randint(low, min(high, -100))
+    return random.randint(max(low, 100), high)
+
+
+# ============================================
+# ANYTIME SLATE SEARCH
+# ============================================
+# A slate is searched in steps: first every game's team-level legs (cheap —
+# team results are usually warm), then every game's player props, the
+# games with the most eligible team-level legs first. The search stops at
+# its deadline or as soon as the caller's sufficiency check passes.
+
+SEARCH_RUNNING = "running"
+SEARCH_COMPLETE = "complete"
+SEARCH_DEADLINE = "deadline"
+SEARCH_SUFFICIENT = "sufficient"
+
+
+@dataclass(slots=True)
+class SlateSearch:
+    """Candidate legs from a slate search, and how far the search got."""
+    legs: List[Leg]
+    games: int                          # Games on the slate
+    games_done: int                     # Games with every leg type evaluated
+    steps: int                          # (game, team-level / props) steps
+    steps_done: int
+    stopped: str                        # SEARCH_RUNNING / _COMPLETE / _DEADLINE / _SUFFICIENT
+    elapsed: float                      # Seconds
+    
+    @property
+    def complete(self) -> bool:
+        return self.stopped == SEARCH_COMPLETE
+    
+    @property
+    def coverage(self) -> float:
+        """Share of the slate's steps evaluated (1.0 = every leg type of every game)."""
+        return self.steps_done / self.steps if self.steps else 1.0
+
+
 class ParlayEngine:
     """
     Engine for generating rule-based parlays.
+    
+    Data is fetched on the event loop; candidate evaluation and parlay
+    search run on the compute backend (see compute.py).
     """
     
     def __init__(self):
         self.api = api_client
-        self._parlay_cache: Dict[str, Parlay] = {}
-        self._leg_cache: Dict[str, Leg] = {}
+        self.compute = compute_backend
+        
+        # Per-leg context (leg id → CautionResult / confidence score); a
+        # status or stats change drops only the affected entity's legs.
+        # A leg stays tracked until neither registry holds it.
+        self._cautions: TTLRegistry = TTLRegistry(
+            "leg_cautions", LEG_CONTEXT_TTL, LEG_CONTEXT_MAX, on_evict=self._on_context_evict
+        )
+        self._scores: TTLRegistry = TTLRegistry(
+            "leg_scores", LEG_CONTEXT_TTL, LEG_CONTEXT_MAX, on_evict=self._on_context_evict
+        )
+        self._entity_legs: Dict[Tuple[str, str], set] = {}
+        self._leg_entities: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        injury_feed.subscribe(self._on_status_change)
+        rolling_stats.subscribe(self._on_stats_change)
+    
+    @property
+    def store(self) -> ParlayStore:
+        """The durable parlay store (opened on first use)."""
+        return open_store()
     
     async def generate_parlay(
         self,
@@ -180,10 +705,15 @@ class ParlayEngine:
         ladder: int = DEFAULT_LADDER,
         user_id: str = None,
         guild_id: str = None,
-        channel_id: str = None
+        channel_id: str = None,
+        deadline: Optional[float] = SLATE_DEADLINE_SECONDS
     ) -> Optional[Parlay]:
         """
         Generate a new parlay.
+        
+        The slate is searched until `deadline` seconds have passed (None or
+        0: no deadline) or SLATE_SUFFICIENT_LEGS usable legs turn up: legs
+        that are eligible and whose caution does not exclude them.
         """
         # Validate inputs
         if not MIN_LEGS <= legs_count <= MAX_LEGS:
@@ -196,20 +726,27 @@ class ParlayEngine:
         if not games:
             return None
         
-        # Generate candidate legs from all games
-        candidates = []
-        for game in games:
-            game_legs = await self._generate_legs_for_game(game, ladder)
-            candidates.extend(game_legs)
+        # Generate candidate legs, most promising games and leg types first
+        target = max(legs_count, SLATE_SUFFICIENT_LEGS)
+        
+        async def usable(legs: List[Leg]) -> List[Leg]:
+            # Cautions are cached per leg, so each step only detects new legs
+            await self.attach_cautions(legs, games)
+            return [leg for leg in legs if leg.eligible and not leg.caution.should_exclude]
         
-        # Filter to eligible legs only
-        eligible_legs = [leg for leg in candidates if leg.eligible]
+        async def enough(search: SlateSearch) -> bool:
+            return len(await usable(search.legs)) >= target
+        
+        search = await self.search_slate(games, ladder, deadline=deadline, enough=enough)
+        
+        # Filter to eligible, non-excluded legs only
+        eligible_legs = await usable(search.legs)
         
         if len(eligible_legs) < legs_count:
             return None
         
         # Select legs with variety
-        selected_legs = self._select_varied_legs(eligible_legs, legs_count)
+        selected_legs = await self.select_varied_legs(eligible_legs, legs_count)
         
         # Calculate combined odds
         total_decimal = 1.0
@@ -235,283 +772,182 @@ class ParlayEngine:
             channel_id=channel_id
         )
         
-        # Cache parlay and legs
-        self._parlay_cache[parlay.id] = parlay
-        for leg in selected_legs:
-            self._leg_cache[leg.id] = leg
+        self.cache_parlay(parlay)
         
         return parlay
     
-    async def _generate_legs_for_game(self, game: Dict, ladder: int) -> List[Leg]:
-        """Generate all possible legs for a game."""
-        legs = []
-        
-        home_team = game.get("teams", {}).get("home", {})
-        away_team = game.get("teams", {}).get("away", {})
-        game_id = str(game.get("id", ""))
-        
-        matchup = Matchup(
-            home_team=home_team.get("name", "Unknown"),
-            away_team=away_team.get("name", "Unknown"),
-            game_id=game_id,
-            game_date=game.get("date", "")[:10] if game.get("date") else "",
-            game_time=game.get("time", "")
-        )
-        
-        # Generate moneyline legs
-        for team in [home_team, away_team]:
-            ml_leg = await self._generate_moneyline_leg(team, home_team, away_team, matchup, ladder)
-            if ml_leg:
-                legs.append(ml_leg)
-        
-        # Generate spread legs
-        for team in [home_team, away_team]:
-            spread_leg = await self._generate_spread_leg(team, matchup, ladder)
-            if spread_leg:
-                legs.append(spread_leg)
-        
-        # Generate game total legs
-        for direction in ["over", "under"]:
-            total_leg = await self._generate_game_total_leg(home_team, away_team, matchup, direction, ladder)
-            if total_leg:
-                legs.append(total_leg)
-        
-        # Generate team total legs
-        for team in [home_team, away_team]:
-            for direction in ["over", "under"]:
-                team_total_leg = await self._generate_team_total_leg(team, matchup, direction, ladder)
-                if team_total_leg:
-                    legs.append(team_total_leg)
-        
-        # Generate player prop legs
-        for team in [home_team, away_team]:
-            player_legs = await self._generate_player_prop_legs(team, matchup, ladder)
-            legs.extend(player_legs)
-        
-        return legs
-    
-    async def _generate_moneyline_leg(
+    async def search_slate(
         self,
-        team: Dict,
-        home_team: Dict,
-        away_team: Dict,
-        matchup: Matchup,
-        ladder: int
-    ) -> Optional[Leg]:
-        """Generate a moneyline leg."""
-        team_id = team.get("id")
-        team_name = team.get("name", "Unknown")
+        games: List[Dict],
+        ladder: int,
+        deadline: Optional[float] = None,
+        enough: Optional[Callable[[SlateSearch], Awaitable[bool]]] = None
+    ) -> SlateSearch:
+        """
+        Generate candidate legs for a slate, best-first, until told to stop.
         
-        recent_games = await self.api.get_team_games(team_id, limit=ladder)
+        Args:
+            deadline: Seconds the search may take (None / 0: no deadline);
+                      the step running when it passes is abandoned
+            enough: Called with the search so far (stopped == SEARCH_RUNNING)
+                    after every step; the search stops once it returns True.
+                    Also the hook for rendering partial results.
         
-        wins = 0
-        for game in recent_games:
-            result = self.api.parse_game_result(game, team_id)
-            if result["won"]:
-                wins += 1
+        Returns:
+            The legs found so far, with how complete the search was
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        stop_at = started + deadline if deadline else None
         
-        # Get H2H data
-        opponent_id = away_team.get("id") if team_id == home_team.get("id") else home_team.get("id")
-        h2h_games = await self.api.get_head_to_head(team_id, opponent_id)
-        h2h_wins = sum(1 for g in h2h_games if self.api.parse_game_result(g, team_id)["won"])
+        def remaining() -> Optional[float]:
+            return None if stop_at is None else max(stop_at - loop.time(), 0.0)
         
-        # Check eligibility
-        is_eligible, rejection = check_eligibility(wins, ladder, ladder)
+        search = SlateSearch(
+            legs=[], games=len(games), games_done=0, steps=2 * len(games), steps_done=0,
+            stopped=SEARCH_RUNNING, elapsed=0.0,
+        )
+        inputs: Dict[int, GameInputs] = {}
+        eligible: Dict[int, int] = {}
         
-        # Generate REALISTIC odds
-        odds_value = self._generate_realistic_odds("moneyline", wins, ladder)
+        # Warm games first: their team results need no API calls
+        order = sorted(range(len(games)), key=lambda i: self._game_priority(games[i]))
+        for props in (False, True):
+            if props:
+                order = sorted((i for i in order if i in inputs), key=lambda i: -eligible[i])
+            for i in order:
+                try:
+                    if remaining() == 0:
+                        raise asyncio.TimeoutError
+                    if props:
+                        batch = await asyncio.wait_for(
+                            self._search_props(inputs[i], ladder), remaining()
+                        )
+                        search.games_done += 1
+                    else:
+                        inputs[i], batch = await asyncio.wait_for(
+                            self._search_team_level(games[i], ladder), remaining()
+                        )
+                        eligible[i] = sum(leg.eligible for leg in batch)
+                    search.legs.extend(batch)
+                    search.steps_done += 1
+                    search.elapsed = loop.time() - started
+                    if enough is not None and await asyncio.wait_for(enough(search), remaining()):
+                        search.stopped = SEARCH_SUFFICIENT
+                except asyncio.TimeoutError:
+                    search.stopped = SEARCH_DEADLINE
+                if search.stopped != SEARCH_RUNNING:
+                    break
+            if search.stopped != SEARCH_RUNNING:
+                break
         
-        return Leg(
-            id=generate_leg_id(),
-            type="moneyline",
-            matchup=matchup,
-            selection=Selection(
-                label=f"{team_name} ML",
-                direction="win",
-                team_name=team_name,
-                team_id=str(team_id)
-            ),
-            odds=Odds(american=odds_value),
-            hit_rate=HitRate(hits=wins, games=ladder, ladder=ladder),
-            h2h=H2HData(wins=h2h_wins, games=len(h2h_games)) if h2h_games else None,
-            eligible=is_eligible,
-            rejection_reason=rejection
+        if search.stopped == SEARCH_RUNNING:
+            search.stopped = SEARCH_COMPLETE
+        search.elapsed = loop.time() - started
+        return search
+    
+    def _game_priority(self, game: Dict) -> int:
+        """Teams without a loaded game log (0–2) — lower is searched first."""
+        teams = game.get("teams", {})
+        return sum(
+            game_log_index.get(TEAM, teams.get(side, {}).get("id")) is None
+            for side in ("home", "away")
         )
     
-    async def _generate_spread_leg(
-        self,
-        team: Dict,
-        matchup: Matchup,
-        ladder: int
-    ) -> Optional[Leg]:
-        """Generate a spread leg."""
-        team_id = team.get("id")
-        team_name = team.get("name", "Unknown")
-        
-        recent_games = await self.api.get_team_games(team_id, limit=ladder)
-        
-        margins = []
-        for game in recent_games:
-            result = self.api.parse_game_result(game, team_id)
-            margins.append(result["margin"])
-        
-        avg_margin = sum(margins) / len(margins) if margins else 0
-        
-        # Generate spread
-        spread_value = round(avg_margin * 0.7, 1)
-        if spread_value > 0:
-            spread_value = -spread_value
-        
-        # Count covers
-        covers = 0
-        for margin in margins:
-            if spread_value < 0:
-                if margin > abs(spread_value):
-                    covers += 1
-            else:
-                if margin > -spread_value:
-                    covers += 1
-        
-        is_eligible, rejection = check_eligibility(covers, ladder, ladder)
-        odds_value = self._generate_realistic_odds("spread", covers, ladder)
-        
-        return Leg(
-            id=generate_leg_id(),
-            type="spread",
-            matchup=matchup,
-            selection=Selection(
-                label=f"{team_name} {spread_value:+.1f}",
-                value=spread_value,
-                direction="cover",
-                team_name=team_name,
-                team_id=str(team_id)
-            ),
-            odds=Odds(american=odds_value),
-            hit_rate=HitRate(hits=covers, games=ladder, ladder=ladder),
-            spread_data=SpreadData(
-                spread_value=spread_value,
-                avg_margin=round(avg_margin, 1),
-                cover_rate={"covers": covers, "games": ladder}
-            ),
-            eligible=is_eligible,
-            rejection_reason=rejection
+    async def _search_team_level(self, game: Dict, ladder: int) -> Tuple[GameInputs, List[Leg]]:
+        inputs = await self._fetch_game_inputs(game, ladder, with_players=False)
+        return inputs, await self._build_legs(build_team_level_legs, inputs, ladder)
+    
+    async def _search_props(self, inputs: GameInputs, ladder: int) -> List[Leg]:
+        home = await self._fetch_player_inputs(inputs.home.team_id, ladder)
+        away = await self._fetch_player_inputs(inputs.away.team_id, ladder)
+        inputs = GameInputs(
+            matchup=inputs.matchup,
+            home=replace(inputs.home, players=home),
+            away=replace(inputs.away, players=away),
         )
+        return await self._build_legs(build_game_prop_legs, inputs, ladder)
     
-    async def _generate_game_total_leg(
+    async def _build_legs(
         self,
-        home_team: Dict,
-        away_team: Dict,
-        matchup: Matchup,
-        direction: str,
+        builder: Callable[[GameInputs, int], List[Leg]],
+        inputs: GameInputs,
         ladder: int
-    ) -> Optional[Leg]:
-        """Generate a game total leg."""
-        home_id = home_team.get("id")
-        
-        recent_games = await self.api.get_team_games(home_id, limit=ladder)
-        
-        totals = []
-        for game in recent_games:
-            result = self.api.parse_game_result(game, home_id)
-            totals.append(result["total"])
-        
-        avg_total = sum(totals) / len(totals) if totals else 220
-        
-        if direction == "over":
-            total_line = round(avg_total - 2, 1)
-        else:
-            total_line = round(avg_total + 2, 1)
-        
-        hits = 0
-        for total in totals:
-            if direction == "over" and total > total_line:
-                hits += 1
-            elif direction == "under" and total < total_line:
-                hits += 1
+    ) -> List[Leg]:
+        legs = await self.compute.run(builder, inputs, ladder)
+        # Legs coming back from a worker carry unpickled copies of the
+        # matchup; point them back at the interned instance.
+        for leg in legs:
+            leg.matchup = inputs.matchup
+        return legs
+    
+    async def _fetch_game_inputs(self, game: Dict, ladder: int, with_players: bool = True) -> GameInputs:
+        """Fetch everything needed to evaluate a game's legs (props need `with_players`)."""
+        home_team = game.get("teams", {}).get("home", {})
+        away_team = game.get("teams", {}).get("away", {})
+        game_id = str(game.get("id", ""))
         
-        is_eligible, rejection = check_eligibility(hits, ladder, ladder)
-        odds_value = self._generate_realistic_odds("total", hits, ladder)
+        matchup = intern_matchup(
+            home_team=home_team.get("name", "Unknown"),
+            away_team=away_team.get("name", "Unknown"),
+            game_id=game_id,
+            game_date=game.get("date", "")[:10] if game.get("date") else "",
+            game_time=game.get("time", "")
+        )
         
-        return Leg(
-            id=generate_leg_id(),
-            type="game_total",
+        return GameInputs(
             matchup=matchup,
-            selection=Selection(
-                label=f"Game Total {direction.title()} {total_line}",
-                value=total_line,
-                direction=direction
-            ),
-            odds=Odds(american=odds_value),
-            hit_rate=HitRate(hits=hits, games=ladder, ladder=ladder),
-            eligible=is_eligible,
-            rejection_reason=rejection
+            home=await self._fetch_team_inputs(home_team, away_team, ladder, with_players),
+            away=await self._fetch_team_inputs(away_team, home_team, ladder, with_players),
         )
     
-    async def _generate_team_total_leg(
+    async def _fetch_team_inputs(
         self,
         team: Dict,
-        matchup: Matchup,
-        direction: str,
-        ladder: int
-    ) -> Optional[Leg]:
-        """Generate a team total leg."""
+        opponent: Dict,
+        ladder: int,
+        with_players: bool = True
+    ) -> TeamInputs:
+        """Fetch a team's recent results, H2H record and player stats."""
         team_id = team.get("id")
-        team_name = team.get("name", "Unknown")
-        
-        recent_games = await self.api.get_team_games(team_id, limit=ladder)
         
-        scores = []
-        for game in recent_games:
-            result = self.api.parse_game_result(game, team_id)
-            scores.append(result["team_score"])
+        results = await self._fetch_team_results(team_id, ladder)
         
-        avg_score = sum(scores) / len(scores) if scores else 110
-        
-        if direction == "over":
-            total_line = round(avg_score - 1.5, 1)
-        else:
-            total_line = round(avg_score + 1.5, 1)
-        
-        hits = 0
-        for score in scores:
-            if direction == "over" and score > total_line:
-                hits += 1
-            elif direction == "under" and score < total_line:
-                hits += 1
-        
-        is_eligible, rejection = check_eligibility(hits, ladder, ladder)
-        odds_value = self._generate_realistic_odds("total", hits, ladder)
+        # Get H2H data
+        h2h_games = await self.api.get_head_to_head(team_id, opponent.get("id"))
+        h2h_wins = sum(1 for g in h2h_games if self.api.parse_game_result(g, team_id)["won"])
         
-        return Leg(
-            id=generate_leg_id(),
-            type="team_total",
-            matchup=matchup,
-            selection=Selection(
-                label=f"{team_name} Team Total {direction.title()} {total_line}",
-                value=total_line,
-                direction=direction,
-                team_name=team_name,
-                team_id=str(team_id)
-            ),
-            odds=Odds(american=odds_value),
-            hit_rate=HitRate(hits=hits, games=ladder, ladder=ladder),
-            eligible=is_eligible,
-            rejection_reason=rejection
+        return TeamInputs(
+            team_id=team_id,
+            team_name=team.get("name", "Unknown"),
+            won=tuple(r["won"] for r in results),
+            margins=tuple(r["margin"] for r in results),
+            totals=tuple(r["total"] for r in results),
+            scores=tuple(r["team_score"] for r in results),
+            h2h_wins=h2h_wins,
+            h2h_games=len(h2h_games),
+            players=await self._fetch_player_inputs(team_id, ladder) if with_players else (),
         )
     
-    async def _generate_player_prop_legs(
-        self,
-        team: Dict,
-        matchup: Matchup,
-        ladder: int
-    ) -> List[Leg]:
-        """Generate player prop legs."""
-        legs = []
-        team_id = team.get("id")
+    async def _fetch_player_inputs(self, team_id: Any, ladder: int) -> Tuple[PlayerLog, ...]:
+        """
+        Fetch recent game logs for a team's most relevant players.
         
+        The team's recent box scores (from the game log loaded by
+        _fetch_team_results) feed the player pool first; deep-bench and
+        reported-out players are never fetched.
+        """
         players = await self.api.get_players_by_team(team_id)
-        top_players = players[:3] if players else []
+        if not players:
+            return ()
+        log = game_log_index.get(TEAM, team_id)
+        if log is not None:
+            await box_score_ingest.backfill(recent_game_ids({
+                team_id: [game.game_id for game in log.meta if game is not None]
+            }))
+        top_players = player_pool.select(team_id, players)
         
+        result = []
         for player in top_players:
             player_id = player.get("id")
             player_name = f"{player.get('firstname', '')} {player.get('lastname', '')}".strip()
@@ -519,68 +955,226 @@ class ParlayEngine:
             if not player_name:
                 continue
             
-            stats = await self.api.get_player_stats(player_id, limit=ladder)
+            # Enough history for every v11 window, not just the ladder
+            rows = await self._fetch_player_rows(
+                player_id, team_id, max(ladder, PROP_HISTORY_GAMES)
+            )
             
-            if not stats:
+            if not rows:
                 continue
             
-            # Points prop
-            points = [s.get("points", 0) or 0 for s in stats]
-            if points:
-                avg_points = sum(points) / len(points)
-                line = round(avg_points - 1.5, 1)
-                hits = sum(1 for p in points if p > line)
-                
-                is_eligible, rejection = check_eligibility(hits, ladder, ladder)
-                odds_value = self._generate_realistic_odds("prop", hits, ladder)
-                
-                legs.append(Leg(
-                    id=generate_leg_id(),
-                    type="player_prop",
-                    matchup=matchup,
-                    selection=Selection(
-                        label=f"{player_name} Over {line} Points",
-                        value=line,
-                        direction="over",
-                        player_name=player_name,
-                        player_id=str(player_id),
-                        prop_type="points"
-                    ),
-                    odds=Odds(american=odds_value),
-                    hit_rate=HitRate(hits=hits, games=len(points), ladder=ladder),
-                    eligible=is_eligible,
-                    rejection_reason=rejection
-                ))
+            result.append((player_id, player_name, rows))
         
-        return legs
+        return tuple(result)
+    
+    async def _fetch_team_results(self, team_id: Any, limit: int) -> List[Dict]:
+        """Recent parse_game_result dicts, from rolling stats when seeded."""
+        entity = rolling_stats.get(TEAM, team_id) if limit <= ROLLING_DEPTH else None
+        if entity is None or game_log_index.get(TEAM, team_id) is None:
+            # One season request feeds the split index and the rolling state
+            recent_games = await self.api.get_team_games(team_id, limit=max(limit, SEASON_GAMES))
+            results = [self.api.parse_game_result(game, team_id) for game in recent_games]
+            game_log_index.load_team(team_id, recent_games, results)
+            if limit <= ROLLING_DEPTH:
+                rolling_stats.seed(TEAM, team_id, [
+                    (game.get("id"), team_row(r)) for game, r in zip(recent_games, results)
+                ])
+            return results[:limit]
+        
+        results = []
+        for row in entity.rows(limit):
+            result = {column: int(value) for column, value in zip(TEAM_STATS, row)}
+            result["won"] = bool(result["won"])
+            results.append(result)
+        return results
+    
+    async def _fetch_player_rows(
+        self,
+        player_id: Any,
+        team_id: Any,
+        limit: int
+    ) -> Tuple[Tuple[float, ...], ...]:
+        """Recent extract_stat_row rows, from rolling stats when seeded."""
+        entity = rolling_stats.get(PLAYER, player_id) if limit <= ROLLING_DEPTH else None
+        if entity is None or game_log_index.get(PLAYER, player_id) is None:
+            stats = await self.api.get_player_stats(player_id, limit=max(limit, SEASON_GAMES))
+            rows = tuple(extract_stat_row(s) for s in stats)
+            game_log_index.load_player(player_id, team_id, stats, rows)
+            if limit <= ROLLING_DEPTH:
+                rolling_stats.seed(PLAYER, player_id, [
+                    (s.get("game", {}).get("id"), player_row(row)) for s, row in zip(stats, rows)
+                ])
+            return rows[:limit]
+        return entity.rows(limit)
     
-    def _select_varied_legs(self, eligible_legs: List[Leg], count: int) -> List[Leg]:
-        """Select legs with variety."""
-        if len(eligible_legs) <= count:
-            return eligible_legs[:count]
+    async def attach_cautions(self, legs: List[Leg], games: List[Dict]) -> List[Leg]:
+        """
+        Set leg.caution for a slate of legs.
         
-        selected = []
-        types_used = set()
-        games_used = set()
+        Schedule context is looked up once per team on the slate in the
+        schedule index built at ingest; role
+        shifts come from the usage / assist rate store and missing key
+        teammates from the with / without splits (or the injury report,
+        when it lists the team); detection runs as one compute-backend
+        task per leg kind. Cautions are cached per leg id.
         
-        shuffled = eligible_legs.copy()
-        random.shuffle(shuffled)
+        Player props whose reported status is excluded (OUT, DOUBTFUL,
+        SUSPENDED) are marked ineligible.
+        """
+        for leg in legs:
+            if leg.type == "player_prop":
+                status = injury_feed.status(leg.selection.player_id)
+                if not STATUS_ELIGIBILITY.get(status, False):
+                    leg.eligible = False
+                    leg.rejection_reason = f"Player status: {status.value}"
         
-        for leg in shuffled:
-            if len(selected) >= count:
-                break
-            if leg.type not in types_used or leg.matchup.game_id not in games_used:
-                selected.append(leg)
-                types_used.add(leg.type)
-                games_used.add(leg.matchup.game_id)
+        legs_to_detect = []
+        for leg in legs:
+            leg.caution = self._cautions.get(leg.id)
+            if leg.caution is None:
+                legs_to_detect.append(leg)
+        if not legs_to_detect:
+            return legs
         
-        for leg in shuffled:
-            if len(selected) >= count:
-                break
-            if leg not in selected:
-                selected.append(leg)
+        # Built at ingest; until then no team is flagged back-to-back
+        index = schedule.index
         
-        return selected[:count]
+        # game_id → (home_id, away_id), and each team's back-to-back flag
+        sides: Dict[str, Tuple[str, str]] = {}
+        back_to_back: Dict[str, bool] = {}
+        for game in games:
+            teams = game.get("teams", {})
+            home_id = str(teams.get("home", {}).get("id"))
+            away_id = str(teams.get("away", {}).get("id"))
+            sides[str(game.get("id", ""))] = (home_id, away_id)
+            if index is None:
+                continue
+            try:
+                day = date.fromisoformat(game.get("date", "")[:10])
+            except ValueError:
+                continue
+            for team_id in (home_id, away_id):
+                back_to_back[team_id] = index.is_back_to_back(team_id, day)
+        
+        # Role shifts / teammates: backfill each slate team's recent box scores (once per game)
+        team_games = {}
+        for team_id in {team_id for pair in sides.values() for team_id in pair}:
+            log = game_log_index.get(TEAM, team_id)
+            if log is not None:
+                team_games[team_id] = [game.game_id for game in log.meta if game is not None]
+        await box_score_ingest.backfill(recent_game_ids(team_games))
+        roles = usage_rates.analyze_roles(
+            leg.selection.player_id for leg in legs_to_detect if leg.type == "player_prop"
+        )
+        
+        player_legs, player_data = [], []
+        team_legs, team_data = [], []
+        for leg in legs_to_detect:
+            home_id, away_id = sides.get(leg.matchup.game_id, ("", ""))
+            team_id = leg.selection.team_id
+            is_road = team_id is not None and team_id == away_id
+            
+            if leg.type == "player_prop":
+                role = roles[str(leg.selection.player_id)]
+                impact = teammate_splits.impact(
+                    team_id, leg.selection.player_id, leg.selection.prop_type or "points",
+                    out=_reported_out(team_id),
+                )
+                entry = injury_feed.entry(leg.selection.player_id)
+                player_legs.append(leg)
+                player_data.append(PlayerCautionData(
+                    injury_status=entry.status.value if entry else None,
+                    is_game_time_decision=bool(entry and entry.game_time_decision),
+                    is_back_to_back=back_to_back.get(team_id, False), is_road=is_road,
+                    role_shift_detected=role.role_shift_detected,
+                    assist_rate_trending_up=role.shift_type == "facilitator_up",
+                    key_teammate_out=bool(impact.key_out),
+                    star_player_out=impact.star_out,
+                ))
+            elif leg.type == "game_total":
+                # Either side on a back-to-back affects the total
+                team_legs.append(leg)
+                team_data.append(TeamCautionData(
+                    is_back_to_back=back_to_back.get(home_id, False) or back_to_back.get(away_id, False)
+                ))
+            else:
+                spread = abs(leg.selection.value or 0) if leg.type == "spread" else 0.0
+                impact = teammate_splits.impact(team_id, out=_reported_out(team_id))
+                team_legs.append(leg)
+                team_data.append(TeamCautionData(
+                    is_back_to_back=back_to_back.get(team_id, False), is_road=is_road, spread_size=spread,
+                    star_player_out=impact.star_out, key_player_out=bool(impact.key_out),
+                ))
+        
+        player_results, team_results = await asyncio.gather(
+            self.compute.run(detect_player_cautions_many, player_data),
+            self.compute.run(detect_team_cautions_many, team_data),
+        )
+        for leg, result in zip(player_legs + team_legs, player_results + team_results):
+            leg.caution = result
+            self._cautions.set(leg.id, result)
+            self._scores.pop(leg.id)    # Scored against the old caution
+            self._track(leg)
+        return legs
+    
+    # ==================== LEG CONTEXT CACHE ====================
+    
+    def leg_score(self, leg_id: str) -> Optional[int]:
+        """Cached confidence score for a leg (None if missing / invalidated)."""
+        return self._scores.get(leg_id)
+    
+    def cache_leg_score(self, leg: Leg, score: int) -> None:
+        self._scores.set(leg.id, score)
+        self._track(leg)
+    
+    def invalidate_entity(self, kind: str, entity_id: Any) -> int:
+        """Drop cached cautions / scores of one player's or team's legs."""
+        leg_ids = list(self._entity_legs.get((kind, str(entity_id)), ()))
+        for leg_id in leg_ids:
+            self._cautions.pop(leg_id)
+            self._scores.pop(leg_id)
+            self._untrack(leg_id)
+        return len(leg_ids)
+    
+    def _track(self, leg: Leg) -> None:
+        if leg.id in self._leg_entities:
+            return
+        entities = []
+        if leg.selection.player_id is not None:
+            entities.append((PLAYER, str(leg.selection.player_id)))
+        if leg.selection.team_id is not None:
+            entities.append((TEAM, str(leg.selection.team_id)))
+        self._leg_entities[leg.id] = tuple(entities)
+        for entity in entities:
+            self._entity_legs.setdefault(entity, set()).add(leg.id)
+    
+    def _untrack(self, leg_id: str) -> None:
+        for entity in self._leg_entities.pop(leg_id, ()):
+            leg_ids = self._entity_legs.get(entity)
+            if leg_ids is not None:
+                leg_ids.discard(leg_id)
+                if not leg_ids:
+                    del self._entity_legs[entity]
+    
+    def _on_context_evict(self, leg_id: str, _value: Any) -> None:
+        if leg_id not in self._cautions and leg_id not in self._scores:
+            self._untrack(leg_id)
+    
+    def _on_status_change(self, change: StatusChange) -> None:
+        # Teammates' legs change too (key teammate out), so drop the whole team
+        if change.team_id is not None:
+            self.invalidate_entity(TEAM, change.team_id)
+        self.invalidate_entity(PLAYER, change.player_id)
+    
+    def _on_stats_change(self, change: StatsChange) -> None:
+        self.invalidate_entity(change.kind, change.entity_id)
+    
+    
+    async def select_varied_legs(self, eligible_legs: List[Leg], count: int) -> List[Leg]:
+        """Select legs with variety (parlay search runs on the compute backend)."""
+        keys = [(leg.type, leg.matchup.game_id) for leg in eligible_legs]
+        indices = await self.compute.run(select_varied_indices, keys, count)
+        return [eligible_legs[i] for i in indices]
     
     def _decimal_to_american(self, decimal: float) -> int:
         """Convert decimal odds to American."""
@@ -589,59 +1183,42 @@ class ParlayEngine:
         else:
             return round(-100 / (decimal - 1))
     
-    def _generate_realistic_odds(self, bet_type: str, hits: int, games: int) -> int:
+    async def estimate_joint_probability(
+        self,
+        parlay: Parlay,
+        trials: int = SIMULATION_TRIALS
+    ) -> Optional[SimulationResult]:
         """
-        Generate REALISTIC American odds based on bet type and hit rate.
+        Estimate the parlay's joint hit probability by Monte Carlo
+        (same-game legs resampled together, see simulation.py).
         
-        Typical NBA odds ranges:
-        - Moneyline favorites: -300 to -110
-        - Moneyline underdogs: +110 to +300
-        - Spreads/Totals: -115 to -105 (standard juice)
-        - Player props: -130 to +130
+        Returns None for parlays whose legs predate outcome tracking.
         """
-        hit_rate = hits / games if games > 0 else 0.5
-        
-        if bet_type == "moneyline":
-            # Moneyline odds vary more based on matchup
-            if hit_rate >= 0.8:
-                return random.randint(-200, -140)
-            elif hit_rate >= 0.6:
-                return random.randint(-140, +110)
-            else:
-                return random.randint(+110, +180)
-        
-        elif bet_type == "spread":
-            # Spreads typically have standard juice around -110
-            base = -110
-            variance = random.randint(-5, 5)
-            return base + variance
-        
-        elif bet_type == "total":
-            # Totals also have standard juice
-            base = -110
-            variance = random.randint(-5, 5)
-            return base + variance
-        
-        elif bet_type == "prop":
-            # Player props have wider variance
-            if hit_rate >= 0.8:
-                return random.randint(-135, -115)
-            elif hit_rate >= 0.6:
-                return random.randint(-120, +105)
-            else:
-                return random.randint(+100, +130)
-        
-        else:
-            # Default
-            return -110
+        if not parlay.legs or any(not leg.outcomes for leg in parlay.legs):
+            return None
+        inputs = [(leg.matchup.game_id, tuple(leg.outcomes)) for leg in parlay.legs]
+        return await self.compute.run(simulate_parlay, inputs, trials)
+    
+    def cache_parlay(self, parlay: Parlay) -> None:
+        """Persist parlay and its legs (hot cache + durable store)."""
+        self.store.save_parlay(parlay)
     
     def get_parlay(self, parlay_id: str) -> Optional[Parlay]:
-        """Get parlay from cache."""
-        return self._parlay_cache.get(parlay_id)
+        """Get parlay from hot cache, falling back to the durable store."""
+        return self.store.get_parlay(parlay_id)
     
     def get_leg(self, leg_id: str) -> Optional[Leg]:
-        """Get leg from cache."""
-        return self._leg_cache.get(leg_id)
+        """Get leg from hot cache, falling back to the durable store."""
+        return self.store.get_leg(leg_id)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hot cache stats and durable store row counts."""
+        return self.store.stats()
+
+
+def _reported_out(team_id: Any) -> Optional[set]:
+    """Players the injury report has sitting (None: team not on the report)."""
+    return injury_feed.out_players(team_id) if injury_feed.reports_team(team_id) else None
 
 
 # Global engine instance
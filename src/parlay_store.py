@@ -0,0 +1,315 @@
+"""
+NBABot v11 — Durable Parlay Store
+
+ADDED FOR: Button interactions that survive restarts
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- SQLite is the source of truth for every parlay and leg ever generated
+- A small TTL hot cache sits in front of it for active messages
+- Rows are stored as compact binary blobs (schema-ordered rows, zlib'd)
+- Each parlay keeps its own copy of its legs (odds are priced per
+  generation, so the same leg id can carry different odds in different
+  parlays); leg-id lookups return the most recently stored copy
+- Indexed lookup by parlay id, leg id, user and guild
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config import (
+    PARLAY_STORE_PATH, PARLAY_STORE_MAX_AGE_DAYS, PARLAY_CACHE_TTL, PARLAY_CACHE_MAX, LEG_CACHE_MAX
+)
+from ttl_registry import TTLRegistry
+
+
+# ============================================
+# SCHEMA
+# ============================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parlays (
+    parlay_id   TEXT PRIMARY KEY,
+    user_id     TEXT,
+    guild_id    TEXT,
+    channel_id  TEXT,
+    created_at  TEXT,
+    data        BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_parlays_user ON parlays (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_parlays_guild ON parlays (guild_id, created_at);
+
+CREATE TABLE IF NOT EXISTS parlay_legs (
+    parlay_id   TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    leg_id      TEXT NOT NULL,
+    game_id     TEXT,
+    data        BLOB NOT NULL,
+    PRIMARY KEY (parlay_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_parlay_legs_leg ON parlay_legs (leg_id);
+"""
+
+# Bumped whenever the row layout below changes
+CODEC_VERSION = 1
+
+
+class UnsupportedCodecVersion(ValueError):
+    """A stored row was written by a newer codec than this one."""
+
+
+# ============================================
+# BINARY CODEC
+# ============================================
+# Leg rows come from the schema-driven LEG_CODEC: nested lists in
+# schemas/leg.json property order, so no key names are repeated per row.
+
+def encode_leg(leg) -> bytes:
+    """Serialize a Leg to a compact binary blob."""
+    from parlay_engine import LEG_CODEC
+
+    return _pack([CODEC_VERSION, LEG_CODEC.to_row(leg)])
+
+
+def decode_leg(blob: bytes):
+    """
+    Deserialize a Leg from encode_leg() output.
+
+    Raises:
+        UnsupportedCodecVersion: The row is newer than CODEC_VERSION
+    """
+    from parlay_engine import LEG_CODEC
+
+    version, row = _unpack(blob)
+    if version > CODEC_VERSION:
+        raise UnsupportedCodecVersion(f"leg row v{version} (codec v{CODEC_VERSION})")
+    return LEG_CODEC.from_row(row)
+
+
+def encode_parlay_header(parlay) -> bytes:
+    """Serialize parlay fields (legs are stored separately)."""
+    return _pack([
+        CODEC_VERSION,
+        parlay.leg_count,
+        parlay.wager,
+        parlay.ladder,
+        parlay.total_odds,
+        parlay.total_odds_decimal,
+        parlay.potential_win,
+    ])
+
+
+def _pack(row: List[Any]) -> bytes:
+    return zlib.compress(json.dumps(row, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> List[Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+# ============================================
+# STORE
+# ============================================
+
+class ParlayStore:
+    """
+    SQLite-backed parlay/leg store with a TTL hot cache in front.
+
+    All methods are synchronous and guarded by a lock; each call is a
+    single indexed query, so they are safe to run on the event loop.
+    """
+
+    def __init__(self, path: str = PARLAY_STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        # Hot cache (recently generated / clicked parlays)
+        self._parlay_cache: TTLRegistry = TTLRegistry(
+            "parlays", ttl_seconds=PARLAY_CACHE_TTL, max_entries=PARLAY_CACHE_MAX
+        )
+        self._leg_cache: TTLRegistry = TTLRegistry(
+            "legs", ttl_seconds=PARLAY_CACHE_TTL, max_entries=LEG_CACHE_MAX
+        )
+
+    # ==================== WRITES ====================
+
+    def save_parlay(self, parlay) -> None:
+        """Persist a parlay and its legs, and warm the hot cache."""
+        leg_rows = [
+            (parlay.id, i, leg.id, leg.matchup.game_id, encode_leg(leg))
+            for i, leg in enumerate(parlay.legs)
+        ]
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parlays "
+                "(parlay_id, user_id, guild_id, channel_id, created_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (parlay.id, parlay.user_id, parlay.guild_id, parlay.channel_id,
+                 parlay.created_at, encode_parlay_header(parlay)),
+            )
+            self._conn.execute("DELETE FROM parlay_legs WHERE parlay_id = ?", (parlay.id,))
+            self._conn.executemany(
+                "INSERT INTO parlay_legs (parlay_id, position, leg_id, game_id, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                leg_rows,
+            )
+
+        self._parlay_cache.set(parlay.id, parlay)
+        for leg in parlay.legs:
+            self._leg_cache.set(leg.id, leg)
+
+    def prune(self, max_age_days: int = PARLAY_STORE_MAX_AGE_DAYS) -> int:
+        """Delete parlays older than max_age_days (and their legs)."""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM parlays WHERE created_at < ?", (cutoff,))
+            removed = cur.rowcount
+            self._conn.execute(
+                "DELETE FROM parlay_legs WHERE parlay_id NOT IN (SELECT parlay_id FROM parlays)"
+            )
+        return removed
+
+    # ==================== READS ====================
+
+    def get_parlay(self, parlay_id: str):
+        """Get parlay by id (hot cache first, then SQLite)."""
+        parlay = self._parlay_cache.get(parlay_id)
+        if parlay is not None:
+            return parlay
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT parlay_id, user_id, guild_id, channel_id, created_at, data "
+                "FROM parlays WHERE parlay_id = ?",
+                (parlay_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        parlay = self._build_parlay(row, self.get_legs_for_parlay(parlay_id))
+        self._parlay_cache.set(parlay.id, parlay)
+        return parlay
+
+    def get_leg(self, leg_id: str):
+        """Get leg by id (hot cache first, then SQLite)."""
+        leg = self._leg_cache.get(leg_id)
+        if leg is not None:
+            return leg
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM parlay_legs WHERE leg_id = ? ORDER BY rowid DESC LIMIT 1",
+                (leg_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        leg = decode_leg(row[0])
+        self._leg_cache.set(leg.id, leg)
+        return leg
+
+    def get_legs_for_parlay(self, parlay_id: str) -> List:
+        """Get a parlay's legs in their original order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM parlay_legs WHERE parlay_id = ? ORDER BY position",
+                (parlay_id,),
+            ).fetchall()
+        return [decode_leg(row[0]) for row in rows]
+
+    def get_parlays_for_user(self, user_id: str, limit: int = 10) -> List:
+        """Get a user's most recent parlays."""
+        return self._query_parlays("user_id", user_id, limit)
+
+    def get_parlays_for_guild(self, guild_id: str, limit: int = 10) -> List:
+        """Get a guild's most recent parlays."""
+        return self._query_parlays("guild_id", guild_id, limit)
+
+    # ==================== STATS ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hot cache and on-disk row counts."""
+        with self._lock:
+            parlays = self._conn.execute("SELECT COUNT(*) FROM parlays").fetchone()[0]
+            legs = self._conn.execute("SELECT COUNT(*) FROM parlay_legs").fetchone()[0]
+        return {
+            "parlays": self._parlay_cache.stats(),
+            "legs": self._leg_cache.stats(),
+            "stored_parlays": parlays,
+            "stored_legs": legs,
+            "path": self.path,
+        }
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ==================== HELPERS ====================
+
+    def _query_parlays(self, column: str, value: str, limit: int) -> List:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT parlay_id, user_id, guild_id, channel_id, created_at, data "
+                f"FROM parlays WHERE {column} = ? ORDER BY created_at DESC LIMIT ?",
+                (value, limit),
+            ).fetchall()
+        return [self._build_parlay(row, self.get_legs_for_parlay(row[0])) for row in rows]
+
+    def _build_parlay(self, row, legs: List):
+        from parlay_engine import Parlay
+
+        parlay_id, user_id, guild_id, channel_id, created_at, data = row
+        header = _unpack(data)
+        if header[0] > CODEC_VERSION:
+            raise UnsupportedCodecVersion(f"parlay row v{header[0]} (codec v{CODEC_VERSION})")
+        (_, leg_count, wager, ladder, total_odds, total_odds_decimal,
+         potential_win) = header
+
+        return Parlay(
+            id=parlay_id,
+            legs=legs,
+            leg_count=leg_count,
+            wager=wager,
+            ladder=ladder,
+            total_odds=total_odds,
+            total_odds_decimal=total_odds_decimal,
+            potential_win=potential_win,
+            created_at=created_at,
+            user_id=user_id,
+            guild_id=guild_id,
+            channel_id=channel_id,
+        )
+
+
+# Global store instance (opened by the bot's setup_hook, or on first use)
+_store: Optional[ParlayStore] = None
+
+
+def open_store(path: str = PARLAY_STORE_PATH) -> ParlayStore:
+    """Get the global store, opening it on first call."""
+    global _store
+    if _store is None:
+        _store = ParlayStore(path)
+    return _store
+
+
+def close_store() -> None:
+    """Close the global store (the next open_store() reopens it)."""
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
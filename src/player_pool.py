@@ -0,0 +1,203 @@
+"""
+NBABot v11 — Player Pool (relevance ranking)
+
+ADDED FOR: Choosing which roster players get player prop legs
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Per team, the last POOL_GAMES recorded box scores (box-score ingest and
+  its backfill feed this index alongside usage rates and teammate splits)
+- Relevance = average minutes (a missed game counts as 0)
+              + USAGE_WEIGHT × average usage rate × (average minutes / 48)
+              + STARTER_BONUS × share of games started
+  computed for the whole team in one NumPy pass
+- Players averaging under PLAYER_POOL_MIN_MINUTES are deep bench and are
+  never fetched; neither are players the injury report has out
+- Prop generation evaluates the top PLAYER_POOL_SIZE roster players by
+  relevance; a team with no recorded box scores (or none matching the
+  roster) falls back to roster order, as before v11
+- A team's ranking is rebuilt on first use after a new game is recorded
+- Entity IDs are keyed as strings (Selection IDs are strings)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config import PLAYER_POOL_MIN_MINUTES, PLAYER_POOL_SIZE
+from injury_feed import injury_feed
+from player_status import STATUS_ELIGIBILITY
+from usage_rates import compute_rates, extract_usage_row
+
+# Recent games per team used for the ranking
+POOL_GAMES = 10
+
+USAGE_WEIGHT = 0.5
+STARTER_BONUS = 8.0
+
+# game_id → (date, {player_id: (minutes, usage, started)}) for one team
+TeamRows = Dict[str, Tuple[str, Dict[str, Tuple[float, float, bool]]]]
+
+
+@dataclass(slots=True, frozen=True)
+class PlayerRelevance:
+    """One player's place in the team's pool."""
+    player_id: str
+    relevance: float
+    minutes: float                      # Average, missed games as 0 (NaN: unknown)
+    usage: float                        # Average usage rate (NaN: unknown)
+    start_rate: float
+    games: int                          # Recorded games played
+
+    @property
+    def deep_bench(self) -> bool:
+        return self.minutes < PLAYER_POOL_MIN_MINUTES
+
+
+def rank_team(games: TeamRows) -> Tuple[PlayerRelevance, ...]:
+    """Every player of one team's games, most relevant first."""
+    order = sorted(games, key=lambda g: games[g][0], reverse=True)[:POOL_GAMES]
+    player_ids = tuple(dict.fromkeys(p for g in order for p in games[g][1]))
+    if not player_ids:
+        return ()
+    rows = {p: i for i, p in enumerate(player_ids)}
+
+    # (players, games): minutes 0 / usage NaN where the player did not play
+    minutes = np.zeros((len(player_ids), len(order)))
+    usage = np.full((len(player_ids), len(order)), np.nan)
+    started = np.zeros((len(player_ids), len(order)), dtype=bool)
+    played = np.zeros((len(player_ids), len(order)), dtype=bool)
+    for g, game_id in enumerate(order):
+        for player_id, (mins, rate, start) in games[game_id][1].items():
+            i = rows[player_id]
+            minutes[i, g], usage[i, g], started[i, g] = mins, rate, start
+            played[i, g] = True
+
+    # Minutes NaN for a whole row (payload without minutes) stays NaN
+    known = ~np.isnan(minutes)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_minutes = np.where(known.any(axis=1), np.nansum(minutes, axis=1) / known.sum(axis=1), np.nan)
+        avg_usage = np.nansum(usage, axis=1) / (~np.isnan(usage)).sum(axis=1)
+    start_rate = started.sum(axis=1) / len(order)
+    games_played = played.sum(axis=1)
+
+    # Usage is a per-minute rate, so it is scaled by the minutes share;
+    # unknown minutes rank by appearances instead (every game = 36 min)
+    minutes_term = np.where(np.isnan(avg_minutes), 36.0 * games_played / len(order), avg_minutes)
+    relevance = (
+        minutes_term
+        + USAGE_WEIGHT * np.nan_to_num(avg_usage) * minutes_term / 48
+        + STARTER_BONUS * start_rate
+    )
+    ranked = np.argsort(-relevance, kind="stable")
+
+    return tuple(
+        PlayerRelevance(
+            player_id=player_ids[i],
+            relevance=float(relevance[i]),
+            minutes=float(avg_minutes[i]),
+            usage=float(avg_usage[i]),
+            start_rate=float(start_rate[i]),
+            games=int(games_played[i]),
+        )
+        for i in ranked
+    )
+
+
+class PlayerPoolIndex:
+    """Per-team box-score rows and lazily rebuilt relevance rankings."""
+
+    def __init__(self):
+        self._games: Dict[str, TeamRows] = {}
+        self._seen: Set[str] = set()
+        self._rankings: Dict[str, Tuple[PlayerRelevance, ...]] = {}
+
+    def __contains__(self, game_id: Any) -> bool:
+        return str(game_id) in self._seen
+
+    def record_box_score(self, game_id: Any, box_score: Sequence[Dict]) -> None:
+        self.record_box_scores({game_id: box_score})
+
+    def record_box_scores(self, box_scores: Dict[Any, Sequence[Dict]]) -> None:
+        """Add final games (already-recorded games are skipped)."""
+        game_ids, team_ids, player_ids, dates, starts, rows = [], [], [], [], [], []
+        for game_id, box_score in box_scores.items():
+            game_id = str(game_id)
+            if game_id in self._seen:
+                continue
+            self._seen.add(game_id)
+            for stat in box_score:
+                player_id = stat.get("player", {}).get("id")
+                team_id = stat.get("team", {}).get("id")
+                if player_id is None or team_id is None:
+                    continue
+                game_ids.append(game_id)
+                team_ids.append(str(team_id))
+                player_ids.append(str(player_id))
+                dates.append((stat.get("game", {}).get("date") or "")[:10])
+                starts.append(_started(stat))
+                rows.append(extract_usage_row(stat))
+        if not rows:
+            return
+
+        usage, _ = compute_rates(game_ids, team_ids, np.asarray(rows))
+        for i, player_id in enumerate(player_ids):
+            mins = rows[i][0]
+            if mins == 0:
+                continue    # Did not play: absent from the game's rows
+            team = self._games.setdefault(team_ids[i], {})
+            team.setdefault(game_ids[i], (dates[i], {}))[1][player_id] = (
+                mins, float(usage[i]), starts[i]
+            )
+            self._rankings.pop(team_ids[i], None)
+
+    def ranking(self, team_id: Any) -> Optional[Tuple[PlayerRelevance, ...]]:
+        """The team's players, most relevant first (None: no games recorded)."""
+        team_id = str(team_id)
+        ranking = self._rankings.get(team_id)
+        if ranking is None and team_id in self._games:
+            ranking = self._rankings[team_id] = rank_team(self._games[team_id])
+        return ranking
+
+    def recent_minutes(self, team_id: Any, player_id: Any, games: int = 15) -> List[float]:
+        """The player's minutes in the team's last `games` games they played, most recent first."""
+        team = self._games.get(str(team_id), {})
+        player_id = str(player_id)
+        order = sorted(team, key=lambda g: team[g][0], reverse=True)
+        minutes = [team[g][1][player_id][0] for g in order if player_id in team[g][1]]
+        return [m for m in minutes if not np.isnan(m)][:games]
+
+    def select(self, team_id: Any, roster: Sequence[Dict], size: int = PLAYER_POOL_SIZE) -> List[Dict]:
+        """
+        The roster entries worth evaluating for props, most relevant first.
+
+        Deep-bench players and players reported out are left out; without
+        a ranking that overlaps the roster, the first `size` roster entries.
+        """
+        ranking = self.ranking(team_id)
+        by_id = {str(p.get("id")): p for p in roster}
+        pool = [
+            by_id[r.player_id] for r in ranking or ()
+            if r.player_id in by_id and not r.deep_bench
+            and STATUS_ELIGIBILITY.get(injury_feed.status(r.player_id), False)
+        ]
+        if not pool and not any(r.player_id in by_id for r in ranking or ()):
+            return list(roster[:size])
+        return pool[:size]
+
+    def clear(self) -> None:
+        self._games.clear()
+        self._seen.clear()
+        self._rankings.clear()
+
+
+def _started(stat: Dict) -> bool:
+    """Started the game (API-Basketball: "type": "starters")."""
+    if "starter" in stat:
+        return bool(stat["starter"])
+    return str(stat.get("type", "")).lower() in ("starters", "starter")
+
+
+# Global index instance
+player_pool = PlayerPoolIndex()
@@ -26,11 +26,15 @@ Core Rules (LOCKED):
 - 3 straight low-minute games → EXCLUDE
 """
 
-from typing import Dict, List, Optional, Tuple
+import warnings
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
 from statistics import mean, median
 
+import numpy as np
+
 
 # ============================================
 # CONSTANTS (LOCKED — DO NOT MODIFY)
@@ -81,28 +85,33 @@ STATUS_CONFIDENCE_MODIFIER = {
 
 @dataclass
 class MinutesData:
-    """Minutes data for a player."""
+    """
+    Minutes data for a player.
+    
+    Windows and averages are computed once; treat minutes_last_15 as
+    read-only after construction.
+    """
     minutes_last_15: List[float]  # Most recent first
     season_average: float
     last_game_minutes: float
     
-    @property
+    @cached_property
     def minutes_last_5(self) -> List[float]:
         return self.minutes_last_15[:5]
     
-    @property
+    @cached_property
     def minutes_last_10(self) -> List[float]:
         return self.minutes_last_15[:10]
     
-    @property
+    @cached_property
     def avg_last_5(self) -> float:
         return mean(self.minutes_last_5) if self.minutes_last_5 else 0
     
-    @property
+    @cached_property
     def avg_last_10(self) -> float:
         return mean(self.minutes_last_10) if self.minutes_last_10 else 0
     
-    @property
+    @cached_property
     def avg_last_15(self) -> float:
         return mean(self.minutes_last_15) if self.minutes_last_15 else 0
 
@@ -284,21 +293,17 @@ def analyze_minutes(data: MinutesData) -> MinutesAnalysis:
     median_minutes = median(data.minutes_last_15)
     low_threshold = data.season_average * LOW_MINUTES_THRESHOLD
     
-    # Count low-minute games
-    low_minute_games = []
-    for i, mins in enumerate(data.minutes_last_15):
-        if mins < low_threshold:
-            low_minute_games.append(i)
-    
-    low_minute_count = len(low_minute_games)
-    
-    # Calculate consecutive low-minute streak (from most recent)
+    # Count low-minute games and the consecutive streak (from most recent)
+    low_minute_count = 0
     low_minute_streak = 0
-    for i, mins in enumerate(data.minutes_last_15):
+    streak_open = True
+    for mins in data.minutes_last_15:
         if mins < low_threshold:
-            low_minute_streak += 1
+            low_minute_count += 1
+            if streak_open:
+                low_minute_streak += 1
         else:
-            break
+            streak_open = False
     
     # Check stability (low variance in recent games)
     recent_5 = data.minutes_last_5
@@ -322,7 +327,110 @@ def analyze_minutes(data: MinutesData) -> MinutesAnalysis:
     else:
         trend = "stable"
     
-    # Build flags
+    return _minutes_analysis(avg_minutes, median_minutes, low_minute_count, low_minute_streak, is_stable, trend)
+
+
+def get_minutes_display(data: MinutesData, analysis: Optional[MinutesAnalysis] = None) -> Dict[str, str]:
+    """
+    Get minutes data formatted for display.
+    
+    Pass `analysis` (e.g. from analyze_roster_minutes) to skip re-analysis.
+    
+    Returns dict for embed fields.
+    """
+    if not data.minutes_last_15:
+        return {"Average Minutes": "N/A", "Low-Minute Games": "N/A"}
+    
+    analysis = analysis or analyze_minutes(data)
+    
+    return {
+        "Average Minutes": f"{analysis.avg_minutes}",
+        "Low-Minute Games": str(analysis.low_minute_game_count),
+        "Minutes Trend": analysis.recent_trend.title()
+    }
+
+
+# ============================================
+# ROSTER MINUTES (VECTORIZED)
+# ============================================
+
+def minutes_matrix(minutes: Sequence[Sequence[float]], games: int = 15) -> np.ndarray:
+    """
+    Players × games matrix from per-player minutes lists (most recent first).
+    
+    Short lists are padded with NaN (no game); longer ones are cut to `games`.
+    """
+    matrix = np.full((len(minutes), games), np.nan)
+    for row, values in enumerate(minutes):
+        values = list(values)[:games]
+        matrix[row, :len(values)] = values
+    return matrix
+
+
+def analyze_minutes_matrix(
+    minutes: np.ndarray,
+    season_averages: Sequence[float]
+) -> List[MinutesAnalysis]:
+    """
+    analyze_minutes for every player in one pass.
+    
+    Args:
+        minutes: players × games, most recent first, NaN = no game
+                 (games must be a contiguous prefix of each row)
+        season_averages: one season average per player
+    """
+    minutes = np.asarray(minutes, dtype=float).reshape(len(season_averages), -1)
+    season_averages = np.asarray(season_averages, dtype=float)
+    valid = ~np.isnan(minutes)
+    games = valid.sum(axis=1)
+    
+    # Low-minute games and the streak from the most recent game
+    low = minutes < (season_averages * LOW_MINUTES_THRESHOLD)[:, None]
+    low_count = low.sum(axis=1)
+    low_streak = np.cumprod(low, axis=1).sum(axis=1)
+    
+    # Stability: last 5 within an 8-minute range (fewer than 5 games = stable)
+    recent = minutes[:, :5]
+    with np.errstate(invalid="ignore"):
+        stable = games < 5
+        if recent.shape[1] == 5:
+            stable |= (recent.max(axis=1) - recent.min(axis=1)) <= 8
+    
+    # Trend: last 5 vs the 5 before (needs 10 games); compared as 5-game
+    # sums (±2 avg = ±10 total) so whole-minute data matches mean() exactly
+    trend = np.full(len(games), "stable", dtype=object)
+    if minutes.shape[1] >= 10:
+        change = minutes[:, 0:5].sum(axis=1) - minutes[:, 5:10].sum(axis=1)
+        has_trend = games >= 10
+        trend[has_trend & (change > 10)] = "up"
+        trend[has_trend & (change < -10)] = "down"
+    
+    # All-NaN rows (no games) warn here; they are handled below
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        avg = np.nanmean(minutes, axis=1)
+        med = np.nanmedian(minutes, axis=1)
+    
+    results = []
+    for i in range(len(games)):
+        if not games[i]:
+            results.append(analyze_minutes(MinutesData([], float(season_averages[i]), 0)))
+            continue
+        results.append(_minutes_analysis(
+            float(avg[i]), float(med[i]), int(low_count[i]), int(low_streak[i]), bool(stable[i]), trend[i]
+        ))
+    return results
+
+
+def _minutes_analysis(
+    avg_minutes: float,
+    median_minutes: float,
+    low_minute_count: int,
+    low_minute_streak: int,
+    is_stable: bool,
+    trend: str
+) -> MinutesAnalysis:
+    """MinutesAnalysis (with flags) from the computed measures."""
     flags = []
     if low_minute_count >= 2:
         flags.append(f"Minutes volatility detected ({low_minute_count} low games)")
@@ -349,22 +457,53 @@ def analyze_minutes(data: MinutesData) -> MinutesAnalysis:
     )
 
 
-def get_minutes_display(data: MinutesData) -> Dict[str, str]:
+class MinutesAnalysisCache:
     """
-    Get minutes data formatted for display.
+    Roster minutes analyses, cached per player per data version.
     
-    Returns dict for embed fields.
+    The version is whatever changes when a player's minutes do (e.g. the
+    latest game id); only players whose version moved are re-analyzed.
     """
-    if not data.minutes_last_15:
-        return {"Average Minutes": "N/A", "Low-Minute Games": "N/A"}
     
-    analysis = analyze_minutes(data)
+    def __init__(self):
+        self._entries: Dict[Any, Tuple[Hashable, MinutesAnalysis]] = {}
+    
+    def get(self, player_id: Any, version: Hashable) -> Optional[MinutesAnalysis]:
+        entry = self._entries.get(player_id)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+    
+    def analyze(
+        self,
+        player_ids: Sequence[Any],
+        minutes: np.ndarray,
+        season_averages: Sequence[float],
+        versions: Sequence[Hashable]
+    ) -> List[MinutesAnalysis]:
+        """Analyses for a roster (rows of `minutes` follow player_ids)."""
+        results: List[Optional[MinutesAnalysis]] = [
+            self.get(player_id, version) for player_id, version in zip(player_ids, versions)
+        ]
+        stale = [i for i, result in enumerate(results) if result is None]
+        if stale:
+            fresh = analyze_minutes_matrix(
+                np.asarray(minutes, dtype=float)[stale],
+                [season_averages[i] for i in stale]
+            )
+            for i, analysis in zip(stale, fresh):
+                self._entries[player_ids[i]] = (versions[i], analysis)
+                results[i] = analysis
+        return results
     
-    return {
-        "Average Minutes": f"{analysis.avg_minutes}",
-        "Low-Minute Games": str(analysis.low_minute_game_count),
-        "Minutes Trend": analysis.recent_trend.title()
-    }
+    def invalidate(self, player_id: Any) -> None:
+        self._entries.pop(player_id, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+minutes_cache = MinutesAnalysisCache()
 
 
 # ============================================
@@ -497,7 +636,7 @@ def format_status_display(status: PlayerStatus) -> str:
     return f"{icon} {status.value.title()}"
 
 
-def format_minutes_for_insights(data: MinutesData) -> str:
+def format_minutes_for_insights(data: MinutesData, analysis: Optional[MinutesAnalysis] = None) -> str:
     """
     Format minutes section for Insights output.
     
@@ -509,7 +648,7 @@ def format_minutes_for_insights(data: MinutesData) -> str:
     if not data.minutes_last_15:
         return "MINUTES\nNo data available"
     
-    analysis = analyze_minutes(data)
+    analysis = analysis or analyze_minutes(data)
     
     lines = [
         "MINUTES",
@@ -540,3 +679,19 @@ def analyze_player_minutes(data: MinutesData) -> MinutesAnalysis:
     """
     _assert_v11()
     return analyze_minutes(data)
+
+
+def analyze_roster_minutes(
+    player_ids: Sequence[Any],
+    minutes: np.ndarray,
+    season_averages: Sequence[float],
+    versions: Sequence[Hashable]
+) -> List[MinutesAnalysis]:
+    """
+    PUBLIC ENTRY POINT — Roster minutes analysis (v11 safe)
+
+    minutes is players × games (most recent first, NaN = no game; see
+    minutes_matrix). Results are cached per player per data version.
+    """
+    _assert_v11()
+    return minutes_cache.analyze(player_ids, minutes, season_averages, versions)
@@ -15,10 +15,14 @@ Core Principles:
 - Prioritizes: highest probability, reasonable odds, consistency
 """
 
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass
 from statistics import mean, stdev
 
+import numpy as np
+
+from hit_rates import HitRateKernel
+
 
 @dataclass
 class AltLineAnalysis:
@@ -49,6 +53,13 @@ class ProjectionResult:
     all_lines_analyzed: List[AltLineAnalysis]
 
 
+@dataclass
+class ProjectionBatch:
+    """Batched alt line analysis (one row per player/stat/direction)."""
+    analyses: List[List[AltLineAnalysis]]   # Per row, in analyze_player_prop order
+    best: List[Optional[AltLineAnalysis]]   # Per row, as _select_best_line
+
+
 class ProjectionEngine:
     """
     Engine for analyzing stats and selecting optimal alt lines.
@@ -82,16 +93,14 @@ class ProjectionEngine:
         if len(game_logs) < 5:
             raise ValueError("Need at least 5 games for analysis")
         
-        # Split into windows
-        l5 = game_logs[:5]
-        l10 = game_logs[:10] if len(game_logs) >= 10 else game_logs
-        l15 = game_logs[:15] if len(game_logs) >= 15 else game_logs
+        # One prefix pass; window averages / hits below are O(1)
+        kernel = HitRateKernel(game_logs)
         
         # Calculate averages
         averages = {
-            'l5': round(mean(l5), 1),
-            'l10': round(mean(l10), 1),
-            'l15': round(mean(l15), 1)
+            'l5': round(kernel.mean(5), 1),
+            'l10': round(kernel.mean(10), 1),
+            'l15': round(kernel.mean(15), 1)
         }
         
         # Sort alt lines appropriately
@@ -105,7 +114,7 @@ class ProjectionEngine:
         # Analyze each alt line
         all_analyses = []
         for line in sorted_lines:
-            analysis = self._analyze_single_line(l5, l10, l15, line, direction)
+            analysis = self._analyze_single_line(kernel, line, direction)
             all_analyses.append(analysis)
         
         # Select best line
@@ -132,30 +141,163 @@ class ProjectionEngine:
             all_lines_analyzed=all_analyses
         )
     
+    def analyze_many(
+        self,
+        game_logs: Sequence[Sequence[float]],
+        alt_lines: Sequence[Sequence[float]],
+        directions: Union[str, Sequence[str]] = "over"
+    ) -> ProjectionBatch:
+        """
+        Analyze many player props at once.
+        
+        Same math as analyze_player_prop() / _analyze_single_line() /
+        _select_best_line(), computed as array operations over every
+        row × alt line instead of one line at a time.
+        
+        Args:
+            game_logs: Per row, stat values (most recent first), 5+ games
+            alt_lines: Per row, available alt lines
+            directions: 'over' / 'under' for every row, or one per row
+        
+        Returns:
+            ProjectionBatch with every AltLineAnalysis and the best line per row
+        """
+        rows = len(game_logs)
+        if isinstance(directions, str):
+            directions = [directions] * rows
+        if rows == 0:
+            return ProjectionBatch(analyses=[], best=[])
+        if any(len(logs) < 5 for logs in game_logs):
+            raise ValueError("Need at least 5 games for analysis")
+        
+        logs = _pad(game_logs)
+        over = np.array([d == "over" for d in directions])
+        
+        # Sort lines: ascending for overs, descending for unders (NaN last)
+        lines = _pad(alt_lines)
+        lines = np.where(over[:, None], np.sort(lines, axis=1), -np.sort(-lines, axis=1))
+        line_valid = ~np.isnan(lines)
+        
+        # Window sizes (l10 / l15 fall back to every game when short)
+        games = (~np.isnan(logs)).sum(axis=1)
+        position = np.arange(logs.shape[1])
+        values = logs[:, None, :]
+        line_col = lines[:, :, None]
+        cleared = np.where(over[:, None, None], values > line_col, values < line_col)
+        
+        hits = {}
+        rates = {}
+        for window in (5, 10, 15):
+            size = np.minimum(window, games)
+            in_window = position[None, :] < size[:, None]
+            hits[window] = (cleared & in_window[:, None, :]).sum(axis=2)
+            rates[window] = hits[window] / size[:, None]
+        
+        # Average margin over l15 = mean(l15) ∓ line
+        l15 = np.where(position[None, :] < np.minimum(15, games)[:, None], logs, 0.0)
+        mean_l15 = l15.sum(axis=1) / np.minimum(15, games)
+        margins = np.where(over[:, None], mean_l15[:, None] - lines, lines - mean_l15[:, None])
+        
+        # Consistency (see _calculate_consistency)
+        stacked = np.stack([rates[5], rates[10], rates[15]])
+        avg_rate = stacked.mean(axis=0)
+        all_equal = (stacked[0] == stacked[1]) & (stacked[1] == stacked[2])
+        penalty = np.where(all_equal, 0.0, stacked.std(axis=0, ddof=1) * 20)
+        consistency = avg_rate * 100 - penalty
+        
+        recommended = (
+            (rates[5] >= self.min_hit_rate_l5) &
+            (rates[10] >= self.min_hit_rate_l10) &
+            (rates[15] >= self.min_hit_rate_l15)
+        ) & line_valid
+        
+        # Array math can land a hair off statistics.mean/stdev; values
+        # within that distance of a 0.05 rounding boundary are recomputed
+        # with the scalar helpers so rounding matches exactly
+        margin_edge = _near_rounding_edge(margins)
+        consistency_edge = _near_rounding_edge(consistency)
+        
+        # Build results
+        analyses = []
+        rounded = np.full(lines.shape, -np.inf)
+        for r in range(rows):
+            row = []
+            l15_values = logs[r, :min(15, games[r])]
+            for k in np.flatnonzero(line_valid[r]):
+                line = float(lines[r, k])
+                if consistency_edge[r, k]:
+                    score = self._calculate_consistency(
+                        float(rates[5][r, k]), float(rates[10][r, k]), float(rates[15][r, k])
+                    )
+                else:
+                    score = max(0, min(100, round(float(consistency[r, k]), 1)))
+                rounded[r, k] = score
+                
+                if margin_edge[r, k]:
+                    sign = 1 if over[r] else -1
+                    avg_margin = mean([sign * (float(v) - line) for v in l15_values])
+                else:
+                    avg_margin = float(margins[r, k])
+                
+                row.append(AltLineAnalysis(
+                    line=line,
+                    direction=directions[r],
+                    hits_l5=int(hits[5][r, k]),
+                    hits_l10=int(hits[10][r, k]),
+                    hits_l15=int(hits[15][r, k]),
+                    hit_rate_l5=float(rates[5][r, k]),
+                    hit_rate_l10=float(rates[10][r, k]),
+                    hit_rate_l15=float(rates[15][r, k]),
+                    avg_margin=round(avg_margin, 1),
+                    consistency_score=score,
+                    is_recommended=bool(recommended[r, k])
+                ))
+            analyses.append(row)
+        
+        # Best line: highest consistency among recommended lines (ties →
+        # lowest line for overs, highest for unders), else highest
+        # consistency overall; first occurrence wins, like max()
+        has_recommended = recommended.any(axis=1)
+        pool = np.where(has_recommended[:, None], recommended, line_valid)
+        score = np.where(pool, rounded, -np.inf)
+        top = pool & (score == score.max(axis=1, keepdims=True))
+        tie_break = np.where(
+            has_recommended[:, None],
+            np.where(over[:, None], -lines, lines),
+            0.0
+        )
+        choice = np.where(top, tie_break, -np.inf).argmax(axis=1)
+        
+        best = []
+        for r in range(rows):
+            if not analyses[r]:
+                best.append(None)
+                continue
+            # analyses[r] holds only valid lines, which are packed first
+            best.append(analyses[r][int(choice[r])])
+        
+        return ProjectionBatch(analyses=analyses, best=best)
+    
     def _analyze_single_line(
         self,
-        l5: List[float],
-        l10: List[float],
-        l15: List[float],
+        kernel: HitRateKernel,
         line: float,
         direction: str
     ) -> AltLineAnalysis:
         """Analyze a single alt line across all windows."""
+        hits_l5 = kernel.hits(line, 5, direction)
+        hits_l10 = kernel.hits(line, 10, direction)
+        hits_l15 = kernel.hits(line, 15, direction)
         
+        l15 = kernel.values[:15]
         if direction == "over":
-            hits_l5 = sum(1 for v in l5 if v > line)
-            hits_l10 = sum(1 for v in l10 if v > line)
-            hits_l15 = sum(1 for v in l15 if v > line)
             margins = [v - line for v in l15]
         else:  # under
-            hits_l5 = sum(1 for v in l5 if v < line)
-            hits_l10 = sum(1 for v in l10 if v < line)
-            hits_l15 = sum(1 for v in l15 if v < line)
             margins = [line - v for v in l15]
         
-        hit_rate_l5 = hits_l5 / len(l5)
-        hit_rate_l10 = hits_l10 / len(l10)
-        hit_rate_l15 = hits_l15 / len(l15)
+        hit_rate_l5 = hits_l5 / kernel.games(5)
+        hit_rate_l10 = hits_l10 / kernel.games(10)
+        hit_rate_l15 = hits_l15 / kernel.games(15)
         
         avg_margin = mean(margins)
         
@@ -310,39 +452,32 @@ class ProjectionEngine:
             ProjectionResult with analysis
         """
         # Calculate team averages
-        l5_team = team_scores[:5]
-        l10_team = team_scores[:10] if len(team_scores) >= 10 else team_scores
-        
-        team_avg_l5 = mean(l5_team)
-        team_avg_l10 = mean(l10_team)
+        team = HitRateKernel(team_scores)
+        team_avg_l5 = team.mean(5)
+        team_avg_l10 = team.mean(10)
         
         # Calculate opponent defense averages
-        l5_opp = opponent_allowed[:5]
-        l10_opp = opponent_allowed[:10] if len(opponent_allowed) >= 10 else opponent_allowed
-        
-        opp_avg_l5 = mean(l5_opp)
-        opp_avg_l10 = mean(l10_opp)
+        opp = HitRateKernel(opponent_allowed)
+        opp_avg_l5 = opp.mean(5)
+        opp_avg_l10 = opp.mean(10)
         
         # Check conditions
         if direction == "over":
             # Team avg >= line AND opponent allows >= line
             team_qualifies = team_avg_l5 >= line
             opp_qualifies = opp_avg_l5 >= line
-            
-            hits_l5 = sum(1 for s in l5_team if s > line)
-            hits_l10 = sum(1 for s in l10_team if s > line)
         else:
             # Team avg <= line AND opponent allows <= line
             team_qualifies = team_avg_l5 <= line
             opp_qualifies = opp_avg_l5 <= line
-            
-            hits_l5 = sum(1 for s in l5_team if s < line)
-            hits_l10 = sum(1 for s in l10_team if s < line)
+        
+        hits_l5 = team.hits(line, 5, direction)
+        hits_l10 = team.hits(line, 10, direction)
         
         both_qualify = team_qualifies and opp_qualifies
         
-        hit_rate_l5 = hits_l5 / len(l5_team)
-        hit_rate_l10 = hits_l10 / len(l10_team)
+        hit_rate_l5 = hits_l5 / team.games(5)
+        hit_rate_l10 = hits_l10 / team.games(10)
         
         # Confidence based on both conditions
         if both_qualify and hit_rate_l5 >= 0.8:
@@ -358,8 +493,8 @@ class ProjectionEngine:
             team_avg_l5, team_avg_l10,
             opp_avg_l5, opp_avg_l10,
             line, direction,
-            hits_l5, len(l5_team),
-            hits_l10, len(l10_team)
+            hits_l5, team.games(5),
+            hits_l10, team.games(10)
         )
         
         return ProjectionResult(
@@ -426,9 +561,7 @@ class ProjectionEngine:
         Returns:
             ProjectionResult with recommended spread
         """
-        l5 = margins[:5]
-        l10 = margins[:10] if len(margins) >= 10 else margins
-        l15 = margins[:15] if len(margins) >= 15 else margins
+        kernel = HitRateKernel(margins)
         
         # Analyze each spread
         best_spread = main_spread
@@ -440,15 +573,12 @@ class ProjectionEngine:
         for spread in sorted(all_spreads):
             # For favorite (negative spread): margin must be > abs(spread)
             # For underdog (positive spread): margin must be > -spread
-            if spread < 0:
-                hits_l5 = sum(1 for m in l5 if m > abs(spread))
-                hits_l10 = sum(1 for m in l10 if m > abs(spread))
-            else:
-                hits_l5 = sum(1 for m in l5 if m > -spread)
-                hits_l10 = sum(1 for m in l10 if m > -spread)
+            # (both are margin > -spread)
+            hits_l5 = kernel.hits(-spread, 5)
+            hits_l10 = kernel.hits(-spread, 10)
             
-            hit_rate_l5 = hits_l5 / len(l5)
-            hit_rate_l10 = hits_l10 / len(l10)
+            hit_rate_l5 = hits_l5 / kernel.games(5)
+            hit_rate_l10 = hits_l10 / kernel.games(10)
             
             spread_analyses.append({
                 'spread': spread,
@@ -472,10 +602,11 @@ class ProjectionEngine:
             spread_analyses[0]
         )
         
-        avg_margin = mean(margins)
+        avg_margin = kernel.mean()
+        main_hits_l5 = kernel.hits(-main_spread, 5)
         
-        reasoning = f"""• Team margin of victory (L5): {'+' if avg_margin > 0 else ''}{mean(l5):.1f} pts
-• Main spread {main_spread:+.1f} hits {sum(1 for m in l5 if m > abs(main_spread) if main_spread < 0 else m > -main_spread)}/5
+        reasoning = f"""• Team margin of victory (L5): {'+' if avg_margin > 0 else ''}{kernel.mean(5):.1f} pts
+• Main spread {main_spread:+.1f} hits {main_hits_l5}/5
 • Alt spread {best_spread:+.1f} hits {best_analysis['hits_l5']}/5 (selected)
 
 • Spread cover rates:
@@ -493,14 +624,32 @@ class ProjectionEngine:
                 'l15': best_analysis['hit_rate_l10'] * 100
             },
             averages={
-                'l5': round(mean(l5), 1),
-                'l10': round(mean(l10), 1),
-                'l15': round(mean(l15), 1)
+                'l5': round(kernel.mean(5), 1),
+                'l10': round(kernel.mean(10), 1),
+                'l15': round(kernel.mean(15), 1)
             },
             reasoning=reasoning,
             all_lines_analyzed=[]
         )
 
 
+def _near_rounding_edge(values: np.ndarray, tolerance: float = 1e-9) -> np.ndarray:
+    """True where a value is within tolerance of an x.x5 rounding boundary."""
+    scaled = np.abs(values) * 10
+    return np.abs(scaled - np.floor(scaled) - 0.5) < tolerance * np.maximum(1.0, scaled)
+
+
+def _pad(rows: Sequence[Sequence[float]]) -> np.ndarray:
+    """Ragged rows → NaN-padded float matrix."""
+    if isinstance(rows, np.ndarray):
+        return rows.astype(float)
+    width = max((len(row) for row in rows), default=0)
+    matrix = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        matrix[i, :len(row)] = row
+    return matrix
+
+
 # Global instance
 projection_engine = ProjectionEngine()
+
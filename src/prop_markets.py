@@ -0,0 +1,262 @@
+"""
+NBABot v11 — Player Prop Markets
+
+ADDED FOR: Evaluating every PLAYER_PROP_MARKETS market (overs + unders)
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Each player's game log is reduced to one row of BASE_STATS per game
+- Every market's series is derived from those rows (combos are sums,
+  double/triple-doubles count categories >= 10)
+- One NumPy pass per team evaluates all players × markets × directions
+- Lines follow the existing prop rule (ladder average ∓ offset); hits are
+  counted in the ladder window and in the v11 L5 / L10 / L15 windows
+- Yes/no markets (double / triple-double) are offered as "Yes" only: "No"
+  clears almost every game, so it would pass any ladder trivially
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from config import PLAYER_PROP_MARKETS
+
+
+# ============================================
+# STAT EXTRACTION
+# ============================================
+
+# Per-game columns pulled from the player statistics payload
+BASE_STATS = (
+    "points",
+    "rebounds",
+    "assists",
+    "steals",
+    "blocks",
+    "threes",
+    "first_quarter_points",
+    "first_half_points",
+)
+
+# Payload keys tried for each column (first present wins)
+BASE_STAT_KEYS: Dict[str, Tuple[str, ...]] = {
+    "points": ("points",),
+    "rebounds": ("rebounds", "totReb"),
+    "assists": ("assists",),
+    "steals": ("steals",),
+    "blocks": ("blocks",),
+    "threes": ("threes", "threepoint_goals", "tpm"),
+    "first_quarter_points": ("first_quarter_points", "q1_points"),
+    "first_half_points": ("first_half_points", "h1_points"),
+}
+
+# Categories counted for double / triple-doubles
+DOUBLE_CATEGORIES = ("points", "rebounds", "assists", "steals", "blocks")
+
+# A market is either a sum of base stats or a count of 10+ categories
+MARKET_SUMS: Dict[str, Tuple[str, ...]] = {
+    "points": ("points",),
+    "rebounds": ("rebounds",),
+    "assists": ("assists",),
+    "pra": ("points", "rebounds", "assists"),
+    "points_rebounds": ("points", "rebounds"),
+    "points_assists": ("points", "assists"),
+    "rebounds_assists": ("rebounds", "assists"),
+    "steals": ("steals",),
+    "blocks": ("blocks",),
+    "threes": ("threes",),
+    "first_quarter_points": ("first_quarter_points",),
+    "first_half_points": ("first_half_points",),
+}
+MARKET_DOUBLES: Dict[str, int] = {
+    "double_double": 2,
+    "triple_double": 3,
+}
+
+# Line = ladder average ∓ offset (yes/no markets use a fixed 0.5 line)
+MARKET_LINE_OFFSETS: Dict[str, float] = {
+    "points": 1.5,
+    "rebounds": 1.0,
+    "assists": 1.0,
+    "pra": 2.5,
+    "points_rebounds": 2.0,
+    "points_assists": 2.0,
+    "rebounds_assists": 1.5,
+    "steals": 0.5,
+    "blocks": 0.5,
+    "threes": 0.5,
+    "first_quarter_points": 1.0,
+    "first_half_points": 1.0,
+}
+
+MARKET_LABELS: Dict[str, str] = {
+    "points": "Points",
+    "rebounds": "Rebounds",
+    "assists": "Assists",
+    "pra": "Pts+Reb+Ast",
+    "points_rebounds": "Pts+Reb",
+    "points_assists": "Pts+Ast",
+    "rebounds_assists": "Reb+Ast",
+    "steals": "Steals",
+    "blocks": "Blocks",
+    "threes": "Threes",
+    "double_double": "Double-Double",
+    "triple_double": "Triple-Double",
+    "first_quarter_points": "1Q Points",
+    "first_half_points": "1H Points",
+}
+
+V11_WINDOWS = (5, 10, 15)
+
+# Games to fetch per player so every v11 window can be filled
+PROP_HISTORY_GAMES = max(V11_WINDOWS)
+
+# (player_id, player_name, one BASE_STATS row per game, most recent first)
+PlayerLog = Tuple[Any, str, Tuple[Tuple[float, ...], ...]]
+
+
+def extract_stat_row(stat: Dict[str, Any]) -> Tuple[float, ...]:
+    """One BASE_STATS row from a player statistics entry (NaN = missing)."""
+    row = []
+    for name in BASE_STATS:
+        value = None
+        for key in BASE_STAT_KEYS[name]:
+            if key in stat:
+                value = stat[key]
+                break
+        if isinstance(value, dict):
+            value = value.get("total")
+        if value is None and name == "points":
+            value = 0  # matches the existing `s.get("points", 0) or 0`
+        row.append(float(value) if value is not None else float("nan"))
+    return tuple(row)
+
+
+# ============================================
+# EVALUATION
+# ============================================
+
+@dataclass(slots=True)
+class PropLine:
+    """One evaluated (player, market, direction) line."""
+    player_index: int
+    market: str
+    direction: str
+    line: float
+    hits: int                        # Ladder window
+    games: int
+    window_hits: Tuple[int, int, int]   # L5 / L10 / L15
+    window_games: Tuple[int, int, int]
+    outcomes: List[int]              # Ladder window, most recent first
+
+
+def derive_market_series(base: np.ndarray, markets: Sequence[str]) -> np.ndarray:
+    """
+    Derive market series from base stat rows.
+
+    Args:
+        base: (players, BASE_STATS, games) array, NaN where missing
+        markets: Market names (PLAYER_PROP_MARKETS order)
+
+    Returns:
+        (players, markets, games) array, NaN where any input is missing
+    """
+    column = {name: i for i, name in enumerate(BASE_STATS)}
+    series = np.full((base.shape[0], len(markets), base.shape[2]), np.nan)
+    for m, market in enumerate(markets):
+        if market in MARKET_SUMS:
+            idx = [column[name] for name in MARKET_SUMS[market]]
+            series[:, m] = base[:, idx].sum(axis=1)
+        elif market in MARKET_DOUBLES:
+            idx = [column[name] for name in DOUBLE_CATEGORIES]
+            tens = (np.nan_to_num(base[:, idx], nan=0.0) >= 10).sum(axis=1)
+            series[:, m] = np.where(
+                np.isnan(base[:, column["points"]]),
+                np.nan,
+                (tens >= MARKET_DOUBLES[market]).astype(float),
+            )
+    return series
+
+
+def evaluate_team_props(
+    players: Sequence[PlayerLog],
+    ladder: int,
+    markets: Sequence[str] = PLAYER_PROP_MARKETS
+) -> List[PropLine]:
+    """
+    Evaluate overs and unders for every player × market on a team
+    (yes/no markets: overs only).
+
+    Markets whose ladder window has missing data for a player (e.g. no
+    quarter splits in the feed) are skipped for that player.
+    """
+    players = [p for p in players if p[2]]
+    if not players:
+        return []
+
+    depth = max(len(log) for _, _, log in players)
+    base = np.full((len(players), len(BASE_STATS), depth), np.nan)
+    for p, (_, _, log) in enumerate(players):
+        base[p, :, :len(log)] = np.asarray(log, dtype=float).T
+
+    series = derive_market_series(base, markets)
+    valid = ~np.isnan(series)
+
+    # Ladder window averages → lines
+    window = min(ladder, depth)
+    ladder_vals = series[..., :window]
+    ladder_games = valid[..., :window].sum(axis=-1)
+    history = valid.sum(axis=-1)
+    complete = (ladder_games > 0) & (ladder_games == np.minimum(window, history))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = np.nansum(ladder_vals, axis=-1) / ladder_games
+
+    offsets = np.array([MARKET_LINE_OFFSETS.get(m, 0.0) for m in markets])
+    binary = np.array([m in MARKET_DOUBLES for m in markets])
+    lines = {
+        "over": np.where(binary, 0.5, np.round(avg - offsets, 1)),
+        "under": np.where(binary, 0.5, np.round(avg + offsets, 1)),
+    }
+
+    results = []
+    for direction, line in lines.items():
+        if direction == "over":
+            hit = series > line[..., None]
+        else:
+            hit = series < line[..., None]
+        hit &= valid
+
+        # Prefix counts → hits / games for every window at once
+        hit_counts = np.cumsum(hit, axis=-1)
+        game_counts = np.cumsum(valid, axis=-1)
+        ends = [min(w, depth) - 1 for w in (window,) + V11_WINDOWS]
+        hits_at = hit_counts[..., ends]
+        games_at = game_counts[..., ends]
+
+        offered = complete if direction == "over" else complete & ~binary
+        for p, m in zip(*np.nonzero(offered)):
+            results.append(PropLine(
+                player_index=int(p),
+                market=markets[m],
+                direction=direction,
+                line=float(line[p, m]),
+                hits=int(hits_at[p, m, 0]),
+                games=int(games_at[p, m, 0]),
+                window_hits=tuple(int(h) for h in hits_at[p, m, 1:]),
+                window_games=tuple(int(g) for g in games_at[p, m, 1:]),
+                outcomes=[int(h) for h in hit[p, m, :window][valid[p, m, :window]]],
+            ))
+
+    # Stable order: player, market, over before under
+    order = {m: i for i, m in enumerate(markets)}
+    results.sort(key=lambda r: (r.player_index, order[r.market], r.direction != "over"))
+    return results
+
+
+def format_prop_label(player_name: str, market: str, direction: str, line: float) -> str:
+    """Display label for a prop leg."""
+    label = MARKET_LABELS.get(market, market.replace("_", " ").title())
+    if market in MARKET_DOUBLES:
+        return f"{player_name} {label}: Yes"
+    return f"{player_name} {direction.title()} {line} {label}"
@@ -0,0 +1,163 @@
+"""
+NBABot v11 — Rolling Window Stats
+
+ADDED FOR: Keeping recent L5 / L10 / L15 rows current as box scores go final
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- One cache of recent rows per player / team, ROLLING_DEPTH games deep
+  (the largest window); appending a game drops the oldest row
+- Rows are plain values; hit rates and averages are computed by their
+  consumers (prop_markets, HitRateKernel), not kept here
+- Missing values (NaN, e.g. no quarter splits) are kept as NaN
+- Every append emits a StatsChange to subscribers (downstream caches)
+- Entities not updated for ROLLING_STATS_MAX_AGE are treated as stale
+  and re-seeded from the API
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import ROLLING_STATS_MAX_AGE
+from prop_markets import BASE_STATS, V11_WINDOWS
+
+logger = logging.getLogger(__name__)
+
+# Team columns, from APIBasketballClient.parse_game_result
+TEAM_STATS = ("team_score", "opponent_score", "margin", "total", "won")
+
+ROLLING_DEPTH = max(V11_WINDOWS)
+
+PLAYER = "player"
+TEAM = "team"
+
+# (game_id, {stat: value}) — one game
+GameRow = Tuple[Any, Dict[str, float]]
+
+
+@dataclass(slots=True)
+class StatsChange:
+    """Emitted after a game is appended to an entity's rolling state."""
+    kind: str               # "player" | "team"
+    entity_id: Any
+    game_id: Any
+    stats: Tuple[str, ...]
+
+
+class EntityStats:
+    """Recent rows for one player or team."""
+
+    __slots__ = ("kind", "entity_id", "columns", "game_ids", "_rows", "updated_at")
+
+    def __init__(self, kind: str, entity_id: Any, columns: Sequence[str]):
+        self.kind = kind
+        self.entity_id = entity_id
+        self.columns = tuple(columns)
+        self.game_ids: Deque[Any] = deque(maxlen=ROLLING_DEPTH)
+        self._rows: Deque[Tuple[float, ...]] = deque(maxlen=ROLLING_DEPTH)
+        self.updated_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def push(self, game_id: Any, row: Dict[str, float]) -> None:
+        self._rows.appendleft(tuple(float(row.get(c, math.nan)) for c in self.columns))
+        self.game_ids.appendleft(game_id)
+        self.updated_at = time.monotonic()
+
+    def rows(self, limit: Optional[int] = None) -> Tuple[Tuple[float, ...], ...]:
+        """One row of `columns` per game, most recent first."""
+        count = len(self) if limit is None else min(limit, len(self))
+        return tuple(islice(self._rows, count))
+
+
+class RollingStatsStore:
+    """
+    Recent rows (up to L15) for players and teams.
+
+    Seed an entity once from its recent history, then append each new
+    final box score; subscribers hear about every append.
+    """
+
+    def __init__(self, max_age: float = ROLLING_STATS_MAX_AGE):
+        self.max_age = max_age
+        self._entities: Dict[Tuple[str, Any], EntityStats] = {}
+        self._listeners: List[Callable[[StatsChange], None]] = []
+
+    # ==================== CORE API ====================
+
+    def get(self, kind: str, entity_id: Any) -> Optional[EntityStats]:
+        """Rolling state for an entity, or None if unknown / stale."""
+        entity = self._entities.get((kind, entity_id))
+        if entity is None or time.monotonic() - entity.updated_at > self.max_age:
+            return None
+        return entity
+
+    def seed(self, kind: str, entity_id: Any, games: Iterable[GameRow]) -> EntityStats:
+        """Replace an entity's state with its history (most recent first)."""
+        entity = EntityStats(kind, entity_id, _columns(kind))
+        for game_id, row in reversed(list(games)[:ROLLING_DEPTH]):
+            entity.push(game_id, row)
+        self._entities[(kind, entity_id)] = entity
+        return entity
+
+    def append(self, kind: str, entity_id: Any, game_id: Any, row: Dict[str, float]) -> bool:
+        """
+        Append a newly final game to a known entity.
+
+        Returns False (and does nothing) for unknown entities and games
+        already applied — those are picked up by the next seed.
+        """
+        entity = self._entities.get((kind, entity_id))
+        if entity is None or game_id in entity.game_ids:
+            return False
+
+        entity.push(game_id, row)
+        self._emit(StatsChange(kind, entity_id, game_id, entity.columns))
+        return True
+
+    def subscribe(self, listener: Callable[[StatsChange], None]) -> None:
+        """Call `listener` after every append."""
+        self._listeners.append(listener)
+
+    def clear(self) -> None:
+        self._entities.clear()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    # ==================== HELPERS ====================
+
+    def _emit(self, change: StatsChange) -> None:
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception:
+                logger.exception("Rolling stats listener failed")
+
+
+def _columns(kind: str) -> Tuple[str, ...]:
+    if kind == PLAYER:
+        return BASE_STATS
+    if kind == TEAM:
+        return TEAM_STATS
+    raise ValueError(f"Unknown entity kind: {kind}")
+
+
+def player_row(stat_row: Sequence[float]) -> Dict[str, float]:
+    """{stat: value} from a prop_markets.extract_stat_row row."""
+    return dict(zip(BASE_STATS, stat_row))
+
+
+def team_row(result: Dict[str, Any]) -> Dict[str, float]:
+    """{stat: value} from APIBasketballClient.parse_game_result."""
+    return {column: float(result[column] or 0) for column in TEAM_STATS}
+
+
+# Global store instance
+rolling_stats = RollingStatsStore()
@@ -0,0 +1,159 @@
+"""
+NBABot v11 — Schedule Index
+
+ADDED FOR: Back-to-back / rest cautions without per-team schedule lookups
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Built once a day at ingest (the bot's first box-score poll of the day)
+  from the season's games plus today's slate; the season request is
+  shared with the opponent-allowed matrix
+- Readers (cautions, game log rest splits) only look up the current
+  index; they never build it
+- Per team, two day-indexed arrays over the season: games played on or
+  before each day, and the last game day on or before each day
+- Days of rest, back-to-back and games-in-N-nights are array lookups,
+  O(1) per team and query
+- Team IDs are keyed as strings (Selection.team_id is a string)
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from api_client import APIBasketballClient, api_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class TeamSchedule:
+    """One team's schedule context for a game day."""
+    rest_days: Optional[int]        # Full days off before the game (None: no prior game)
+    back_to_back: bool
+    games_in_4_nights: int          # Including the game day
+
+
+@dataclass(slots=True)
+class _TeamDays:
+    first: int                      # Ordinal of day 0
+    played: np.ndarray              # Games on or before day i
+    last: np.ndarray                # Ordinal of the last game on or before day i (-1: none)
+
+
+class ScheduleIndex:
+    """Day-indexed schedule arrays per team."""
+
+    def __init__(self, teams: Dict[str, _TeamDays], built_on: str):
+        self._teams = teams
+        self.built_on = built_on
+
+    def __len__(self) -> int:
+        return len(self._teams)
+
+    def rest_days(self, team_id: Any, on: date) -> Optional[int]:
+        """Full days off before `on` (0 = back-to-back)."""
+        last = self._last_before(str(team_id), on.toordinal())
+        return None if last < 0 else on.toordinal() - last - 1
+
+    def is_back_to_back(self, team_id: Any, on: date) -> bool:
+        return self.rest_days(team_id, on) == 0
+
+    def games_in_nights(self, team_id: Any, nights: int, on: date) -> int:
+        """Games in the `nights` days ending on `on` (inclusive)."""
+        day = on.toordinal()
+        return self._played(str(team_id), day) - self._played(str(team_id), day - nights)
+
+    def team_schedule(self, team_id: Any, on: date) -> TeamSchedule:
+        rest = self.rest_days(team_id, on)
+        return TeamSchedule(
+            rest_days=rest,
+            back_to_back=rest == 0,
+            games_in_4_nights=self.games_in_nights(team_id, 4, on),
+        )
+
+    def slate(self, team_ids: Iterable[Any], on: date) -> Dict[str, TeamSchedule]:
+        """Schedule context for every team on a slate."""
+        return {str(t): self.team_schedule(t, on) for t in set(map(str, team_ids))}
+
+    def _played(self, team_id: str, day: int) -> int:
+        team = self._teams.get(team_id)
+        if team is None or day < team.first:
+            return 0
+        return int(team.played[min(day - team.first, len(team.played) - 1)])
+
+    def _last_before(self, team_id: str, day: int) -> int:
+        team = self._teams.get(team_id)
+        if team is None or day - 1 < team.first:
+            return -1
+        return int(team.last[min(day - 1 - team.first, len(team.last) - 1)])
+
+
+def build_schedule_index(games: Sequence[Dict], built_on: str) -> ScheduleIndex:
+    """
+    Build the index from game objects (any order, any status).
+
+    Args:
+        games: Season games plus today's slate
+        built_on: Date the index is for
+    """
+    days: Dict[str, set] = {}
+    for game in games:
+        day = _ordinal(game.get("date", ""))
+        if day is None:
+            continue
+        for side in ("home", "away"):
+            team_id = game.get("teams", {}).get(side, {}).get("id")
+            if team_id is not None:
+                days.setdefault(str(team_id), set()).add(day)
+
+    teams = {}
+    for team_id, game_days in days.items():
+        first, end = min(game_days), max(game_days)
+        span = np.zeros(end - first + 1, dtype=np.int32)
+        span[[d - first for d in game_days]] = 1
+        marks = np.where(span > 0, np.arange(first, end + 1), -1)
+        teams[team_id] = _TeamDays(
+            first=first,
+            played=np.cumsum(span),
+            last=np.maximum.accumulate(marks),
+        )
+    return ScheduleIndex(teams, built_on)
+
+
+def _ordinal(value: str) -> Optional[int]:
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+class Schedule:
+    """Holds today's schedule index."""
+
+    def __init__(self, api: APIBasketballClient):
+        self.api = api
+        self.index: Optional[ScheduleIndex] = None
+
+    async def ensure_current(self) -> ScheduleIndex:
+        """Today's index, building it on the first call of the day."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        if self.index is None or self.index.built_on != today:
+            await self.refresh(today)
+        return self.index
+
+    async def refresh(self, built_on: Optional[str] = None) -> ScheduleIndex:
+        """Rebuild the index from this season's games and today's slate."""
+        built_on = built_on or datetime.now().strftime("%Y-%m-%d")
+        games = list(await self.api.get_season_games())
+        games.extend(await self.api.get_games_today())
+        self.index = build_schedule_index(games, built_on)
+        logger.info("Schedule index built (%d teams)", len(self.index))
+        return self.index
+
+
+# Global instance
+schedule = Schedule(api_client)
@@ -0,0 +1,124 @@
+"""
+NBABot v11 — Schema-Driven Serializer
+
+ADDED FOR: Fast Leg / Parlay serialization (storage + export)
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Field lists come from schemas/*.json — the schema is the contract
+- Dataclass fields not in the schema are never exported
+- Per-class to_dict / to_row / from_row functions are generated once at
+  import time, so serialization is straight attribute access (no
+  recursive deep-copy like dataclasses.asdict)
+- Rows are nested lists in schema property order (compact for storage);
+  new optional properties are appended so older rows still decode
+"""
+
+import json
+import os
+from dataclasses import MISSING, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "schemas")
+
+
+def load_schema(name: str) -> Dict[str, Any]:
+    """Load a JSON schema from the schemas/ directory."""
+    with open(os.path.join(SCHEMA_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class SchemaCodec:
+    """
+    Serializer for one dataclass, compiled from a JSON schema object.
+
+    Args:
+        schema: JSON schema object ({"properties": {...}})
+        cls: Dataclass the schema describes
+        nested: Property name -> SchemaCodec for nested objects
+        arrays: Property names in `nested` that hold lists of objects
+        factory: Optional constructor override (e.g. an interning function)
+    """
+
+    def __init__(
+        self,
+        schema: Dict[str, Any],
+        cls: type,
+        nested: Optional[Dict[str, "SchemaCodec"]] = None,
+        arrays: Tuple[str, ...] = (),
+        factory: Optional[Callable[..., Any]] = None
+    ):
+        self.cls = cls
+        self.nested = nested or {}
+        self.arrays = set(arrays)
+        self.factory = factory or cls
+
+        self._fields = {f.name: f for f in fields(cls) if f.init}
+        self.field_names: List[str] = [
+            name for name in schema.get("properties", {}) if name in self._fields
+        ]
+
+        self.to_dict: Callable[[Any], Dict[str, Any]] = self._compile_to("dict")
+        self.to_row: Callable[[Any], List[Any]] = self._compile_to("row")
+        self.from_dict: Callable[[Dict[str, Any]], Any] = self._compile_from("dict")
+        self.from_row: Callable[[List[Any]], Any] = self._compile_from("row")
+
+    # ==================== CODE GENERATION ====================
+
+    def _encode_expr(self, name: str, mode: str) -> str:
+        """Expression that encodes attribute `name` of `o`."""
+        attr = f"o.{name}"
+        if name not in self.nested:
+            # Plain values; dicts are copied so callers can't mutate the model
+            return f"(dict({attr}) if type({attr}) is dict else {attr})"
+        fn = f"_n_{name}.to_{mode}"
+        if name in self.arrays:
+            return f"[{fn}(x) for x in {attr}]"
+        return f"({fn}({attr}) if {attr} is not None else None)"
+
+    def _decode_expr(self, name: str, source: str, mode: str) -> str:
+        """Expression that decodes `source` for attribute `name`."""
+        if name not in self.nested:
+            return source
+        fn = f"_n_{name}.from_{mode}"
+        if name in self.arrays:
+            return f"[{fn}(x) for x in {source}]"
+        return f"({fn}({source}) if {source} is not None else None)"
+
+    def _compile_to(self, mode: str) -> Callable:
+        exprs = [self._encode_expr(name, mode) for name in self.field_names]
+        if mode == "dict":
+            body = "{" + ", ".join(f"{name!r}: {e}" for name, e in zip(self.field_names, exprs)) + "}"
+        else:
+            body = "[" + ", ".join(exprs) + "]"
+        return self._build(f"def fn(o):\n    return {body}\n")
+
+    def _compile_from(self, mode: str) -> Callable:
+        args = []
+        for i, name in enumerate(self.field_names):
+            if mode == "row":
+                # Rows written before an optional field was appended are
+                # shorter; those fields decode to their defaults
+                if self._fields[name].default is not MISSING:
+                    source = f"(d[{i}] if len(d) > {i} else _default_{name})"
+                elif self._fields[name].default_factory is not MISSING:
+                    source = f"(d[{i}] if len(d) > {i} else _factory_{name}())"
+                else:
+                    source = f"d[{i}]"
+            elif self._fields[name].default is not MISSING:
+                source = f"d.get({name!r}, _default_{name})"
+            elif self._fields[name].default_factory is not MISSING:
+                source = f"(d[{name!r}] if {name!r} in d else _factory_{name}())"
+            else:
+                source = f"d[{name!r}]"
+            args.append(f"{name}={self._decode_expr(name, source, mode)}")
+        return self._build(f"def fn(d):\n    return _factory({', '.join(args)})\n")
+
+    def _build(self, source: str) -> Callable:
+        namespace: Dict[str, Any] = {f"_n_{name}": codec for name, codec in self.nested.items()}
+        for name, f in self._fields.items():
+            namespace[f"_default_{name}"] = f.default
+            namespace[f"_factory_{name}"] = f.default_factory
+        namespace["_factory"] = self.factory
+        exec(compile(source, f"<codec {self.cls.__name__}>", "exec"), namespace)
+        return namespace["fn"]
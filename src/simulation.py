@@ -0,0 +1,99 @@
+"""
+NBABot v11 — Parlay Simulation
+
+ADDED FOR: Joint hit probability in Insights
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Every leg carries its historical outcome vector (1 = hit, most recent
+  game first), built from the same games as its hit rate
+- Legs from the same game are resampled jointly: each trial draws ONE
+  historical game slot per matchup and every leg of that matchup reads
+  its outcome from that slot, so same-game correlation is preserved
+- Different matchups are resampled independently
+- Pure NumPy over compact inputs, so it can run on the compute backend
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class SimulationResult:
+    """Monte Carlo estimate for a parlay."""
+    trials: int
+    joint_probability: float            # P(every leg hits)
+    independent_probability: float      # Product of marginals (no correlation)
+    marginals: List[float]              # P(leg hits), per leg
+    without_leg: List[float]            # P(every other leg hits), per leg
+
+    @property
+    def correlation_lift(self) -> float:
+        """Joint / independent probability (> 1: legs tend to hit together)."""
+        if self.independent_probability <= 0:
+            return 1.0
+        return self.joint_probability / self.independent_probability
+
+    def contribution(self, index: int) -> float:
+        """How much joint probability leg `index` costs the parlay."""
+        return self.without_leg[index] - self.joint_probability
+
+
+def simulate_parlay(
+    legs: Sequence[Tuple[str, Sequence[int]]],
+    trials: int = 100_000,
+    seed: Optional[int] = None
+) -> SimulationResult:
+    """
+    Estimate a parlay's joint hit probability.
+
+    Args:
+        legs: (game_id, outcomes) per leg, in parlay order
+        trials: Number of Monte Carlo trials
+        seed: Optional RNG seed (for reproducible results)
+
+    Returns:
+        SimulationResult
+
+    Raises:
+        ValueError: If there are no legs or a leg has no outcome history
+    """
+    if not legs:
+        raise ValueError("Cannot simulate an empty parlay")
+    if any(len(outcomes) == 0 for _, outcomes in legs):
+        raise ValueError("Every leg needs an outcome history")
+
+    rng = np.random.default_rng(seed)
+
+    # Group legs by game, keeping each leg's position in the parlay
+    groups: Dict[str, List[int]] = {}
+    for i, (game_id, _) in enumerate(legs):
+        groups.setdefault(game_id, []).append(i)
+
+    hits = np.empty((len(legs), trials), dtype=bool)
+    for positions in groups.values():
+        # Align the group on the game slots every leg has history for
+        depth = min(len(legs[i][1]) for i in positions)
+        history = np.array([legs[i][1][:depth] for i in positions], dtype=bool)
+        slots = rng.integers(0, depth, size=trials)
+        hits[positions] = history[:, slots]
+
+    misses = (~hits).sum(axis=0)
+    all_hit = misses == 0
+    joint = float(all_hit.mean())
+
+    # Trials where exactly this leg missed would have won without it
+    one_miss = misses == 1
+    without_leg = joint + (~hits & one_miss).mean(axis=1)
+
+    marginals = hits.mean(axis=1)
+
+    return SimulationResult(
+        trials=trials,
+        joint_probability=joint,
+        independent_probability=float(np.prod(marginals)),
+        marginals=[float(p) for p in marginals],
+        without_leg=[float(p) for p in without_leg],
+    )
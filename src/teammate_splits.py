@@ -0,0 +1,213 @@
+"""
+NBABot v11 — Teammate With / Without Splits
+
+ADDED FOR: key_teammate_out / star_player_out cautions and teammate_missing
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Per team, an availability matrix (player × game: played or not) and the
+  players' market series, built from the box scores box-score ingest sees
+- One vectorized pass (einsum over the availability matrix) gives every
+  player's average with and without every teammate, per market
+- Delta = average without the teammate − average with them; NaN when the
+  teammate sat fewer than MIN_WITHOUT_GAMES of the player's games
+- Key teammates are the team's top KEY_TEAMMATES scorers (points average,
+  at least half the team's games played); the star is the first of them
+- Until a status feed says otherwise, a key teammate who did not play the
+  team's latest recorded game is treated as out
+- A team's splits are rebuilt on first use after a new game is recorded
+- Entity IDs are keyed as strings (Selection IDs are strings)
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config import PLAYER_PROP_MARKETS
+from prop_markets import BASE_STATS, derive_market_series, extract_stat_row
+from usage_rates import extract_usage_row
+
+# Recent games per team kept in the matrix
+SPLIT_GAMES = 30
+
+KEY_TEAMMATES = 3
+MIN_WITHOUT_GAMES = 2
+
+_MARKET_INDEX = {market: i for i, market in enumerate(PLAYER_PROP_MARKETS)}
+_POINTS = _MARKET_INDEX["points"]
+
+# game_id → (date, {player_id: BASE_STATS row}) for one team
+TeamGames = Dict[str, Tuple[str, Dict[str, Tuple[float, ...]]]]
+
+
+@dataclass(slots=True, frozen=True)
+class TeammateImpact:
+    """Which key teammates sit tonight and what that did to a player's stat."""
+    key_out: Tuple[str, ...]            # Key teammates out (not the player)
+    star_out: bool
+    deltas: Dict[str, float]            # Teammate → without − with (known deltas only)
+
+
+@dataclass(slots=True)
+class TeamSplits:
+    """One team's availability matrix and with / without averages."""
+    player_ids: Tuple[str, ...]
+    game_ids: Tuple[str, ...]           # Most recent first
+    played: np.ndarray                  # (players, games) bool
+    with_avg: np.ndarray                # (players, teammates, markets)
+    without_avg: np.ndarray             # (players, teammates, markets)
+    without_games: np.ndarray           # (players, teammates, markets)
+    key: Tuple[str, ...]                # Key teammates, best scorer first
+    rows: Dict[str, int]
+
+    @property
+    def star(self) -> Optional[str]:
+        return self.key[0] if self.key else None
+
+    def delta(self, player_id: Any, teammate_id: Any, market: str) -> Optional[float]:
+        """Player's `market` average without the teammate minus with them."""
+        i, j = self.rows.get(str(player_id)), self.rows.get(str(teammate_id))
+        m = _MARKET_INDEX.get(market)
+        if i is None or j is None or m is None or i == j:
+            return None
+        if self.without_games[i, j, m] < MIN_WITHOUT_GAMES:
+            return None
+        value = self.without_avg[i, j, m] - self.with_avg[i, j, m]
+        return None if math.isnan(value) else float(value)
+
+    def missed_latest(self) -> Tuple[str, ...]:
+        """Key teammates who did not play the latest game."""
+        if not self.game_ids:
+            return ()
+        return tuple(p for p in self.key if not self.played[self.rows[p], 0])
+
+
+def build_team_splits(games: TeamGames) -> TeamSplits:
+    """With / without averages for one team's games (any order)."""
+    order = sorted(games, key=lambda g: games[g][0], reverse=True)[:SPLIT_GAMES]
+    player_ids = tuple(dict.fromkeys(p for g in order for p in games[g][1]))
+    rows = {p: i for i, p in enumerate(player_ids)}
+    base = np.full((len(player_ids), len(BASE_STATS), len(order)), np.nan)
+    for g, game_id in enumerate(order):
+        for player_id, row in games[game_id][1].items():
+            base[rows[player_id], :, g] = row
+    played = ~np.isnan(base).all(axis=1)
+    series = derive_market_series(base, PLAYER_PROP_MARKETS)
+
+    # with[i, j, m] = player i's market m over games where teammate j played
+    valid = ~np.isnan(series)
+    values = np.where(valid, series, 0.0)
+    teammate = played.astype(float)
+    with_sum = np.einsum("img,jg->ijm", values, teammate)
+    with_games = np.einsum("img,jg->ijm", valid.astype(float), teammate)
+    without_sum = values.sum(axis=2)[:, None, :] - with_sum
+    without_games = valid.sum(axis=2)[:, None, :] - with_games
+    with np.errstate(invalid="ignore", divide="ignore"):
+        with_avg = with_sum / with_games
+        without_avg = without_sum / without_games
+
+    # Key teammates: best points averages among regulars
+    regular = played.sum(axis=1) * 2 >= len(order)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        points = np.where(regular, values[:, _POINTS].sum(axis=1) / valid[:, _POINTS].sum(axis=1), np.nan)
+    ranked = [i for i in np.argsort(-np.nan_to_num(points, nan=-np.inf)) if not np.isnan(points[i])]
+
+    return TeamSplits(
+        player_ids=player_ids,
+        game_ids=tuple(order),
+        played=played,
+        with_avg=with_avg,
+        without_avg=without_avg,
+        without_games=without_games.astype(int),
+        key=tuple(player_ids[i] for i in ranked[:KEY_TEAMMATES]),
+        rows=rows,
+    )
+
+
+class TeammateSplitIndex:
+    """Per-team box scores and lazily rebuilt with / without splits."""
+
+    def __init__(self):
+        self._games: Dict[str, TeamGames] = {}
+        self._seen: Set[str] = set()
+        self._splits: Dict[str, TeamSplits] = {}
+
+    def __contains__(self, game_id: Any) -> bool:
+        return str(game_id) in self._seen
+
+    def record_box_score(self, game_id: Any, box_score: Sequence[Dict]) -> None:
+        self.record_box_scores({game_id: box_score})
+
+    def record_box_scores(self, box_scores: Dict[Any, Sequence[Dict]]) -> None:
+        """Add final games (already-recorded games are skipped)."""
+        for game_id, box_score in box_scores.items():
+            game_id = str(game_id)
+            if game_id in self._seen:
+                continue
+            self._seen.add(game_id)
+            for stat in box_score:
+                player_id = stat.get("player", {}).get("id")
+                team_id = stat.get("team", {}).get("id")
+                if player_id is None or team_id is None or _did_not_play(stat):
+                    continue
+                team = self._games.setdefault(str(team_id), {})
+                day = (stat.get("game", {}).get("date") or "")[:10]
+                team.setdefault(game_id, (day, {}))[1][str(player_id)] = extract_stat_row(stat)
+                self._splits.pop(str(team_id), None)
+
+    def splits(self, team_id: Any) -> Optional[TeamSplits]:
+        """The team's splits (rebuilt if a game was recorded since)."""
+        team_id = str(team_id)
+        splits = self._splits.get(team_id)
+        if splits is None and team_id in self._games:
+            splits = self._splits[team_id] = build_team_splits(self._games[team_id])
+        return splits
+
+    def impact(
+        self,
+        team_id: Any,
+        player_id: Optional[Any] = None,
+        market: str = "points",
+        out: Optional[Iterable[Any]] = None
+    ) -> TeammateImpact:
+        """
+        Key teammates out for a player, and the player's deltas without them.
+
+        Args:
+            player_id: None for team bets (no deltas)
+            out: Players out tonight (default: key teammates who missed the
+                 team's latest game)
+        """
+        splits = self.splits(team_id)
+        if splits is None:
+            return TeammateImpact(key_out=(), star_out=False, deltas={})
+        player_id = None if player_id is None else str(player_id)
+        absent = splits.missed_latest() if out is None else {str(p) for p in out}
+        key_out = tuple(p for p in splits.key if p in absent and p != player_id)
+        deltas = {}
+        for teammate in key_out if player_id is not None else ():
+            delta = splits.delta(player_id, teammate, market)
+            if delta is not None:
+                deltas[teammate] = delta
+        return TeammateImpact(
+            key_out=key_out,
+            star_out=splits.star in key_out,
+            deltas=deltas,
+        )
+
+    def clear(self) -> None:
+        self._games.clear()
+        self._seen.clear()
+        self._splits.clear()
+
+
+def _did_not_play(stat: Dict) -> bool:
+    """No minutes recorded as played (a missing minutes field counts as played)."""
+    minutes = extract_usage_row(stat)[0]
+    return minutes == 0
+
+
+# Global index instance
+teammate_splits = TeammateSplitIndex()
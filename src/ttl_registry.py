@@ -0,0 +1,179 @@
+"""
+NBABot v11 — Bounded TTL Registry
+
+ADDED FOR: Parlay / leg cache eviction
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Every entry expires `ttl_seconds` after its last access (sliding TTL,
+  matching how a discord.py View timeout resets on each interaction)
+- The registry never holds more than `max_entries` items (LRU eviction)
+- Expired entries are purged lazily on write, so reads stay O(1)
+- An optional on_evict(key, value) hook hears every expiry and capacity
+  eviction (not pop / clear), so owners can drop what they keyed on it
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLRegistry(Generic[V]):
+    """
+    Size-capped, TTL-evicting key/value registry.
+
+    Entries are kept in last-access order. Because the TTL is the same for
+    every entry, the oldest entries are always at the front, so expiry and
+    capacity eviction both pop from the left.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        max_entries: int,
+        on_evict: Optional[Callable[[Hashable, V], None]] = None
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+        # Counters (reported by stats())
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    # ==================== CORE API ====================
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Insert or refresh an entry, evicting expired / excess entries."""
+        now = time.monotonic()
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        self._purge_expired(now)
+
+        while len(self._entries) > self.max_entries:
+            old_key, (_, old_value) = self._entries.popitem(last=False)
+            self.evicted += 1
+            self._notify(old_key, old_value)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Get an entry and refresh its TTL. Returns None if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        now = time.monotonic()
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            self._notify(key, value)
+            return None
+
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove an entry, returning its value if present."""
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries. Returns number removed."""
+        return self._purge_expired(time.monotonic())
+
+    def clear(self) -> None:
+        """Remove every entry (counters are kept)."""
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def values(self) -> Iterator[V]:
+        """Iterate over live (non-expired) values without refreshing TTLs."""
+        now = time.monotonic()
+        for expires_at, value in list(self._entries.values()):
+            if expires_at > now:
+                yield value
+
+    # ==================== STATS ====================
+
+    def stats(self, include_size: bool = True) -> Dict[str, Any]:
+        """
+        Get registry statistics.
+
+        `approx_bytes` walks the stored objects, so it costs O(entries);
+        pass include_size=False on hot paths.
+        """
+        self.purge_expired()
+        lookups = self.hits + self.misses
+        result = {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+        if include_size:
+            seen = set()
+            size = sys.getsizeof(self._entries)
+            for key, (_, value) in self._entries.items():
+                size += _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+            result["approx_bytes"] = size
+        return result
+
+    # ==================== HELPERS ====================
+
+    def _purge_expired(self, now: float) -> int:
+        removed = 0
+        while self._entries:
+            _, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            key, (_, value) = self._entries.popitem(last=False)
+            removed += 1
+            self._notify(key, value)
+        self.expired += removed
+        return removed
+
+    def _notify(self, key: Hashable, value: V) -> None:
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+
+def _deep_sizeof(obj: Any, seen: set) -> int:
+    """Approximate deep size of plain containers and dataclasses."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        size += sum(_deep_sizeof(getattr(obj, f.name, None), seen) for f in fields(obj))
+    return size
@@ -0,0 +1,217 @@
+"""
+NBABot v11 — Usage / Assist Rates
+
+ADDED FOR: Per-game usage and assist rate series for analyze_role
+DOES NOT MODIFY EXISTING LOGIC
+
+Core Rules:
+- Every box score is joined to its team's per-game totals (summed from
+  the same box score), so a game's rates never depend on other games
+- Rates for many games are computed in one NumPy pass: rows are grouped
+  by (game, team), team totals summed with np.add.at, then every
+  player's rates are column arithmetic
+- Usage rate    = 100 × (FGA + 0.44 × FTA + TOV) × (team MIN / 5)
+                  / (MIN × (team FGA + 0.44 × team FTA + team TOV))
+- Assist rate   = 100 × AST / ((MIN / (team MIN / 5)) × team FGM − FGM)
+- A missing turnover count is treated as 0; a game with no minutes (or
+  a zero denominator) is skipped for that player
+- Box scores come from box-score ingest as games go final, and from its
+  backfill of the slate teams' recent games
+- Role analyses are cached per player until a new game is recorded
+- Entity IDs are keyed as strings (Selection IDs are strings)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config import ROLE_HISTORY_GAMES
+from player_status import RoleAnalysis, analyze_role
+
+# Per-game columns pulled from the player statistics payload
+USAGE_COLUMNS = ("minutes", "fgm", "fga", "fta", "turnovers", "assists")
+
+# Payload keys tried for each column: (key, sub-key) — first present wins
+USAGE_KEYS: Dict[str, Tuple[Tuple[str, Optional[str]], ...]] = {
+    "minutes": (("minutes", None), ("min", None)),
+    "fgm": (("field_goals", "total"), ("fgm", None)),
+    "fga": (("field_goals", "attempts"), ("fga", None)),
+    "fta": (("freethrows_goals", "attempts"), ("fta", None)),
+    "turnovers": (("turnovers", None), ("tov", None)),
+    "assists": (("assists", None),),
+}
+
+_MIN, _FGM, _FGA, _FTA, _TOV, _AST = range(len(USAGE_COLUMNS))
+
+# (date, game_id, usage rate, assist rate)
+RateRow = Tuple[str, Any, float, float]
+
+
+# ============================================
+# EXTRACTION
+# ============================================
+
+def extract_usage_row(stat: Dict[str, Any]) -> Tuple[float, ...]:
+    """One USAGE_COLUMNS row from a player statistics entry (NaN = missing)."""
+    row = []
+    for name in USAGE_COLUMNS:
+        value = None
+        for key, part in USAGE_KEYS[name]:
+            if key in stat:
+                value = stat[key]
+                if part is not None:
+                    value = value.get(part) if isinstance(value, dict) else None
+                break
+        if name == "minutes":
+            value = _parse_minutes(value)
+        elif value is None and name == "turnovers":
+            value = 0
+        row.append(float(value) if value is not None else float("nan"))
+    return tuple(row)
+
+
+def _parse_minutes(value: Any) -> Optional[float]:
+    """Minutes as a number ("32:15" → 32.25)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and ":" in value:
+        minutes, _, seconds = value.partition(":")
+        try:
+            return int(minutes) + int(seconds or 0) / 60
+        except ValueError:
+            return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# ============================================
+# JOIN (BULK)
+# ============================================
+
+def compute_rates(
+    game_ids: Sequence[Any],
+    team_ids: Sequence[Any],
+    rows: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Usage and assist rates for box-score rows from any number of games.
+
+    Args:
+        game_ids, team_ids: The game and team of each row
+        rows: (n, USAGE_COLUMNS) player rows
+
+    Returns:
+        (usage, assist) arrays of shape (n,), NaN where undefined
+    """
+    rows = np.asarray(rows, dtype=float).reshape(len(game_ids), len(USAGE_COLUMNS))
+    keys = [f"{g}\x00{t}" for g, t in zip(game_ids, team_ids)]
+    _, group = np.unique(np.asarray(keys, dtype=object), return_inverse=True)
+    group = group.reshape(-1)
+
+    # Team totals per (game, team), joined back to each row
+    totals = np.zeros((group.max() + 1 if len(group) else 0, len(USAGE_COLUMNS)))
+    np.add.at(totals, group, np.nan_to_num(rows))
+    team = totals[group]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        possessions = rows[:, _FGA] + 0.44 * rows[:, _FTA] + rows[:, _TOV]
+        team_possessions = team[:, _FGA] + 0.44 * team[:, _FTA] + team[:, _TOV]
+        share = rows[:, _MIN] / (team[:, _MIN] / 5)
+        usage = 100 * possessions / (share * team_possessions)
+        assist = 100 * rows[:, _AST] / (share * team[:, _FGM] - rows[:, _FGM])
+
+    played = rows[:, _MIN] > 0
+    usage = np.where(played & np.isfinite(usage), usage, np.nan)
+    assist = np.where(played & np.isfinite(assist) & (assist >= 0), assist, np.nan)
+    return usage, assist
+
+
+# ============================================
+# STORE
+# ============================================
+
+class UsageRateStore:
+    """Per-player usage / assist rate series, most recent first."""
+
+    def __init__(self, depth: int = ROLE_HISTORY_GAMES):
+        self.depth = depth
+        self._games: Set[str] = set()
+        self._series: Dict[str, List[RateRow]] = {}
+        self._roles: Dict[str, RoleAnalysis] = {}
+
+    def __contains__(self, game_id: Any) -> bool:
+        return str(game_id) in self._games
+
+    # ==================== RECORDING ====================
+
+    def record_box_score(self, game_id: Any, box_score: Sequence[Dict]) -> int:
+        """Record one final game's box score. Returns players updated."""
+        return self.record_box_scores({game_id: box_score})
+
+    def record_box_scores(self, box_scores: Dict[Any, Sequence[Dict]]) -> int:
+        """Record many games in one join (already-recorded games are skipped)."""
+        game_ids, team_ids, player_ids, dates, rows = [], [], [], [], []
+        for game_id, box_score in box_scores.items():
+            if game_id in self:
+                continue
+            self._games.add(str(game_id))
+            for stat in box_score:
+                player_id = stat.get("player", {}).get("id")
+                team_id = stat.get("team", {}).get("id")
+                if player_id is None or team_id is None:
+                    continue
+                game_ids.append(str(game_id))
+                team_ids.append(str(team_id))
+                player_ids.append(str(player_id))
+                dates.append(stat.get("game", {}).get("date", "") or "")
+                rows.append(extract_usage_row(stat))
+        if not rows:
+            return 0
+
+        usage, assist = compute_rates(game_ids, team_ids, np.asarray(rows))
+        updated = set()
+        for i, player_id in enumerate(player_ids):
+            if np.isnan(usage[i]) or np.isnan(assist[i]):
+                continue
+            series = self._series.setdefault(player_id, [])
+            series.append((dates[i], game_ids[i], float(usage[i]), float(assist[i])))
+            updated.add(player_id)
+        for player_id in updated:
+            series = self._series[player_id]
+            series.sort(key=lambda r: r[0], reverse=True)
+            del series[self.depth:]
+            self._roles.pop(player_id, None)
+        return len(updated)
+
+    def clear(self) -> None:
+        self._games.clear()
+        self._series.clear()
+        self._roles.clear()
+
+    # ==================== QUERIES ====================
+
+    def usage_rates(self, player_id: Any) -> List[float]:
+        return [r[2] for r in self._series.get(str(player_id), ())]
+
+    def assist_rates(self, player_id: Any) -> List[float]:
+        return [r[3] for r in self._series.get(str(player_id), ())]
+
+    def analyze_role(self, player_id: Any) -> RoleAnalysis:
+        """analyze_role over the player's series (cached until a new game)."""
+        player_id = str(player_id)
+        role = self._roles.get(player_id)
+        if role is None:
+            role = self._roles[player_id] = analyze_role(
+                self.assist_rates(player_id), self.usage_rates(player_id)
+            )
+        return role
+
+    def analyze_roles(self, player_ids: Iterable[Any]) -> Dict[str, RoleAnalysis]:
+        """Role analysis for a whole slate of players."""
+        return {str(p): self.analyze_role(p) for p in player_ids}
+
+
+# Global instance
+usage_rates = UsageRateStore()
@@ -0,0 +1,22 @@
+"""
+Shared test setup.
+
+Modules under src/ import each other by bare name, so src/ goes on the
+path; config is read at import time, so the environment is set first.
+"""
+
+import os
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+os.environ.setdefault("MOCK_MODE", "true")
+os.environ.setdefault("COMPUTE_BACKEND", "inline")
+os.environ.setdefault("PARLAY_STORE_PATH", ":memory:")
+os.environ.setdefault("INJURY_FEED_SOURCE", "")
+
+# bot.py, buttons.py and parlay_store.py import the engine as `parlay_engine`
+import parlay_engine_v10_legacy  # noqa: E402
+
+sys.modules.setdefault("parlay_engine", parlay_engine_v10_legacy)
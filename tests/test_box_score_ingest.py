@@ -0,0 +1,86 @@
+import asyncio
+
+from api_client import api_client
+from box_score_ingest import BoxScoreIngest
+from game_log_index import game_log_index
+from rolling_stats import TEAM, RollingStatsStore, team_row
+
+from tests.test_game_log_index import GAMES, result
+
+
+def test_final_game_extends_loaded_logs_in_place():
+    store = RollingStatsStore()
+    ingest = BoxScoreIngest(api_client, store)
+    team_id = 14
+    game_log_index.load_team(team_id, GAMES, [result(g) for g in GAMES])
+    store.seed(TEAM, team_id, [(g["id"], team_row(result(g))) for g in GAMES])
+    log = game_log_index.get(TEAM, team_id)
+
+    final = {
+        "id": 6, "date": "2026-01-10T19:30:00", "status": {"short": "FT"},
+        "teams": {"home": {"id": 22}, "away": {"id": team_id}},
+        "scores": {"home": {"total": 103}, "away": {"total": 111}},
+    }
+    try:
+        assert asyncio.run(ingest.ingest_game(final)) >= 1
+        assert game_log_index.get(TEAM, team_id) is log      # Not dropped
+        assert len(log) == len(GAMES) + 1
+        assert log.meta[0].game_id == 6 and not log.meta[0].is_home
+        assert store.get(TEAM, team_id).game_ids[0] == 6
+    finally:
+        game_log_index.clear()
+
+
+class ScheduleAPI:
+    """Games per date; today's date is whatever poll() is given."""
+
+    def __init__(self, today):
+        self.today = today
+        self.by_date = {}
+        self.requested = []
+
+    async def get_games_today(self):
+        return self.get(self.today)
+
+    async def get_games_by_date(self, day):
+        self.requested.append(day)
+        return self.get(day)
+
+    def get(self, day):
+        return self.by_date.get(day, [])
+
+    def parse_game_result(self, game, team_id):
+        return api_client.parse_game_result(game, team_id)
+
+    async def get_game_player_stats(self, game_id):
+        return []
+
+    def invalidate_cache(self, endpoint, **params):
+        return 0
+
+
+def test_poll_picks_up_games_that_went_final_after_midnight():
+    from datetime import date
+
+    def listed(game_id, status):
+        return {
+            "id": game_id, "date": "2026-01-10T23:00:00", "status": {"short": status},
+            "teams": {"home": {"id": 30}, "away": {"id": 31}},
+            "scores": {"home": {"total": 101}, "away": {"total": 99}},
+        }
+
+    api = ScheduleAPI("2026-01-10")
+    ingest = BoxScoreIngest(api, RollingStatsStore())
+    api.by_date["2026-01-10"] = [listed(1, "Q4"), listed(2, "FT")]
+    asyncio.run(ingest.poll(date(2026, 1, 10)))
+    assert api.requested == [] and ingest._ingested == {2}
+
+    # Next day: game 1 is final on yesterday's list, not on today's
+    api.today = "2026-01-11"
+    api.by_date["2026-01-10"] = [listed(1, "FT"), listed(2, "FT")]
+    asyncio.run(ingest.poll(date(2026, 1, 11)))
+    assert api.requested == ["2026-01-10"] and ingest._ingested == {1, 2}
+
+    # Nothing pending: yesterday is not fetched again
+    asyncio.run(ingest.poll(date(2026, 1, 12)))
+    assert api.requested == ["2026-01-10"]
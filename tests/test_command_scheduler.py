@@ -0,0 +1,194 @@
+import asyncio
+import gc
+
+import pytest
+
+from command_scheduler import CommandScheduler, FairQueue, Job, Priority, SchedulerBusy
+
+
+def make_job(key, guild_id="g1", user_id="u1", priority=Priority.INTERACTIVE):
+    return Job(
+        key=key, factory=None, guild_id=guild_id, user_id=user_id,
+        priority=priority, future=None,
+    )
+
+
+def drain(queue):
+    order = []
+    while (job := queue.pop()) is not None:
+        order.append(job.key)
+    return order
+
+
+def test_fair_queue_round_robins_guilds_then_users():
+    queue = FairQueue()
+    for key, guild_id, user_id in [
+        ("a1", "A", "u1"), ("a2", "A", "u1"), ("a3", "A", "u2"),
+        ("b1", "B", "u3"), ("b2", "B", "u3"),
+        ("c1", "C", "u4"),
+    ]:
+        queue.push(make_job(key, guild_id, user_id))
+    assert len(queue) == 6
+    assert queue.guild_depths() == {"A": 3, "B": 2, "C": 1}
+    # Guilds take turns; guild A's users take turns; u1's jobs stay in order
+    assert drain(queue) == ["a1", "b1", "c1", "a3", "b2", "a2"]
+    assert len(queue) == 0
+
+
+async def run_jobs(scheduler, specs):
+    """Submit every (key, guild, user, priority) at once; return run order."""
+    ran = []
+
+    def factory(key):
+        async def run(report):
+            ran.append(key)
+            await asyncio.sleep(0)
+            return key
+        return run
+
+    results = await asyncio.gather(*(
+        scheduler.submit(key, factory(key), guild_id, user_id, priority)
+        for key, guild_id, user_id, priority in specs
+    ))
+    await scheduler.close()
+    return ran, results
+
+
+def test_interactive_runs_before_scheduled_and_guilds_alternate():
+    scheduler = CommandScheduler(workers=1, guild_queue_max=8)
+    ran, results = asyncio.run(run_jobs(scheduler, [
+        ("poll", None, None, Priority.SCHEDULED),
+        ("a1", 1, 10, Priority.INTERACTIVE),
+        ("a2", 1, 10, Priority.INTERACTIVE),
+        ("b1", 2, 20, Priority.INTERACTIVE),
+    ]))
+    assert ran == ["a1", "b1", "a2", "poll"]
+    assert results == ["poll", "a1", "a2", "b1"]
+
+
+def test_identical_jobs_share_one_run():
+    scheduler = CommandScheduler(workers=1)
+    calls = []
+    heard = []
+
+    async def work(report):
+        calls.append(1)
+        report("progress")
+        return 42
+
+    async def main():
+        results = await asyncio.gather(
+            scheduler.submit("same", work, 1, 10, progress=lambda *a: heard.append(("first", a))),
+            scheduler.submit("same", work, 2, 20, progress=lambda *a: heard.append(("second", a))),
+        )
+        stats = scheduler.stats()
+        await scheduler.close()
+        return results, stats
+
+    results, stats = asyncio.run(main())
+    assert results == [42, 42]
+    assert calls == [1]
+    assert stats["deduped"] == 1
+    assert sorted(heard) == [("first", ("progress",)), ("second", ("progress",))]
+
+
+def test_interactive_waiter_promotes_queued_scheduled_job():
+    scheduler = CommandScheduler(workers=1)
+    ran = []
+
+    def factory(key):
+        async def run(report):
+            ran.append(key)
+            return key
+        return run
+
+    async def main():
+        await asyncio.gather(
+            scheduler.submit("s1", factory("s1"), priority=Priority.SCHEDULED),
+            scheduler.submit("shared", factory("shared"), priority=Priority.SCHEDULED),
+            scheduler.submit("i1", factory("i1"), 1, 10),
+            scheduler.submit("shared", factory("shared"), 1, 11),
+        )
+        await scheduler.close()
+
+    asyncio.run(main())
+    assert ran == ["i1", "shared", "s1"]
+
+
+def test_full_guild_queue_raises_busy():
+    scheduler = CommandScheduler(workers=1, guild_queue_max=2)
+
+    async def idle(report):
+        await asyncio.sleep(0)
+
+    async def main():
+        first = [asyncio.create_task(scheduler.submit(k, idle, 1, 10)) for k in ("a", "b")]
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(SchedulerBusy):
+                await scheduler.submit("c", idle, 1, 10)
+            # Other guilds are unaffected
+            await scheduler.submit("d", idle, 2, 20)
+            await asyncio.gather(*first)
+        finally:
+            await scheduler.close()
+
+    asyncio.run(main())
+
+
+def test_failed_job_raises_to_every_waiter():
+    scheduler = CommandScheduler(workers=1)
+
+    async def boom(report):
+        raise ValueError("bad slate")
+
+    async def main():
+        results = await asyncio.gather(
+            scheduler.submit("k", boom, 1, 10),
+            scheduler.submit("k", boom, 2, 20),
+            return_exceptions=True,
+        )
+        await scheduler.close()
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_discard_leaves_round_robin_in_place():
+    queue = FairQueue()
+    jobs = {}
+    for key, guild_id, user_id in [
+        ("a1", "A", "u1"), ("a2", "A", "u2"), ("b1", "B", "u3"), ("b2", "B", "u3"), ("c1", "C", "u4"),
+    ]:
+        jobs[key] = make_job(key, guild_id, user_id)
+        queue.push(jobs[key])
+    assert queue.pop().key == "a1"      # Guild B's turn is next
+
+    assert queue.discard(jobs["b1"]) and queue.discard(jobs["c1"])
+    assert not queue.discard(jobs["c1"])
+    assert len(queue) == 2
+    assert queue.guild_depths() == {"A": 1, "B": 1}
+    assert drain(queue) == ["b2", "a2"]
+
+
+def test_failure_with_no_waiter_left_is_not_reported_unretrieved():
+    scheduler = CommandScheduler(workers=1)
+    reported = []
+
+    async def boom(report):
+        await asyncio.sleep(0)
+        raise ValueError("bad slate")
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: reported.append(context))
+        waiter = asyncio.create_task(scheduler.submit("k", boom, 1, 10))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        await scheduler.close()
+
+    asyncio.run(main())
+    gc.collect()
+    assert reported == []
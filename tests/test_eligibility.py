@@ -0,0 +1,60 @@
+import numpy as np
+
+from eligibility import SortedWindows, find_optimal_line
+from prop_markets import derive_market_series, evaluate_team_props
+from tests.test_prop_markets import LOG, row
+
+VALUES = [28, 31, 19, 26, 33, 24, 29, 22, 35, 27, 30, 18, 25, 32, 21]
+
+
+def brute_hits(values, line, direction):
+    out = []
+    for window in (5, 10, 15):
+        sample = values[:window]
+        if direction == "over":
+            out.append(sum(v > line for v in sample))
+        else:
+            out.append(sum(v < line for v in sample))
+    return tuple(out)
+
+
+def test_hits_match_brute_force():
+    windows = SortedWindows(VALUES)
+    assert windows.games == (5, 10, 15)
+    for line in (17.5, 21.5, 24, 26.5, 30.5, 36):
+        for direction in ("over", "under"):
+            assert windows.hits(line, direction) == brute_hits(VALUES, line, direction)
+
+
+def test_short_series_windows():
+    windows = SortedWindows([10, 12, 14])
+    assert windows.games == (3, 3, 3)
+    assert windows.hits(11) == (2, 2, 2)
+
+
+def test_optimal_over_line_is_most_likely_to_hit():
+    result = SortedWindows(VALUES).optimal_line("over", [17.5, 20.5, 23.5])
+    assert result["line"] == 17.5
+    assert (result["hits_l5"], result["hits_l10"], result["hits_l15"]) == brute_hits(VALUES, 17.5, "over")
+    assert result["pct_l15"] == 1.0
+
+
+def test_optimal_line_none_when_nothing_passes():
+    assert SortedWindows(VALUES).optimal_line("over", [40.5, 45.5]) is None
+    assert SortedWindows([]).optimal_line("over") is None
+
+
+def test_find_optimal_line_matches_kernel():
+    assert find_optimal_line(VALUES, "under") == SortedWindows(VALUES).optimal_line("under")
+
+
+def test_team_batch_counts_the_same_hits_as_the_kernel():
+    logs = [(1, "One", LOG * 3), (2, "Two", tuple(row(p, 4, 7) for p in VALUES))]
+    props = evaluate_team_props(logs, ladder=10)
+    assert props
+    for prop in props:
+        log = logs[prop.player_index][2]
+        base = np.asarray(log, dtype=float).T[None]
+        values = derive_market_series(base, [prop.market])[0, 0].tolist()
+        assert SortedWindows(values).hits(prop.line, prop.direction) == prop.window_hits
+        assert SortedWindows(values).games == prop.window_games
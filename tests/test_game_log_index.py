@@ -0,0 +1,110 @@
+import numpy as np
+
+from game_log_index import ALL, AWAY, BACK_TO_BACK, HOME, REST_1, GameLogIndex, opponent_split
+from prop_markets import extract_stat_row
+from rolling_stats import PLAYER, TEAM
+from schedule_index import Schedule, build_schedule_index
+
+TEAM_ID = 14
+
+
+def game(game_id, day, home_id, away_id, home_score, away_score):
+    return {
+        "id": game_id,
+        "date": f"2026-01-{day:02d}T19:30:00",
+        "teams": {"home": {"id": home_id}, "away": {"id": away_id}},
+        "scores": {"home": {"total": home_score}, "away": {"total": away_score}},
+    }
+
+
+def result(g, team_id=TEAM_ID):
+    home = g["teams"]["home"]["id"] == team_id
+    mine, theirs = (g["scores"]["home"]["total"], g["scores"]["away"]["total"])
+    if not home:
+        mine, theirs = theirs, mine
+    return {
+        "team_score": mine, "opponent_score": theirs, "won": mine > theirs,
+        "margin": mine - theirs, "is_home": home, "total": mine + theirs,
+    }
+
+
+def stat(g, points, rebounds=6, assists=4):
+    return {
+        "game": {"id": g["id"], "date": g["date"]},
+        "points": points, "rebounds": rebounds, "assists": assists,
+        "steals": 1, "blocks": 0, "threes": 2,
+    }
+
+
+# Most recent first
+GAMES = [
+    game(5, 9, TEAM_ID, 20, 112, 104),
+    game(4, 7, 21, TEAM_ID, 99, 108),
+    game(3, 6, TEAM_ID, 22, 120, 118),
+    game(2, 3, 20, TEAM_ID, 101, 95),
+    game(1, 1, TEAM_ID, 23, 117, 110),
+]
+POINTS = [28, 19, 31, 22, 25]
+NEW = game(6, 10, 22, TEAM_ID, 103, 111)
+
+
+def schedule_of(games):
+    schedule = Schedule(api=None)
+    schedule.index = build_schedule_index(games, "2026-01-10")
+    return schedule
+
+
+def loaded(games, points):
+    index = GameLogIndex(schedule_of([NEW, *games]))
+    index.load_team(TEAM_ID, games, [result(g) for g in games])
+    stats = [stat(g, p) for g, p in zip(games, points)]
+    index.load_player(7, TEAM_ID, stats, [extract_stat_row(s) for s in stats])
+    return index
+
+
+def test_append_matches_full_reload():
+    index = loaded(GAMES, POINTS)
+    assert index.append_team(TEAM_ID, NEW, result(NEW))
+    assert index.append_player(7, TEAM_ID, stat(NEW, 33), extract_stat_row(stat(NEW, 33)))
+
+    fresh = loaded([NEW] + GAMES, [33] + POINTS)
+    for kind, entity_id in ((TEAM, TEAM_ID), (PLAYER, 7)):
+        log, expected = index.get(kind, entity_id), fresh.get(kind, entity_id)
+        assert log.meta == expected.meta
+        assert log.series.keys() == expected.series.keys()
+        for name, values in log.series.items():
+            assert np.array_equal(values, expected.series[name], equal_nan=True)
+        assert log.splits == expected.splits
+
+    assert index.get(TEAM, TEAM_ID).meta[0].splits == (AWAY, opponent_split(22), BACK_TO_BACK)
+    assert index.split_record(PLAYER, 7, "points", AWAY, 20.5) == (2, 3)
+    assert index.split(PLAYER, 7, "points", ALL).values[0] == 33
+
+
+def test_append_is_idempotent_and_needs_a_loaded_log():
+    index = loaded(GAMES, POINTS)
+    assert not index.append_team(TEAM_ID, GAMES[0], result(GAMES[0]))
+    assert not index.append_team(99, NEW, result(NEW, 99))
+    assert not index.append_player(8, TEAM_ID, stat(NEW, 10), extract_stat_row(stat(NEW, 10)))
+    assert len(index.get(TEAM, TEAM_ID)) == len(GAMES)
+
+
+def test_kernels_rebuild_after_append():
+    index = loaded(GAMES, POINTS)
+    assert index.split_record(TEAM, TEAM_ID, "won", HOME, 0.5) == (3, 3)
+    index.append_team(TEAM_ID, NEW, result(NEW))
+    assert index.split_record(TEAM, TEAM_ID, "won", ALL, 0.5) == (5, 6)
+    assert index.split_record(TEAM, TEAM_ID, "won", REST_1, 0.5) == (1, 2)
+
+
+def test_rest_splits_come_from_the_schedule_index():
+    # Day 9 after day 7: one day off; day 7 after day 6: back-to-back
+    index = loaded(GAMES, POINTS)
+    assert [g.rest_days for g in index.get(TEAM, TEAM_ID).meta] == [1, 0, 2, 1, None]
+
+    # Schedule not built yet: no rest splits
+    bare = GameLogIndex(Schedule(api=None))
+    bare.load_team(TEAM_ID, GAMES, [result(g) for g in GAMES])
+    log = bare.get(TEAM, TEAM_ID)
+    assert all(g.rest_days is None for g in log.meta)
+    assert REST_1 not in log.splits and BACK_TO_BACK not in log.splits
@@ -0,0 +1,53 @@
+import statistics
+
+from hit_rates import HitRateKernel
+
+VALUES = [31, 18, 25, 22, 40, 12, 27, 19, 24, 30, 21, 16]
+
+
+def test_windows_match_slices():
+    kernel = HitRateKernel(VALUES)
+    for window in (5, 10, 15, None):
+        sample = VALUES[:window] if window else VALUES
+        assert kernel.games(window) == len(sample)
+        assert kernel.total(window) == sum(sample)
+        assert kernel.average(window) == sum(sample) / len(sample)
+        assert kernel.mean(window) == statistics.mean(sample)
+
+
+def test_hits_and_rates_per_direction():
+    kernel = HitRateKernel(VALUES)
+    for window in (5, 10, None):
+        sample = VALUES[:window] if window else VALUES
+        assert kernel.hits(22.5, window) == sum(v > 22.5 for v in sample)
+        assert kernel.hits(22.5, window, "under") == sum(v < 22.5 for v in sample)
+        assert kernel.rate(22.5, window) == sum(v > 22.5 for v in sample) / len(sample)
+
+
+def test_line_equal_to_value_is_neither_over_nor_under():
+    kernel = HitRateKernel([20, 20, 21])
+    assert kernel.hits(20) == 1
+    assert kernel.hits(20, direction="under") == 0
+
+
+def test_empty_series():
+    kernel = HitRateKernel([])
+    assert len(kernel) == 0
+    assert kernel.average(5) == 0
+    assert kernel.mean() == 0
+    assert kernel.rate(10.5) == 0
+
+
+def test_mean_is_the_float_average():
+    kernel = HitRateKernel([10, 20, 30, 2.5])
+    assert kernel.mean(3) == 20.0
+    assert kernel.mean() == kernel.average() == sum([10, 20, 30, 2.5]) / 4
+
+
+def test_hits_on_repeated_values_and_unsorted_windows():
+    kernel = HitRateKernel([5, 9, 5, 1, 5, 9, 7])
+    for window in (1, 3, 5, None):
+        sample = kernel.values[:window] if window else kernel.values
+        for line in (0, 1, 4.5, 5, 7, 9, 10):
+            assert kernel.hits(line, window) == sum(v > line for v in sample)
+            assert kernel.hits(line, window, "under") == sum(v < line for v in sample)
@@ -0,0 +1,59 @@
+from injury_feed import StatusEntry, diff_snapshots, parse_report
+from player_status import PlayerStatus
+
+
+def entry(player_id, status, team_id="14", gtd=False):
+    return StatusEntry(
+        player_id=player_id, player_name=f"Player {player_id}", team_id=team_id,
+        status=status, game_time_decision=gtd,
+    )
+
+
+def by_player(changes):
+    return {change.player_id: change for change in changes}
+
+
+def test_unchanged_snapshot_has_no_changes():
+    snapshot = {"1": entry("1", PlayerStatus.OUT)}
+    assert diff_snapshots(snapshot, dict(snapshot)) == []
+
+
+def test_added_changed_and_dropped_players():
+    old = {
+        "1": entry("1", PlayerStatus.QUESTIONABLE),
+        "2": entry("2", PlayerStatus.OUT, team_id="20"),
+    }
+    new = {
+        "1": entry("1", PlayerStatus.OUT),
+        "3": entry("3", PlayerStatus.DOUBTFUL),
+    }
+    changes = by_player(diff_snapshots(old, new))
+    assert set(changes) == {"1", "2", "3"}
+
+    assert (changes["1"].old, changes["1"].new) == (PlayerStatus.QUESTIONABLE, PlayerStatus.OUT)
+    assert changes["1"].entry == new["1"]
+
+    # Dropped from the report: back to active, team kept for invalidation
+    assert (changes["2"].old, changes["2"].new) == (PlayerStatus.OUT, PlayerStatus.ACTIVE)
+    assert changes["2"].team_id == "20"
+    assert changes["2"].entry is None
+
+    assert (changes["3"].old, changes["3"].new) == (PlayerStatus.ACTIVE, PlayerStatus.DOUBTFUL)
+
+
+def test_note_only_change_is_reported():
+    old = {"1": entry("1", PlayerStatus.QUESTIONABLE)}
+    new = {"1": entry("1", PlayerStatus.QUESTIONABLE, gtd=True)}
+    [change] = diff_snapshots(old, new)
+    assert change.old == change.new == PlayerStatus.QUESTIONABLE
+    assert change.entry.game_time_decision
+
+
+def test_parse_report_keys_by_string_id():
+    snapshot = parse_report({"response": [
+        {"player_id": 7, "player_name": "A", "team_id": 14, "status": "Out"},
+        {"player_name": "No id"},
+    ]})
+    assert list(snapshot) == ["7"]
+    assert snapshot["7"].team_id == "14"
+    assert snapshot["7"].status == PlayerStatus.OUT
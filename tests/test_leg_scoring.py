@@ -0,0 +1,138 @@
+import asyncio
+
+from confidence_engine import POSITIVE_MODIFIERS, ContextFlag, context_mask
+from leg_scoring import alt_line_consistency, confidence_detail, confidence_inputs, score_legs
+from opponent_allowed import build_allowed_matrix, opponent_allowed
+from parlay_engine import (
+    ParlayEngine, TeamInputs, build_game_total_leg, build_moneyline_leg,
+    build_player_prop_legs, build_team_total_leg, intern_matchup,
+)
+from player_pool import player_pool
+from tests.test_game_log_index import GAMES, loaded
+from tests.test_prop_markets import LOG
+
+MATCHUP = intern_matchup("Home", "Away", "2001")
+
+
+def team(team_id, name, players=()):
+    return TeamInputs(
+        team_id=team_id, team_name=name,
+        won=(True, True, False, True, True), margins=(8, 3, -4, 11, 6),
+        totals=(221, 215, 230, 208, 226), scores=(114, 109, 113, 110, 116),
+        players=players,
+    )
+
+
+def box_score(game_id, date, minutes):
+    return [{
+        "player": {"id": 7}, "team": {"id": 21}, "game": {"id": game_id, "date": date},
+        "minutes": minutes, "field_goals": {"total": 6, "attempts": 12},
+        "freethrows_goals": {"attempts": 4}, "turnovers": 2, "assists": 5,
+    }]
+
+
+def fresh_engine(monkeypatch):
+    import leg_scoring
+    monkeypatch.setattr(leg_scoring, "parlay_engine", ParlayEngine())
+
+
+def test_team_leg_inputs_come_from_the_matchup():
+    home = build_moneyline_leg(MATCHUP, team("21", "Home"), 5)
+    away = build_moneyline_leg(MATCHUP, team("22", "Away"), 5)
+    total = build_game_total_leg(MATCHUP, team("21", "Home"), "over", 5)
+
+    hit_rate, context = confidence_inputs(home)
+    assert (hit_rate.hits_l5, hit_rate.games_l5) == (4, 5)
+    assert (hit_rate.hits_l15, hit_rate.games_l15) == (4, 5)
+    assert context.is_home and not context.is_road
+    assert not context.minutes_stable
+
+    _, context = confidence_inputs(away)
+    assert context.is_road and not context.is_home
+    _, context = confidence_inputs(total)
+    assert not context.is_home and not context.is_road
+
+
+def test_minutes_stable_from_recorded_box_scores():
+    [prop, *_] = build_player_prop_legs(MATCHUP, team("21", "Home", ((7, "Player", LOG),)), 5)
+    assert not confidence_inputs(prop)[1].minutes_stable
+
+    player_pool.record_box_scores({
+        f"g{i}": box_score(f"g{i}", f"2026-01-{10 + i:02d}", f"{33 + i % 3}:00") for i in range(6)
+    })
+    try:
+        assert confidence_inputs(prop)[1].minutes_stable
+    finally:
+        player_pool.clear()
+
+
+def test_mixed_batch_matches_detail(monkeypatch):
+    fresh_engine(monkeypatch)
+    props = build_player_prop_legs(MATCHUP, team("21", "Home", ((7, "Player", LOG),)), 5)
+    legs = [build_moneyline_leg(MATCHUP, team("21", "Home"), 5), *props]
+
+    scores = asyncio.run(score_legs(legs))
+
+    assert scores == [confidence_detail(leg).score for leg in legs]
+    # 4/5 base plus home advantage
+    assert scores[0] == 62 + POSITIVE_MODIFIERS["home_advantage"]
+    # Cached: scored again without recomputation
+    assert asyncio.run(score_legs(legs)) == scores
+
+
+def test_player_venue_split_overrides_home_advantage(monkeypatch):
+    import leg_scoring
+    prop = next(
+        leg for leg in build_player_prop_legs(MATCHUP, team("14", "Home", ((7, "Player", LOG),)), 5)
+        if leg.selection.prop_type == "points" and leg.selection.direction == "over"
+    )
+    assert context_mask(confidence_inputs(prop)[1]) & ContextFlag.HOME_ADVANTAGE
+
+    # Scores 12 / 14 / 16 at home, 30 on the road: under the line at home
+    monkeypatch.setattr(leg_scoring, "game_log_index", loaded(GAMES, [12, 30, 14, 30, 16]))
+    context = confidence_inputs(prop)[1]
+    assert (context.venue_hit_rate, context.overall_hit_rate) == (0.0, 0.4)
+    assert not context_mask(context) & ContextFlag.HOME_ADVANTAGE
+
+
+def test_favorable_matchup_from_what_the_opponent_allows(monkeypatch):
+    def played(game_id, home, away, home_score, away_score):
+        return {
+            "id": game_id,
+            "teams": {"home": {"id": home[0], "name": home[1]}, "away": {"id": away[0], "name": away[1]}},
+            "scores": {"home": {"total": home_score}, "away": {"total": away_score}},
+        }
+
+    home, away, other = (21, "Home"), (22, "Away"), (23, "Other")
+    games = [
+        played(3, home, away, 130, 100),
+        played(2, other, away, 128, 104),
+        played(1, home, other, 100, 102),
+    ]
+    monkeypatch.setattr(opponent_allowed, "matrix", build_allowed_matrix(games, {}, "2026-01-10"))
+
+    def favorable(team_inputs, direction):
+        leg = build_team_total_leg(MATCHUP, team_inputs, direction, 5)
+        return confidence_inputs(leg)[1].favorable_matchup
+
+    # Away gives up 129 a game against a league average near 111; Home 101
+    assert favorable(team(21, "Home"), "over")
+    assert not favorable(team(21, "Home"), "under")
+    assert not favorable(team(22, "Away"), "over")
+    assert favorable(team(22, "Away"), "under")
+
+
+def test_alt_line_consistency_from_the_projection_engine(monkeypatch):
+    import leg_scoring
+    [over, under] = [
+        leg for leg in build_player_prop_legs(MATCHUP, team("14", "Home", ((7, "Player", LOG),)), 5)
+        if leg.selection.prop_type == "points"
+    ]
+    assert alt_line_consistency([over, under]) == [False, False]
+
+    # Season log clears the over line every game and the under line never
+    points = [over.selection.value + 5] * 5
+    monkeypatch.setattr(leg_scoring, "game_log_index", loaded(GAMES, points))
+    assert alt_line_consistency([over, under]) == [True, False]
+    assert confidence_inputs(over)[1].alt_line_consistent
+    assert not confidence_inputs(under)[1].alt_line_consistent
@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+
+from parlay_engine import (
+    PLAYER, SEARCH_COMPLETE, TEAM, ParlayEngine, SlateSearch, TeamInputs, build_moneyline_leg,
+    intern_matchup,
+)
+from ttl_registry import TTLRegistry
+
+
+def team(team_id, name):
+    return TeamInputs(
+        team_id=team_id, team_name=name,
+        won=(True, True, False, True, True), margins=(8, 3, -4, 11, 6),
+        totals=(221, 215, 230, 208, 226), scores=(114, 109, 113, 110, 116),
+    )
+
+
+def test_entity_index_forgets_evicted_legs():
+    engine = ParlayEngine()
+    engine._cautions = TTLRegistry("c", 60, 2, on_evict=engine._on_context_evict)
+    engine._scores = TTLRegistry("s", 60, 2, on_evict=engine._on_context_evict)
+
+    legs = [
+        build_moneyline_leg(intern_matchup("Home", "Away", str(game_id)), team(str(game_id), "Home"), 5)
+        for game_id in range(1, 6)
+    ]
+    for leg in legs:
+        engine.cache_leg_score(leg, 70)
+
+    assert len(engine._leg_entities) == 2
+    assert set(engine._entity_legs) == {(TEAM, "4"), (TEAM, "5")}
+
+    # A leg held by either registry stays tracked
+    engine._cautions.set(legs[3].id, object())
+    engine.cache_leg_score(legs[0], 70)     # Evicts legs[3]'s score only
+    assert (TEAM, "4") in engine._entity_legs
+
+    assert engine.invalidate_entity(TEAM, "4") == 1
+    assert (TEAM, "4") not in engine._entity_legs
+    assert legs[3].id not in engine._leg_entities
+    assert engine.invalidate_entity(PLAYER, "nobody") == 0
+
+
+def test_generate_parlay_skips_excluded_legs(monkeypatch):
+    engine = ParlayEngine()
+    legs = [
+        build_moneyline_leg(intern_matchup("Home", "Away", str(game_id)), team(str(game_id), "Home"), 5)
+        for game_id in range(1, 6)
+    ]
+    excluded = {legs[0].id, legs[2].id}
+    games = [{"id": game_id} for game_id in range(1, 6)]
+
+    async def games_today():
+        return games
+
+    async def attach_cautions(candidates, slate):
+        assert slate is games
+        for leg in candidates:
+            leg.caution = SimpleNamespace(should_exclude=leg.id in excluded)
+        return candidates
+
+    async def search_slate(slate, ladder, deadline=None, enough=None):
+        search = SlateSearch(legs, len(slate), len(slate), len(slate), len(slate), SEARCH_COMPLETE, 0.0)
+        await enough(search)
+        return search
+
+    monkeypatch.setattr(engine, "api", SimpleNamespace(get_games_today=games_today))
+    monkeypatch.setattr(engine, "attach_cautions", attach_cautions)
+    monkeypatch.setattr(engine, "search_slate", search_slate)
+
+    parlay = asyncio.run(engine.generate_parlay(3, 10.0, ladder=5))
+    assert {leg.id for leg in parlay.legs} == {legs[1].id, legs[3].id, legs[4].id}
+    assert asyncio.run(engine.generate_parlay(4, 10.0, ladder=5)) is None
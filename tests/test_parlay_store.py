@@ -0,0 +1,64 @@
+import pytest
+
+from parlay_engine import LEG_CODEC, Odds, Parlay
+from parlay_store import (
+    CODEC_VERSION, ParlayStore, UnsupportedCodecVersion, _pack, decode_leg,
+    encode_leg,
+)
+from tests.test_serializer import make_leg
+
+
+def test_leg_blob_round_trip():
+    leg = make_leg()
+    assert decode_leg(encode_leg(leg)) == leg
+
+
+def test_newer_rows_are_rejected():
+    blob = _pack([CODEC_VERSION + 1, LEG_CODEC.to_row(make_leg())])
+    with pytest.raises(UnsupportedCodecVersion):
+        decode_leg(blob)
+
+
+def make_parlay(parlay_id, legs, created_at="2026-01-15T12:00:00"):
+    return Parlay(
+        id=parlay_id, legs=legs, leg_count=len(legs), wager=10.0, ladder=5,
+        total_odds=264, total_odds_decimal=3.64, potential_win=36.4,
+        created_at=created_at, user_id="u1", guild_id="g1",
+    )
+
+
+def test_repriced_leg_does_not_overwrite_older_parlays():
+    store = ParlayStore(":memory:")
+    first, second = make_leg(), make_leg()
+    second.odds = Odds(american=-135)
+    assert first.id == second.id
+
+    store.save_parlay(make_parlay("parlay_a", [first]))
+    store.save_parlay(make_parlay("parlay_b", [second]))
+    store._parlay_cache.clear()
+    store._leg_cache.clear()
+
+    assert store.get_parlay("parlay_a").legs[0].odds.american == -110
+    assert store.get_parlay("parlay_b").legs[0].odds.american == -135
+    assert store.get_leg(first.id).odds.american == -135     # Latest copy
+    assert store.stats()["stored_legs"] == 2
+
+
+def test_prune_drops_old_parlays_and_their_legs():
+    store = ParlayStore(":memory:")
+    store.save_parlay(make_parlay("parlay_old", [make_leg()], created_at="2000-01-01T00:00:00"))
+    store.save_parlay(make_parlay("parlay_new", [make_leg(-6.5)], created_at="2999-01-01T00:00:00"))
+    assert store.prune(30) == 1
+    assert store.stats()["stored_legs"] == 1
+    assert [p.id for p in store.get_parlays_for_user("u1")] == ["parlay_new"]
+
+
+def test_global_store_opens_once_on_demand():
+    import parlay_store
+
+    parlay_store.close_store()
+    assert parlay_store._store is None
+    store = parlay_store.open_store()
+    assert parlay_store.open_store() is store
+    parlay_store.close_store()
+    assert parlay_store._store is None
@@ -0,0 +1,47 @@
+import random
+
+from projection_engine import ProjectionEngine
+
+LOGS = [
+    [31, 18, 25, 22, 40, 12, 27, 19, 24, 30, 21, 16],
+    [8, 11, 9, 10, 12],
+    [4.5, 6, 7, 3, 5, 9, 6, 8, 4, 7, 5, 6, 3, 10, 2, 9],
+]
+LADDERS = [
+    [20.5, 22.5, 24.5, 26.5],
+    [7.5, 8.5, 9.5],
+    [2.5, 4.5, 6.5, 8.5, 3.5],
+]
+
+
+def assert_matches_scalar(engine, logs, ladders, directions):
+    batch = engine.analyze_many(logs, ladders, directions)
+    for r, (log, ladder, direction) in enumerate(zip(logs, ladders, directions)):
+        scalar = engine.analyze_player_prop(log, ladder, direction)
+        assert batch.analyses[r] == scalar.all_lines_analyzed
+        assert batch.best[r].line == scalar.selected_line
+
+
+def test_batch_matches_scalar_per_row():
+    engine = ProjectionEngine()
+    for direction in ("over", "under"):
+        assert_matches_scalar(engine, LOGS, LADDERS, [direction] * len(LOGS))
+    assert_matches_scalar(engine, LOGS, LADDERS, ["over", "under", "over"])
+
+
+def test_batch_matches_scalar_on_random_rows():
+    rng = random.Random(35)
+    logs, ladders, directions = [], [], []
+    for _ in range(300):
+        logs.append([rng.randint(0, 40) for _ in range(rng.randint(5, 20))])
+        ladders.append([rng.randint(0, 40) + 0.5 for _ in range(rng.randint(1, 6))])
+        directions.append(rng.choice(("over", "under")))
+    assert_matches_scalar(ProjectionEngine(), logs, ladders, directions)
+
+
+def test_one_direction_for_every_row_and_empty_batch():
+    engine = ProjectionEngine()
+    assert engine.analyze_many(LOGS, LADDERS, "under") == engine.analyze_many(
+        LOGS, LADDERS, ["under"] * len(LOGS)
+    )
+    assert engine.analyze_many([], []).best == []
@@ -0,0 +1,42 @@
+import math
+
+from prop_markets import BASE_STATS, evaluate_team_props, format_prop_label
+
+
+def row(points, rebounds, assists, steals=1, blocks=0, threes=2):
+    return (points, rebounds, assists, steals, blocks, threes, math.nan, math.nan)
+
+
+# Double-double in 2 of 5 games
+LOG = (
+    row(24, 11, 4), row(18, 6, 5), row(22, 7, 10), row(15, 5, 3), row(27, 8, 6),
+)
+
+
+def lines_for(market):
+    props = evaluate_team_props([(1, "Player One", LOG)], ladder=5)
+    return [p for p in props if p.market == market]
+
+
+def test_binary_markets_offer_yes_only():
+    for market in ("double_double", "triple_double"):
+        lines = lines_for(market)
+        assert [p.direction for p in lines] == ["over"]
+        assert lines[0].line == 0.5
+    [double] = lines_for("double_double")
+    assert double.hits == 2 and double.outcomes == [1, 0, 1, 0, 0]
+
+
+def test_counting_markets_offer_both_directions():
+    lines = lines_for("points")
+    assert [p.direction for p in lines] == ["over", "under"]
+    average = sum(r[BASE_STATS.index("points")] for r in LOG) / len(LOG)
+    assert [p.line for p in lines] == [round(average - 1.5, 1), round(average + 1.5, 1)]
+
+
+def test_markets_without_data_are_skipped():
+    assert lines_for("first_quarter_points") == []
+
+
+def test_binary_label():
+    assert format_prop_label("Player One", "double_double", "over", 0.5) == "Player One Double-Double: Yes"
@@ -0,0 +1,14 @@
+import random
+
+from parlay_engine import Odds, generate_realistic_odds
+
+
+def test_mid_band_odds_skip_the_empty_band_in_proportion():
+    random.seed(7)
+    draws = [generate_realistic_odds("moneyline", 7, 10) for _ in range(4000)]
+    assert all(-140 <= odds <= -100 or 100 <= odds <= 110 for odds in draws)
+    assert all(Odds(american=odds).decimal > 1 for odds in set(draws))
+    # -140..-100 is 41 prices, +100..+110 is 11: neither end is piled up
+    underdogs = sum(odds > 0 for odds in draws) / len(draws)
+    assert 0.17 < underdogs < 0.25
+    assert draws.count(-100) < 0.05 * len(draws)
@@ -0,0 +1,60 @@
+import math
+
+import pytest
+
+from rolling_stats import (
+    PLAYER, ROLLING_DEPTH, TEAM, TEAM_STATS, RollingStatsStore, player_row, team_row,
+)
+from tests.test_game_log_index import GAMES, result
+
+
+def seeded(store, count):
+    # Most recent first: game ids count - 1 … 0
+    games = [(i, {"team_score": 100 + i, "won": i % 2}) for i in reversed(range(count))]
+    return store.seed(TEAM, 14, games)
+
+
+def test_seed_keeps_the_latest_rows_most_recent_first():
+    entity = seeded(RollingStatsStore(), ROLLING_DEPTH + 5)
+    assert len(entity) == ROLLING_DEPTH
+    assert list(entity.game_ids) == list(reversed(range(5, ROLLING_DEPTH + 5)))
+    rows = entity.rows()
+    assert [row[0] for row in rows] == [100.0 + i for i in entity.game_ids]
+    # Missing columns are NaN
+    assert math.isnan(rows[0][TEAM_STATS.index("margin")])
+    assert entity.rows(3) == rows[:3]
+
+
+def test_append_drops_the_oldest_and_notifies():
+    store = RollingStatsStore()
+    changes = []
+    store.subscribe(changes.append)
+    seeded(store, ROLLING_DEPTH)
+
+    assert store.append(TEAM, 14, 99, {"team_score": 120})
+    entity = store.get(TEAM, 14)
+    assert entity.game_ids[0] == 99 and 0 not in entity.game_ids
+    assert entity.rows(1)[0][0] == 120.0
+    assert [(c.entity_id, c.game_id) for c in changes] == [(14, 99)]
+
+    # Already applied / unknown entity
+    assert not store.append(TEAM, 14, 99, {"team_score": 120})
+    assert not store.append(TEAM, 15, 7, {"team_score": 120})
+    assert len(changes) == 1
+
+
+def test_stale_entities_are_not_returned():
+    store = RollingStatsStore(max_age=-1)
+    seeded(store, 3)
+    assert store.get(TEAM, 14) is None
+
+
+def test_rows_from_api_shapes():
+    store = RollingStatsStore()
+    entity = store.seed(TEAM, 14, [(g["id"], team_row(result(g))) for g in GAMES])
+    assert entity.rows(1) == (tuple(float(result(GAMES[0])[c]) for c in TEAM_STATS),)
+
+    player = store.seed(PLAYER, 7, [(1, player_row((24, 11, 4)))])
+    assert player.rows()[0][:3] == (24.0, 11.0, 4.0)
+    with pytest.raises(ValueError):
+        store.seed("coach", 1, [])
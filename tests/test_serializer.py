@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from parlay_engine import (
+    LEG_CODEC, PARLAY_CODEC, HitRate, Leg, Odds, Parlay, Selection, SpreadData,
+    generate_leg_id, intern_matchup,
+)
+from serializer import SchemaCodec
+
+
+def make_leg(value=-4.5, outcomes=(1, 0, 1, 1, 1)):
+    matchup = intern_matchup("Lakers", "Suns", "1001", "2026-01-15", "19:30")
+    selection = Selection(
+        label=f"Lakers {value:+.1f}", value=value, direction="cover",
+        team_name="Lakers", team_id="14",
+    )
+    return Leg(
+        id=generate_leg_id("spread", matchup.game_id, selection, 5),
+        type="spread",
+        matchup=matchup,
+        selection=selection,
+        odds=Odds(american=-110),
+        hit_rate=HitRate(hits=4, games=5, ladder=5),
+        eligible=True,
+        spread_data=SpreadData(spread_value=value, avg_margin=6.4, cover_rate={"covers": 4, "games": 5}),
+        outcomes=list(outcomes),
+    )
+
+
+def test_leg_row_round_trip():
+    leg = make_leg()
+    decoded = LEG_CODEC.from_row(LEG_CODEC.to_row(leg))
+    assert decoded == leg
+    assert decoded.matchup is leg.matchup     # Interned on decode
+
+
+def test_leg_dict_round_trip_skips_runtime_fields():
+    leg = make_leg()
+    leg.confidence = 81
+    data = LEG_CODEC.to_dict(leg)
+    assert "confidence" not in data and "caution" not in data
+    decoded = LEG_CODEC.from_dict(data)
+    assert decoded.confidence is None
+    assert decoded.hit_rate.percentage == leg.hit_rate.percentage
+
+
+def test_shorter_rows_decode_with_defaults():
+    row = LEG_CODEC.to_row(make_leg())
+    decoded = LEG_CODEC.from_row(row[:-1])    # Written before `outcomes` existed
+    assert decoded.outcomes == []
+
+
+def test_parlay_round_trip_with_leg_array():
+    legs = [make_leg(-4.5), make_leg(-6.5, (1, 1, 0, 1, 1))]
+    parlay = Parlay(
+        id="parlay_abc", legs=legs, leg_count=2, wager=10.0, ladder=5,
+        total_odds=264, total_odds_decimal=3.64, potential_win=36.4,
+        created_at="2026-01-15T12:00:00",
+    )
+    assert PARLAY_CODEC.from_row(PARLAY_CODEC.to_row(parlay)) == parlay
+    assert PARLAY_CODEC.from_dict(parlay.to_dict()) == parlay
+
+
+@dataclass
+class Point:
+    x: int
+    y: int = 0
+    tags: List[str] = field(default_factory=list)
+    label: Optional[str] = None
+
+
+def test_schema_property_order_and_unknown_properties():
+    schema = {"properties": {"y": {}, "x": {}, "unknown": {}, "tags": {}}}
+    codec = SchemaCodec(schema, Point)
+    point = Point(x=1, y=2, tags=["a"], label="ignored")
+    assert codec.field_names == ["y", "x", "tags"]
+    assert codec.to_row(point) == [2, 1, ["a"]]
+    assert codec.from_row([2, 1]) == Point(x=1, y=2)
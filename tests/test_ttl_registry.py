@@ -0,0 +1,26 @@
+from ttl_registry import TTLRegistry
+
+
+def test_capacity_evicts_least_recently_used():
+    registry = TTLRegistry("t", ttl_seconds=60, max_entries=2)
+    registry.set("a", 1)
+    registry.set("b", 2)
+    assert registry.get("a") == 1       # "b" is now the oldest
+    registry.set("c", 3)
+    assert "b" not in registry
+    assert registry.get("a") == 1 and registry.get("c") == 3
+    assert registry.evicted == 1
+
+
+def test_expired_entries_miss(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("ttl_registry.time.monotonic", lambda: now[0])
+    registry = TTLRegistry("t", ttl_seconds=10, max_entries=8)
+    registry.set("a", 1)
+    now[0] += 5
+    assert registry.get("a") == 1       # Sliding TTL: refreshed until 115
+    now[0] += 9
+    assert registry.get("a") == 1
+    now[0] += 11
+    assert registry.get("a") is None
+    assert registry.expired == 1